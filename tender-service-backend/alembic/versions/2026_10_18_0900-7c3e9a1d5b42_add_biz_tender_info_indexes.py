@@ -0,0 +1,63 @@
+"""add biz_tender_info indexes
+
+Revision ID: 7c3e9a1d5b42
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a1d5b42'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE_NAME = 'biz_tender_info'
+BTREE_INDEXES = {
+    'idx_biz_tender_info_release': ['release_time', 'create_time'],
+    'idx_biz_tender_info_district': ['district', 'release_time'],
+    'idx_biz_tender_info_stage': ['project_stage', 'release_time'],
+    'idx_biz_tender_info_type': ['project_type', 'release_time'],
+    'idx_biz_tender_info_create_time': ['create_time'],
+    'idx_biz_tender_info_update_time': ['update_time'],
+    'idx_biz_tender_info_similar': ['project_type', 'district', 'bid_control_price'],
+}
+SEARCH_COLUMNS = ['project_name', 'construction_unit', 'construction_content', 'tender_scope']
+MYSQL_SEARCH_INDEX = 'ft_biz_tender_info_search'
+PG_SEARCH_INDEX = 'idx_biz_tender_info_search'
+
+
+def _existing_indexes() -> set[str]:
+    # 表由 create_all 或初始化脚本建立时索引可能已存在，逐个检查以保证迁移可重复执行
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(TABLE_NAME)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = _existing_indexes()
+    for name, columns in BTREE_INDEXES.items():
+        if name not in existing:
+            op.create_index(name, TABLE_NAME, columns)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        if PG_SEARCH_INDEX not in existing:
+            search_text = " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS)
+            op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            op.execute(f'CREATE INDEX {PG_SEARCH_INDEX} ON {TABLE_NAME} USING gin (({search_text}) gin_trgm_ops)')
+    elif MYSQL_SEARCH_INDEX not in existing:
+        op.create_index(
+            MYSQL_SEARCH_INDEX, TABLE_NAME, SEARCH_COLUMNS, mysql_prefix='FULLTEXT', mysql_with_parser='ngram'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_indexes()
+    search_index = PG_SEARCH_INDEX if op.get_bind().dialect.name == 'postgresql' else MYSQL_SEARCH_INDEX
+    for name in [*BTREE_INDEXES, search_index]:
+        if name in existing:
+            op.drop_index(name, table_name=TABLE_NAME)
@@ -0,0 +1,72 @@
+"""add biz_tender_daily_stats
+
+Revision ID: 3f6d2b8c1e07
+Revises: 7c3e9a1d5b42
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d2b8c1e07'
+down_revision: Union[str, Sequence[str], None] = '7c3e9a1d5b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE_NAME = 'biz_tender_daily_stats'
+
+
+def _table_exists() -> bool:
+    return sa.inspect(op.get_bind()).has_table(TABLE_NAME)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 表可能已由 create_all 建立，此时仅补充回填
+    if not _table_exists():
+        op.create_table(
+            TABLE_NAME,
+            sa.Column('stat_date', sa.Date(), nullable=False, comment='统计日期（信息发布日期，缺失时取创建日期）'),
+            sa.Column('district', sa.String(100), nullable=False, server_default='', comment='所在区县'),
+            sa.Column('project_stage', sa.String(50), nullable=False, server_default='', comment='所处阶段'),
+            sa.Column('project_type', sa.String(100), nullable=False, server_default='', comment='项目类型'),
+            sa.Column('tender_count', sa.Integer(), nullable=False, server_default='0', comment='招标信息数量'),
+            sa.Column(
+                'control_price_sum', sa.Numeric(20, 6), nullable=False, server_default='0', comment='招标控制价合计（万元）'
+            ),
+            sa.Column('bid_price_sum', sa.Numeric(20, 6), nullable=False, server_default='0', comment='中标价合计（万元）'),
+            sa.Column('update_time', sa.DateTime(), server_default=sa.func.now(), comment='更新时间'),
+            sa.PrimaryKeyConstraint('stat_date', 'district', 'project_stage', 'project_type'),
+            comment='招标信息按日汇总表',
+        )
+
+    # 按原始数据全量回填汇总
+    op.execute(f'DELETE FROM {TABLE_NAME}')
+    op.execute(
+        f"""
+        INSERT INTO {TABLE_NAME}
+            (stat_date, district, project_stage, project_type, tender_count, control_price_sum, bid_price_sum)
+        SELECT coalesce(release_time, date(create_time)),
+               coalesce(district, ''),
+               coalesce(project_stage, ''),
+               coalesce(project_type, ''),
+               count(tender_id),
+               coalesce(sum(bid_control_price), 0),
+               coalesce(sum(bid_price), 0)
+        FROM biz_tender_info
+        WHERE coalesce(release_time, date(create_time)) IS NOT NULL
+        GROUP BY coalesce(release_time, date(create_time)),
+                 coalesce(district, ''),
+                 coalesce(project_stage, ''),
+                 coalesce(project_type, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _table_exists():
+        op.drop_table(TABLE_NAME)
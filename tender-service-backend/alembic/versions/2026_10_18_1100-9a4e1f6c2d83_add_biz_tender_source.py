@@ -0,0 +1,49 @@
+"""add biz_tender_source
+
+Revision ID: 9a4e1f6c2d83
+Revises: 3f6d2b8c1e07
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e1f6c2d83'
+down_revision: Union[str, Sequence[str], None] = '3f6d2b8c1e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE_NAME = 'biz_tender_source'
+
+
+def _table_exists() -> bool:
+    return sa.inspect(op.get_bind()).has_table(TABLE_NAME)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 表可能已由 create_all 建立
+    if _table_exists():
+        return
+    op.create_table(
+        TABLE_NAME,
+        sa.Column('source_id', sa.BigInteger(), autoincrement=True, nullable=False, comment='主键ID'),
+        sa.Column('tender_id', sa.BigInteger(), nullable=False, comment='招标信息ID'),
+        sa.Column('source_url', sa.String(255), nullable=True, comment='原文网址'),
+        sa.Column('content', sa.LargeBinary(16 * 1024 * 1024), nullable=True, comment='清洗后正文（zlib压缩）'),
+        sa.Column('content_length', sa.Integer(), nullable=True, server_default='0', comment='正文原始字符数'),
+        sa.Column('create_time', sa.DateTime(), server_default=sa.func.now(), comment='创建时间'),
+        sa.Column('update_time', sa.DateTime(), server_default=sa.func.now(), comment='更新时间'),
+        sa.PrimaryKeyConstraint('source_id'),
+        comment='招标公告原文表',
+    )
+    op.create_index('ix_biz_tender_source_tender_id', TABLE_NAME, ['tender_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _table_exists():
+        op.drop_table(TABLE_NAME)
@@ -1,18 +1,19 @@
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import Depends, Request, params
-from sqlalchemy import ColumnElement, func, or_, select
+from sqlalchemy import ColumnElement, false, or_, true
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.context import RequestContext
 from config.database import Base
-from module_admin.entity.do.dept_do import SysDept
-from module_admin.entity.do.role_do import SysRoleDept
+from module_admin.dao.dept_dao import DeptDao
+from module_admin.entity.vo.user_vo import UserInfoModel
 from utils.dependency_util import DependencyUtil
 
 
 class GetDataScope:
     """
-    获取当前用户数据权限对应的查询sql语句
+    获取当前用户数据权限对应的查询sql语句，数据权限范围在生成用户权限信息时预先计算，查询时使用部门id列表过滤
     """
 
     DATA_SCOPE_ALL = '1'
@@ -38,62 +39,42 @@ class GetDataScope:
         self.user_alias = user_alias
         self.dept_alias = dept_alias
 
+    @classmethod
+    async def build_data_scope(cls, db: AsyncSession, user: UserInfoModel) -> dict[str, Any]:
+        """
+        生成用户的数据权限范围，自定义数据权限角色关联的部门与本部门及以下部门展开为部门id列表，随用户权限信息一并缓存
+
+        :param db: orm对象
+        :param user: 用户信息
+        :return: 数据权限范围，all表示全部数据权限，dept_ids为可访问的部门id列表，self表示可访问本人数据
+        """
+        roles = [role for role in user.role or [] if role]
+        if user.admin or any(role.data_scope == cls.DATA_SCOPE_ALL for role in roles):
+            return {'all': True, 'dept_ids': [], 'self': False}
+        data_scopes = {role.data_scope for role in roles}
+        custom_data_scope_role_id_list = [role.role_id for role in roles if role.data_scope == cls.DATA_SCOPE_CUSTOM]
+        dept_ids = await DeptDao.get_data_scope_dept_ids(
+            db,
+            custom_data_scope_role_id_list,
+            user.dept_id if cls.DATA_SCOPE_DEPT_AND_CHILD in data_scopes else None,
+        )
+        if cls.DATA_SCOPE_DEPT in data_scopes and user.dept_id is not None and user.dept_id not in dept_ids:
+            dept_ids = sorted([*dept_ids, user.dept_id])
+
+        return {'all': False, 'dept_ids': dept_ids, 'self': cls.DATA_SCOPE_SELF in data_scopes}
+
     def __call__(self, request: Request) -> ColumnElement:
         DependencyUtil.check_exclude_routes(request, err_msg='当前路由不在认证规则内，不可使用GetDataScope依赖项')
         current_user = RequestContext.get_current_user()
-        user_id = current_user.user.user_id
-        dept_id = current_user.user.dept_id
-        custom_data_scope_role_id_list = [
-            item.role_id for item in current_user.user.role if item.data_scope == self.DATA_SCOPE_CUSTOM
-        ]
+        data_scope = current_user.data_scope
+        if data_scope['all']:
+            return true()
         param_sql_list = []
-        for role in current_user.user.role:
-            if current_user.user.admin or role.data_scope == self.DATA_SCOPE_ALL:
-                param_sql_list = [True]
-                break
-            if role.data_scope == self.DATA_SCOPE_CUSTOM:
-                if len(custom_data_scope_role_id_list) > 1:
-                    param_sql_list.append(
-                        getattr(self.query_alias, self.dept_alias).in_(
-                            select(SysRoleDept.dept_id).where(SysRoleDept.role_id.in_(custom_data_scope_role_id_list))
-                        )
-                        if hasattr(self.query_alias, self.dept_alias)
-                        else False
-                    )
-                else:
-                    param_sql_list.append(
-                        getattr(self.query_alias, self.dept_alias).in_(
-                            select(SysRoleDept.dept_id).where(SysRoleDept.role_id == role.role_id)
-                        )
-                        if hasattr(self.query_alias, self.dept_alias)
-                        else False
-                    )
-            elif role.data_scope == self.DATA_SCOPE_DEPT:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.dept_alias) == dept_id
-                    if hasattr(self.query_alias, self.dept_alias)
-                    else False
-                )
-            elif role.data_scope == self.DATA_SCOPE_DEPT_AND_CHILD:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.dept_alias).in_(
-                        select(SysDept.dept_id).where(
-                            or_(SysDept.dept_id == dept_id, func.find_in_set(dept_id, SysDept.ancestors))
-                        )
-                    )
-                    if hasattr(self.query_alias, self.dept_alias)
-                    else False
-                )
-            elif role.data_scope == self.DATA_SCOPE_SELF:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.user_alias) == user_id
-                    if hasattr(self.query_alias, self.user_alias)
-                    else False
-                )
-            else:
-                param_sql_list.append(False)
-        param_sql_list = list(dict.fromkeys(param_sql_list))
-        param_sql = or_(*param_sql_list)
+        if data_scope['dept_ids'] and hasattr(self.query_alias, self.dept_alias):
+            param_sql_list.append(getattr(self.query_alias, self.dept_alias).in_(data_scope['dept_ids']))
+        if data_scope['self'] and hasattr(self.query_alias, self.user_alias):
+            param_sql_list.append(getattr(self.query_alias, self.user_alias) == current_user.user.user_id)
+        param_sql = or_(false(), *param_sql_list)
 
         return param_sql
 
@@ -26,17 +26,14 @@ class CheckUserInterfaceAuth:
         DependencyUtil.check_exclude_routes(
             request, err_msg='当前路由不在认证规则内，不可使用CheckUserInterfaceAuth依赖项'
         )
-        current_user = RequestContext.get_current_user()
-        user_auth_list = current_user.permissions
-        if '*:*:*' in user_auth_list:
-            return True
-        if isinstance(self.perm, str) and self.perm in user_auth_list:
+        permission_set = RequestContext.get_current_user().permission_set
+        if isinstance(self.perm, str) and permission_set.has(self.perm):
             return True
         if isinstance(self.perm, list):
             if self.is_strict:
-                if all(perm_str in user_auth_list for perm_str in self.perm):
+                if permission_set.has_all(self.perm):
                     return True
-            elif any(perm_str in user_auth_list for perm_str in self.perm):
+            elif permission_set.has_any(self.perm):
                 return True
         raise PermissionException(data='', message='该用户无此接口权限')
 
@@ -60,16 +57,14 @@ class CheckRoleInterfaceAuth:
         DependencyUtil.check_exclude_routes(
             request, err_msg='当前路由不在认证规则内，不可使用CheckRoleInterfaceAuth依赖项'
         )
-        current_user = RequestContext.get_current_user()
-        user_role_list = current_user.user.role
-        user_role_key_list = [role.role_key for role in user_role_list]
-        if isinstance(self.role_key, str) and self.role_key in user_role_key_list:
+        user_role_keys = RequestContext.get_current_user().role_keys
+        if isinstance(self.role_key, str) and self.role_key in user_role_keys:
             return True
         if isinstance(self.role_key, list):
             if self.is_strict:
-                if all(role_key_str in user_role_key_list for role_key_str in self.role_key):
+                if all(role_key_str in user_role_keys for role_key_str in self.role_key):
                     return True
-            elif any(role_key_str in user_role_key_list for role_key_str in self.role_key):
+            elif any(role_key_str in user_role_keys for role_key_str in self.role_key):
                 return True
         raise PermissionException(data='', message='该用户无此接口权限')
 
@@ -5,7 +5,6 @@ from fastapi import Depends, Request, params
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from common.context import RequestContext
 from config.env import AppConfig
 from config.get_db import get_db
 from exceptions.exception import AuthException
@@ -32,53 +31,84 @@ class ExcludeRoute(TypedDict, total=False):
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/login')
 
 
-class PreAuth:
+class ExcludeRouteMatcher:
     """
-    登录认证前置校验依赖类
+    排除路由匹配器：按请求方法将全部排除规则编译为一个组合正则表达式，每次匹配只需执行一次正则匹配
     """
 
-    def __init__(self, exclude_routes: Optional[list[ExcludeRoute]] = None) -> None:
+    HTTP_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS')
+
+    def __init__(self, exclude_routes: list[ExcludeRoute]) -> None:
         """
-        初始化登录认证前置校验依赖
+        初始化排除路由匹配器
 
-        :param exclude_routes: 需要排除的路由列表，格式为：
-                            [{'path': '/path1', 'methods': ['GET', 'POST']}, {'path': '/path2/{param}', 'methods': ['GET']}]
-                            methods 可以是字符串或列表，空列表表示所有方法
+        :param exclude_routes: 需要排除的路由列表
         """
-        self.exclude_routes = exclude_routes or []
-        # 编译排除路径为正则表达式模式，并存储方法信息
-        self.exclude_patterns = []
-
-        for route in self.exclude_routes:
-            # 使用TypedDict，确保路由字典包含path字段
-            path = route.get('path', '')
-            methods = route.get('methods', [])
-            ignore_paths = route.get('ignore_paths', [])
-
-            # 编译路径为正则表达式
-            pattern = self._compile_path_pattern(path)
-            # 存储编译后的模式和方法信息
-            self.exclude_patterns.append(
-                {
-                    'pattern': pattern,
-                    'methods': [method.upper() for method in methods],
-                    'original_path': path,
-                    'ignore_paths': ignore_paths,
-                }
+        self.rules = [
+            (
+                self._compile_rule(route.get('path', ''), route.get('ignore_paths', [])),
+                {method.upper() for method in route.get('methods', [])},
             )
-
-    def _compile_path_pattern(self, path: str) -> re.Pattern:
+            for route in exclude_routes
+        ]
+        # 不限方法的规则组合后的正则表达式，用于匹配未单独编译的请求方法
+        self._any_method_pattern = self._combine([rule for rule, methods in self.rules if not methods])
+        self._method_patterns = {
+            method: self._combine([rule for rule, methods in self.rules if not methods or method in methods])
+            for method in self.HTTP_METHODS
+        }
+
+    @staticmethod
+    def _compile_rule(path: str, ignore_paths: list[str]) -> str:
         """
-        将FastAPI路径转换为正则表达式模式
+        将单条排除规则转换为正则表达式片段
 
         :param path: FastAPI路径（如 /configKey/{config_key}）
-        :return: 编译后的正则表达式模式
+        :param ignore_paths: 需要忽略的特定路径列表
+        :return: 正则表达式片段
         """
         # 将FastAPI路径参数转换为正则表达式
         # 例如：/configKey/{config_key} -> /configKey/[^/]+
         pattern_str = re.sub(r'\{[^}]+\}', r'[^/]+', path)
-        # 添加开始和结束锚点，确保精确匹配
-        return re.compile(f'^{pattern_str}$')
+        if ignore_paths:
+            # 忽略列表中的路径通过否定前瞻排除，不影响其他规则的匹配
+            ignore_str = '|'.join(re.escape(ignore_path) for ignore_path in ignore_paths)
+            pattern_str = f'(?!(?:{ignore_str})$){pattern_str}'
+        return pattern_str
+
+    @staticmethod
+    def _combine(rules: list[str]) -> Optional[re.Pattern]:
+        if not rules:
+            return None
+        return re.compile('^(?:' + '|'.join(f'(?:{rule})' for rule in rules) + ')$')
+
+    def match(self, path: str, method: str) -> bool:
+        """
+        判断请求是否匹配排除路由
+
+        :param path: 去掉APP_ROOT_PATH前缀后的请求路径
+        :param method: 请求方法
+        :return: 是否匹配
+        """
+        pattern = self._method_patterns.get(method, self._any_method_pattern)
+        return pattern is not None and pattern.match(path) is not None
+
+
+class PreAuth:
+    """
+    登录认证前置校验依赖类
+    """
+
+    def __init__(self, exclude_routes: Optional[list[ExcludeRoute]] = None) -> None:
+        """
+        初始化登录认证前置校验依赖
+
+        :param exclude_routes: 需要排除的路由列表，格式为：
+                            [{'path': '/path1', 'methods': ['GET', 'POST']}, {'path': '/path2/{param}', 'methods': ['GET']}]
+                            methods 可以是字符串或列表，空列表表示所有方法
+        """
+        self.exclude_routes = exclude_routes or []
+        self.exclude_matcher = ExcludeRouteMatcher(self.exclude_routes)
 
     async def __call__(self, request: Request, db: AsyncSession = Depends(get_db)) -> Union[CurrentUserModel, None]:
         """
@@ -99,23 +129,11 @@ class PreAuth:
         if app_root_path and path.startswith(app_root_path):
             path = path[len(app_root_path) :]
 
-        # 设置上下文变量
-        RequestContext.set_current_exclude_patterns(self.exclude_patterns)
-
-        # 检查路径和方法是否匹配排除模式
-        for item in self.exclude_patterns:
-            pattern = item['pattern']
-            exclude_methods = item['methods']
-            ignore_paths = item['ignore_paths']
-
-            # 检查当前路径是否在忽略列表中
-            if path in ignore_paths:
-                continue
-
-            # 检查路径是否匹配，并且methods为空列表（匹配所有方法）或者当前方法在允许列表中
-            if pattern.match(path) and (not exclude_methods or method in exclude_methods):
-                # 跳过认证
-                return None
+        # 匹配结果保存在请求范围内，供同一请求的其他依赖项直接使用
+        request.state.exclude_route_matched = self.exclude_matcher.match(path, method)
+        if request.state.exclude_route_matched:
+            # 跳过认证
+            return None
 
         # 否则执行正常认证
         token = request.headers.get('Authorization')
@@ -50,3 +50,8 @@ class RedisInitKeyConfig(Enum):
     ACCOUNT_LOCK = {'key': 'account_lock', 'remark': '用户锁定'}
     PASSWORD_ERROR_COUNT = {'key': 'password_error_count', 'remark': '密码错误次数'}
     SMS_CODE = {'key': 'sms_code', 'remark': '短信验证码'}
+    TENDER_DASHBOARD = {'key': 'tender_dashboard', 'remark': '招标数据概览'}
+    EXPORT_JOB = {'key': 'export_job', 'remark': '导出任务'}
+    USER_PRINCIPAL = {'key': 'user_principal', 'remark': '用户权限信息'}
+    ONLINE_SESSION = {'key': 'online_session', 'remark': '在线会话信息'}
+    COUNT_CACHE = {'key': 'count_cache', 'remark': '分页总数缓存表版本号'}
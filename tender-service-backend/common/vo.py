@@ -87,8 +87,9 @@ class PageModel(BaseModel, Generic[T]):
     rows: list[T] = Field(description='记录列表')
     page_num: int = Field(description='当前页码')
     page_size: int = Field(description='每页记录数')
-    total: int = Field(description='总记录数')
+    total: int = Field(description='总记录数（游标分页未统计总数时为-1）')
     has_next: bool = Field(description='是否有下一页')
+    next_cursor: Optional[str] = Field(default=None, description='下一页游标，仅游标分页时返回')
 
 
 class PageResponseModel(PageModel, ResponseBaseModel, Generic[T]):
@@ -0,0 +1,887 @@
+import asyncio
+import contextlib
+import re
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+from redis import asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import DataError, ResponseError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from utils.log_util import logger
+
+# 视为Redis不可用并切换到内存缓存的异常
+FAILOVER_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError, asyncio.TimeoutError)
+
+ScriptHandler = Callable[['MemoryCacheBackend', list, list], Awaitable[Any]]
+
+
+def _to_seconds(value: Union[int, float, timedelta]) -> float:
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    raise DataError(f'Invalid input of type: {type(value).__name__!r}. Convert to a bytes, string, int or float first.')
+
+
+def _parse_score(value: Union[str, int, float]) -> tuple[float, bool]:
+    if isinstance(value, str):
+        if value.startswith('('):
+            return float(value[1:]), True
+        return float(value), False
+    return float(value), False
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    # 按Redis的glob规则转换为正则表达式，支持*、?、[]及反斜杠转义
+    regex = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\' and index + 1 < len(pattern):
+            regex.append(re.escape(pattern[index + 1]))
+            index += 2
+            continue
+        if char == '*':
+            regex.append('.*')
+        elif char == '?':
+            regex.append('.')
+        elif char == '[' and pattern.find(']', index + 1) != -1:
+            end = pattern.find(']', index + 1)
+            body = pattern[index + 1 : end]
+            negate = body.startswith('^')
+            body = re.sub(r'([\\\]\[])', r'\\\1', body[1:] if negate else body)
+            regex.append(f'[{"^" if negate else ""}{body}]')
+            index = end + 1
+            continue
+        else:
+            regex.append(re.escape(char))
+        index += 1
+    return re.compile(''.join(regex) + r'\Z', re.DOTALL)
+
+
+def _slice(items: list, start: int, end: int) -> list:
+    size = len(items)
+    start = max(size + start, 0) if start < 0 else start
+    end = size + end if end < 0 else end
+    if start > end or start >= size:
+        return []
+    return items[start : end + 1]
+
+
+class MemoryPipeline:
+    """
+    内存缓存后端的管道：命令在execute时按顺序执行，单个事件循环内不会与其他命令交错
+    """
+
+    def __init__(self, backend: 'MemoryCacheBackend') -> None:
+        self._backend = backend
+        self._commands: list[tuple[Callable[..., Awaitable[Any]], tuple, dict]] = []
+
+    async def __aenter__(self) -> 'MemoryPipeline':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __getattr__(self, name: str) -> Callable[..., 'MemoryPipeline']:
+        command = getattr(self._backend, name)
+
+        def queue(*args: Any, **kwargs: Any) -> 'MemoryPipeline':
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def queue_call(self, func: Callable[..., Awaitable[Any]], *args: Any) -> 'MemoryPipeline':
+        """
+        将任意协程函数加入管道
+
+        :param func: 协程函数
+        :param args: 调用参数
+        :return: 管道对象
+        """
+        self._commands.append((func, args, {}))
+        return self
+
+    def reset(self) -> None:
+        self._commands = []
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        commands, self._commands = self._commands, []
+        results = []
+        for command, args, kwargs in commands:
+            try:
+                results.append(await command(*args, **kwargs))
+            except (ResponseError, DataError) as e:
+                results.append(e)
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+
+class MemoryScript:
+    """
+    内存缓存后端的脚本对象：按脚本内容查找已注册的等价实现执行
+    """
+
+    def __init__(self, backend: 'MemoryCacheBackend', script: str) -> None:
+        self._backend = backend
+        self.script = script
+
+    async def __call__(
+        self, keys: Optional[Iterable] = None, args: Optional[Iterable] = None, client: Optional[Any] = None
+    ) -> Any:
+        handler = MemoryCacheBackend.get_script_handler(self.script)
+        keys, args = list(keys or []), list(args or [])
+        if isinstance(client, MemoryPipeline):
+            return client.queue_call(handler, self._backend, keys, args)
+        return await handler(self._backend, keys, args)
+
+
+class MemoryPubSub:
+    """
+    内存缓存后端的发布订阅对象，只在当前进程内投递消息
+    """
+
+    def __init__(self, backend: 'MemoryCacheBackend', ignore_subscribe_messages: bool = False) -> None:
+        self._backend = backend
+        self._ignore_subscribe_messages = ignore_subscribe_messages
+        self._queue: asyncio.Queue[Optional[dict[str, Any]]] = asyncio.Queue()
+        self.channels: set[str] = set()
+
+    async def __aenter__(self) -> 'MemoryPubSub':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def deliver(self, message: dict[str, Any]) -> None:
+        self._queue.put_nowait(message)
+
+    async def subscribe(self, *channels: str) -> None:
+        self._backend.pubsubs.add(self)
+        for channel in channels:
+            self.channels.add(channel)
+            if not self._ignore_subscribe_messages:
+                self.deliver({'type': 'subscribe', 'pattern': None, 'channel': channel, 'data': len(self.channels)})
+
+    async def unsubscribe(self, *channels: str) -> None:
+        for channel in channels or list(self.channels):
+            self.channels.discard(channel)
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self.channels)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            message = await self._queue.get()
+            if message is None:
+                return
+            yield message
+
+    async def get_message(
+        self,
+        ignore_subscribe_messages: bool = False,
+        timeout: Optional[float] = 0.0,  # noqa: ASYNC109
+    ) -> Optional[dict[str, Any]]:
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+        if message is None or (ignore_subscribe_messages and message['type'] == 'subscribe'):
+            return None
+        return message
+
+    async def aclose(self) -> None:
+        if self in self._backend.pubsubs:
+            self._backend.pubsubs.discard(self)
+            self.channels.clear()
+            self._queue.put_nowait(None)
+
+    reset = aclose
+    close = aclose
+
+
+class MemoryCacheBackend:
+    """
+    内存缓存后端：在进程内实现项目使用到的Redis命令子集（带过期时间的字符串、计数器、哈希、有序集合、SCAN、
+    管道、脚本及发布订阅），Redis不可用时作为降级后端，数据只在当前工作进程内有效
+    """
+
+    # 最大键数量，超出时优先淘汰已过期的键，再淘汰最早写入的键
+    MAX_KEYS = 100000
+    # 同时保留的SCAN游标快照数量
+    MAX_SCAN_SNAPSHOTS = 64
+    SCAN_COUNT = 10
+
+    _script_handlers: dict[str, ScriptHandler] = {}
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[str, Any]] = {}
+        self._expires: dict[str, float] = {}
+        self._scan_snapshots: OrderedDict[int, list[str]] = OrderedDict()
+        self._next_cursor = 1
+        self._started = time.time()
+        self.pubsubs: set[MemoryPubSub] = set()
+
+    @classmethod
+    def script_handler(cls, script: str) -> Callable[[ScriptHandler], ScriptHandler]:
+        """
+        注册Lua脚本在内存缓存后端中的等价实现
+
+        :param script: Lua脚本内容
+        :return: 装饰器
+        """
+
+        def decorator(func: ScriptHandler) -> ScriptHandler:
+            cls._script_handlers[script] = func
+            return func
+
+        return decorator
+
+    @classmethod
+    def get_script_handler(cls, script: str) -> ScriptHandler:
+        handler = cls._script_handlers.get(script)
+        if handler is None:
+            raise ResponseError('NOSCRIPT No matching script registered for the memory cache backend.')
+        return handler
+
+    def _get_entry(self, name: str) -> Optional[tuple[str, Any]]:
+        expire = self._expires.get(name)
+        if expire is not None and expire <= time.time():
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+            return None
+        return self._data.get(name)
+
+    def _get_value(self, name: str, value_type: str) -> Any:
+        entry = self._get_entry(name)
+        if entry is None:
+            return None
+        if entry[0] != value_type:
+            raise ResponseError('WRONGTYPE Operation against a key holding the wrong kind of value')
+        return entry[1]
+
+    def _put(self, name: str, value_type: str, value: Any, keep_ttl: bool = False) -> None:
+        if name not in self._data and len(self._data) >= self.MAX_KEYS:
+            self.evict_expired()
+            while len(self._data) >= self.MAX_KEYS:
+                oldest = next(iter(self._data))
+                self._data.pop(oldest)
+                self._expires.pop(oldest, None)
+        self._data[name] = (value_type, value)
+        if not keep_ttl:
+            self._expires.pop(name, None)
+
+    def _remove(self, name: str) -> bool:
+        existed = self._get_entry(name) is not None
+        self._data.pop(name, None)
+        self._expires.pop(name, None)
+        return existed
+
+    def _get_or_create(self, name: str, value_type: str) -> dict:
+        value = self._get_value(name, value_type)
+        if value is None:
+            value = {}
+            self._put(name, value_type, value)
+        return value
+
+    def evict_expired(self) -> int:
+        """
+        清理已过期的键
+
+        :return: 清理的键数量
+        """
+        now = time.time()
+        expired = [name for name, expire in self._expires.items() if expire <= now]
+        for name in expired:
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return len(expired)
+
+    def dump(self) -> list[tuple[str, str, Any, Optional[int]]]:
+        """
+        导出全部未过期的键，用于Redis恢复后回写
+
+        :return: (键, 类型, 值, 剩余有效时间秒数)列表
+        """
+        now = time.time()
+        items = []
+        for name in list(self._data):
+            entry = self._get_entry(name)
+            if entry is None:
+                continue
+            expire = self._expires.get(name)
+            ttl = max(int(expire - now), 1) if expire is not None else None
+            value = dict(entry[1]) if isinstance(entry[1], dict) else entry[1]
+            items.append((name, entry[0], value, ttl))
+        return items
+
+    async def close_pubsubs(self) -> None:
+        """
+        关闭全部订阅，订阅方会结束监听并重新订阅当前可用的后端
+
+        :return:
+        """
+        for pubsub in list(self.pubsubs):
+            await pubsub.aclose()
+
+    async def ping(self, **kwargs: Any) -> bool:
+        return True
+
+    async def get(self, name: str) -> Optional[str]:
+        return self._get_value(name, 'string')
+
+    async def set(
+        self,
+        name: str,
+        value: Any,
+        ex: Optional[Union[int, timedelta]] = None,
+        px: Optional[Union[int, timedelta]] = None,
+        nx: bool = False,
+        xx: bool = False,
+        keepttl: bool = False,
+        **kwargs: Any,
+    ) -> Optional[bool]:
+        exists = self._get_entry(name) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._put(name, 'string', _encode(value), keep_ttl=keepttl)
+        if ex is not None:
+            self._expires[name] = time.time() + _to_seconds(ex)
+        elif px is not None:
+            self._expires[name] = time.time() + (px.total_seconds() if isinstance(px, timedelta) else px / 1000)
+        return True
+
+    async def mget(self, keys: Union[str, Iterable[str]], *args: str) -> list[Optional[str]]:
+        names = [keys, *args] if isinstance(keys, str) else [*keys, *args]
+        return [self._get_value(name, 'string') for name in names]
+
+    async def mset(self, mapping: dict[str, Any]) -> bool:
+        for name, value in mapping.items():
+            self._put(name, 'string', _encode(value))
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._remove(name) for name in names)
+
+    unlink = delete
+
+    async def exists(self, *names: str) -> int:
+        return sum(self._get_entry(name) is not None for name in names)
+
+    async def expire(self, name: str, time_value: Union[int, timedelta], **kwargs: Any) -> bool:
+        if self._get_entry(name) is None:
+            return False
+        self._expires[name] = time.time() + _to_seconds(time_value)
+        return True
+
+    async def ttl(self, name: str) -> int:
+        if self._get_entry(name) is None:
+            return -2
+        expire = self._expires.get(name)
+        return -1 if expire is None else max(int(expire - time.time() + 0.5), 0)
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        value = self._get_value(name, 'string')
+        try:
+            result = int(value or 0) + amount
+        except ValueError as e:
+            raise ResponseError('value is not an integer or out of range') from e
+        self._put(name, 'string', str(result), keep_ttl=True)
+        return result
+
+    incrby = incr
+
+    async def type(self, name: str) -> str:
+        entry = self._get_entry(name)
+        return 'none' if entry is None else entry[0]
+
+    async def hset(
+        self,
+        name: str,
+        key: Optional[str] = None,
+        value: Optional[Any] = None,
+        mapping: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> int:
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        if not items:
+            raise DataError("'hset' with no key value pairs")
+        hash_value = self._get_or_create(name, 'hash')
+        added = sum(field not in hash_value for field in items)
+        hash_value.update({field: _encode(item) for field, item in items.items()})
+        return added
+
+    async def hsetnx(self, name: str, key: str, value: Any) -> bool:
+        hash_value = self._get_or_create(name, 'hash')
+        if key in hash_value:
+            return False
+        hash_value[key] = _encode(value)
+        return True
+
+    async def hget(self, name: str, key: str) -> Optional[str]:
+        return (self._get_value(name, 'hash') or {}).get(key)
+
+    async def hgetall(self, name: str) -> dict[str, str]:
+        return dict(self._get_value(name, 'hash') or {})
+
+    async def hmget(self, name: str, keys: Union[str, Iterable[str]], *args: str) -> list[Optional[str]]:
+        hash_value = self._get_value(name, 'hash') or {}
+        fields = [keys, *args] if isinstance(keys, str) else [*keys, *args]
+        return [hash_value.get(field) for field in fields]
+
+    async def hvals(self, name: str) -> list[str]:
+        return list((self._get_value(name, 'hash') or {}).values())
+
+    async def hdel(self, name: str, *keys: str) -> int:
+        hash_value = self._get_value(name, 'hash')
+        if not hash_value:
+            return 0
+        deleted = sum(hash_value.pop(field, None) is not None for field in keys)
+        if not hash_value:
+            self._remove(name)
+        return deleted
+
+    async def zadd(
+        self, name: str, mapping: dict[str, Union[int, float]], nx: bool = False, xx: bool = False, **kwargs: Any
+    ) -> int:
+        zset_value = self._get_value(name, 'zset')
+        if zset_value is None:
+            if xx:
+                return 0
+            zset_value = self._get_or_create(name, 'zset')
+        added = 0
+        for member, score in mapping.items():
+            exists = member in zset_value
+            if (nx and exists) or (xx and not exists):
+                continue
+            added += not exists
+            zset_value[member] = float(score)
+        return added
+
+    async def zrem(self, name: str, *values: str) -> int:
+        zset_value = self._get_value(name, 'zset')
+        if not zset_value:
+            return 0
+        removed = sum(zset_value.pop(member, None) is not None for member in values)
+        if not zset_value:
+            self._remove(name)
+        return removed
+
+    async def zcard(self, name: str) -> int:
+        return len(self._get_value(name, 'zset') or {})
+
+    def _sorted_zset(self, name: str, desc: bool = False) -> list[tuple[str, float]]:
+        zset_value = self._get_value(name, 'zset') or {}
+        return sorted(zset_value.items(), key=lambda item: (item[1], item[0]), reverse=desc)
+
+    async def zrange(
+        self, name: str, start: int, end: int, desc: bool = False, withscores: bool = False, **kwargs: Any
+    ) -> list[Any]:
+        items = _slice(self._sorted_zset(name, desc), start, end)
+        return items if withscores else [member for member, _ in items]
+
+    async def zrevrange(self, name: str, start: int, end: int, withscores: bool = False, **kwargs: Any) -> list[Any]:
+        return await self.zrange(name, start, end, desc=True, withscores=withscores)
+
+    async def zrangebyscore(
+        self,
+        name: str,
+        min: Union[str, int, float],  # noqa: A002
+        max: Union[str, int, float],  # noqa: A002
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+        **kwargs: Any,
+    ) -> list[Any]:
+        (low, low_open), (high, high_open) = _parse_score(min), _parse_score(max)
+        items = [
+            (member, score)
+            for member, score in self._sorted_zset(name)
+            if (score > low if low_open else score >= low) and (score < high if high_open else score <= high)
+        ]
+        if start is not None and num is not None:
+            items = items[start : start + num] if num >= 0 else items[start:]
+        return items if withscores else [member for member, _ in items]
+
+    async def scan(
+        self,
+        cursor: int = 0,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+        _type: Optional[str] = None,
+        **kwargs: Any,
+    ) -> tuple[int, list[str]]:
+        # 首次遍历时保存键列表快照，游标对应快照中剩余的键，遍历期间始终存在的键都会被返回
+        if cursor == 0:
+            names = list(self._data)
+        else:
+            names = self._scan_snapshots.pop(cursor, None)
+            if names is None:
+                return 0, []
+        count = count or self.SCAN_COUNT
+        batch, rest = names[:count], names[count:]
+        next_cursor = 0
+        if rest:
+            next_cursor = self._next_cursor
+            self._next_cursor += 1
+            self._scan_snapshots[next_cursor] = rest
+            while len(self._scan_snapshots) > self.MAX_SCAN_SNAPSHOTS:
+                self._scan_snapshots.popitem(last=False)
+        pattern = _compile_pattern(match) if match else None
+        keys = []
+        for name in batch:
+            entry = self._get_entry(name)
+            if entry is None or (pattern and not pattern.match(name)) or (_type and entry[0] != _type):
+                continue
+            keys.append(name)
+        return next_cursor, keys
+
+    async def scan_iter(
+        self, match: Optional[str] = None, count: Optional[int] = None, _type: Optional[str] = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        cursor = None
+        while cursor != 0:
+            cursor, keys = await self.scan(cursor=cursor or 0, match=match, count=count, _type=_type)
+            for key in keys:
+                yield key
+
+    async def dbsize(self) -> int:
+        self.evict_expired()
+        return len(self._data)
+
+    async def memory_usage(self, key: str, samples: Optional[int] = None) -> Optional[int]:
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+        value = entry[1]
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(sys.getsizeof(field) + sys.getsizeof(item) for field, item in value.items())
+        return size
+
+    async def info(self, section: Optional[str] = None, *args: str, **kwargs: Any) -> dict[str, Any]:
+        if section == 'commandstats':
+            return {}
+        self.evict_expired()
+        used_memory = sum([await self.memory_usage(name) or 0 for name in list(self._data)])
+        return {
+            'redis_version': 'memory',
+            'redis_mode': 'memory',
+            'tcp_port': 0,
+            'connected_clients': 0,
+            'uptime_in_days': int((time.time() - self._started) // 86400),
+            'used_memory': used_memory,
+            'used_memory_human': f'{used_memory / 1024 / 1024:.2f}M',
+            'maxmemory_human': '0B',
+            'aof_enabled': 0,
+            'rdb_last_bgsave_status': 'ok',
+            'instantaneous_input_kbps': 0,
+            'instantaneous_output_kbps': 0,
+            'used_cpu_user_children': 0,
+        }
+
+    async def flushdb(self, asynchronous: bool = False, **kwargs: Any) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        self._scan_snapshots.clear()
+        return True
+
+    async def publish(self, channel: str, message: Any) -> int:
+        receivers = [pubsub for pubsub in self.pubsubs if channel in pubsub.channels]
+        for pubsub in receivers:
+            pubsub.deliver({'type': 'message', 'pattern': None, 'channel': channel, 'data': _encode(message)})
+        return len(receivers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False, **kwargs: Any) -> MemoryPubSub:
+        return MemoryPubSub(self, ignore_subscribe_messages)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> MemoryPipeline:
+        return MemoryPipeline(self)
+
+    def register_script(self, script: str) -> MemoryScript:
+        return MemoryScript(self, script)
+
+    async def close(self, **kwargs: Any) -> None:
+        await self.close_pubsubs()
+
+    aclose = close
+
+
+class FailoverScript:
+    """
+    可切换缓存后端的脚本对象：Redis可用时执行Lua脚本，否则执行内存缓存后端中注册的等价实现
+    """
+
+    def __init__(self, backend: 'FailoverCacheBackend', script: str) -> None:
+        self._backend = backend
+        self.script = script
+        self._redis_script = None
+        self.memory_script = MemoryScript(backend.fallback, script)
+
+    def get_redis_script(self) -> Any:
+        if self._redis_script is None:
+            self._redis_script = self._backend.redis.register_script(self.script)
+        return self._redis_script
+
+    async def __call__(
+        self, keys: Optional[Iterable] = None, args: Optional[Iterable] = None, client: Optional[Any] = None
+    ) -> Any:
+        if isinstance(client, FailoverPipeline):
+            return client.queue_script(self, keys, args)
+        if self._backend.healthy:
+            try:
+                return await self.get_redis_script()(keys=keys, args=args)
+            except FAILOVER_ERRORS as e:
+                self._backend.mark_unhealthy(e)
+        return await self.memory_script(keys=keys, args=args)
+
+
+class FailoverPipeline:
+    """
+    可切换缓存后端的管道：命令先记录下来，execute时在当前可用的后端上重放，Redis执行失败时改为在内存缓存后端上执行
+    """
+
+    def __init__(self, backend: 'FailoverCacheBackend', transaction: bool = True) -> None:
+        self._backend = backend
+        self._transaction = transaction
+        self._commands: list[tuple[Any, Any, Any]] = []
+
+    async def __aenter__(self) -> 'FailoverPipeline':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __getattr__(self, name: str) -> Callable[..., 'FailoverPipeline']:
+        def queue(*args: Any, **kwargs: Any) -> 'FailoverPipeline':
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def queue_script(
+        self, script: FailoverScript, keys: Optional[Iterable], args: Optional[Iterable]
+    ) -> 'FailoverPipeline':
+        self._commands.append((script, keys, args))
+        return self
+
+    def reset(self) -> None:
+        self._commands = []
+
+    async def _replay(self, pipe: Any, use_memory: bool) -> None:
+        for command, args, kwargs in self._commands:
+            if isinstance(command, FailoverScript):
+                script = command.memory_script if use_memory else command.get_redis_script()
+                await script(keys=args, args=kwargs, client=pipe)
+            else:
+                getattr(pipe, command)(*args, **kwargs)
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        try:
+            if self._backend.healthy:
+                try:
+                    async with self._backend.redis.pipeline(transaction=self._transaction) as pipe:
+                        await self._replay(pipe, use_memory=False)
+                        return await pipe.execute(raise_on_error=raise_on_error)
+                except FAILOVER_ERRORS as e:
+                    self._backend.mark_unhealthy(e)
+            pipe = self._backend.fallback.pipeline()
+            await self._replay(pipe, use_memory=True)
+            return await pipe.execute(raise_on_error=raise_on_error)
+        finally:
+            self.reset()
+
+
+class FailoverCacheBackend:
+    """
+    可切换的缓存后端：Redis可用时将命令转发至Redis，连接异常时切换到进程内的内存缓存后端降级运行；
+    后台任务定期检查Redis连接，恢复后将降级期间写入的键与Redis中的数据合并并切换回Redis
+    """
+
+    # 健康检查间隔及超时时间（秒）
+    HEALTH_CHECK_INTERVAL = 5
+    HEALTH_CHECK_TIMEOUT = 2
+
+    def __init__(self, redis: aioredis.Redis, healthy: bool = True) -> None:
+        """
+        :param redis: redis对象
+        :param healthy: 初始时Redis是否可用
+        """
+        self.redis = redis
+        self.fallback = MemoryCacheBackend()
+        self.healthy = healthy
+        self._health_check_task: Optional[asyncio.Task] = None
+        self._recover_callbacks: list[Callable[['FailoverCacheBackend'], Awaitable[None]]] = []
+        self._counter_keys: set[str] = set()
+
+    @property
+    def active(self) -> Union[aioredis.Redis, MemoryCacheBackend]:
+        return self.redis if self.healthy else self.fallback
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        async def command(*args: Any, **kwargs: Any) -> Any:
+            if self.healthy:
+                try:
+                    return await getattr(self.redis, name)(*args, **kwargs)
+                except FAILOVER_ERRORS as e:
+                    self.mark_unhealthy(e)
+            return await getattr(self.fallback, name)(*args, **kwargs)
+
+        return command
+
+    def mark_unhealthy(self, error: BaseException) -> None:
+        """
+        标记Redis不可用并切换到内存缓存后端
+
+        :param error: 异常信息
+        :return:
+        """
+        if self.healthy:
+            self.healthy = False
+            logger.warning(f'⚠️ redis连接异常，切换为内存缓存降级运行: {error}')
+
+    def add_recover_callback(self, callback: Callable[['FailoverCacheBackend'], Awaitable[None]]) -> None:
+        """
+        添加Redis恢复后执行的回调，如重新初始化字典与参数配置缓存
+
+        :param callback: 回调函数
+        :return:
+        """
+        self._recover_callbacks.append(callback)
+
+    def add_counter_key(self, name: str) -> None:
+        """
+        登记缓存版本号计数器：降级期间的计数不回写，Redis恢复时在Redis中递增一次，
+        使降级期间及之前以旧版本号写入的缓存全部失效
+
+        :param name: 计数器的键
+        :return:
+        """
+        self._counter_keys.add(name)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> FailoverPipeline:
+        return FailoverPipeline(self, transaction)
+
+    def register_script(self, script: str) -> FailoverScript:
+        return FailoverScript(self, script)
+
+    def pubsub(self, **kwargs: Any) -> Any:
+        return self.active.pubsub(**kwargs)
+
+    async def scan_iter(self, *args: Any, **kwargs: Any) -> AsyncIterator[str]:
+        async for key in self.active.scan_iter(*args, **kwargs):
+            yield key
+
+    async def _write_back(self, items: list[tuple[str, str, Any, Optional[int]]], incr_counters: bool) -> None:
+        # 键可能由其他工作进程共享，回写时与Redis中的数据合并而不是整体覆盖：
+        # 哈希与有序集合逐成员写入，字符串只写入Redis中不存在的键，版本号计数器改为在Redis中递增
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for name, value_type, value, ttl in items:
+                if name in self._counter_keys:
+                    continue
+                if value_type == 'string':
+                    pipe.set(name, value, ex=ttl, nx=True)
+                    continue
+                if not value:
+                    continue
+                if value_type == 'hash':
+                    pipe.hset(name, mapping=value)
+                else:
+                    pipe.zadd(name, value)
+                if ttl is not None:
+                    pipe.expire(name, ttl)
+            if incr_counters:
+                for name in sorted(self._counter_keys):
+                    pipe.incr(name)
+            await pipe.execute()
+
+    async def _recover(self) -> None:
+        snapshot = self.fallback.dump()
+        try:
+            await self._write_back(snapshot, incr_counters=True)
+        except Exception as e:
+            logger.warning(f'⚠️ 内存缓存回写redis失败，继续以内存缓存降级运行: {e}')
+            return
+        # 回写期间的写入仍落在内存缓存中，切换到Redis后再合并一次发生变化的键，导出后立即清空内存缓存
+        self.healthy = True
+        merged = {(name, value_type, repr(value)) for name, value_type, value, _ in snapshot}
+        remaining = [item for item in self.fallback.dump() if (item[0], item[1], repr(item[2])) not in merged]
+        await self.fallback.flushdb()
+        if remaining:
+            try:
+                await self._write_back(remaining, incr_counters=False)
+            except Exception as e:
+                logger.warning(f'⚠️ 回写期间写入内存缓存的{len(remaining)}个键合并至redis失败: {e}')
+        # 结束内存缓存后端上的订阅，订阅方重新订阅时将使用Redis
+        await self.fallback.close_pubsubs()
+        logger.info('✅️ redis连接已恢复，切换回redis缓存')
+        for callback in self._recover_callbacks:
+            try:
+                await callback(self)
+            except Exception as e:
+                logger.warning(f'⚠️ redis恢复后回调执行失败: {e}')
+
+    async def _health_check(self) -> None:
+        while True:
+            await asyncio.sleep(self.HEALTH_CHECK_INTERVAL)
+            self.fallback.evict_expired()
+            try:
+                await asyncio.wait_for(self.redis.ping(), self.HEALTH_CHECK_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.mark_unhealthy(e)
+                continue
+            if not self.healthy:
+                await self._recover()
+
+    def start_health_check(self) -> None:
+        """
+        启动Redis健康检查任务
+
+        :return:
+        """
+        if self._health_check_task is None or self._health_check_task.done():
+            self._health_check_task = asyncio.create_task(self._health_check())
+
+    async def close(self) -> None:
+        """
+        停止健康检查并关闭连接
+
+        :return:
+        """
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_check_task
+            self._health_check_task = None
+        await self.fallback.close()
+        with contextlib.suppress(*FAILOVER_ERRORS):
+            await self.redis.close()
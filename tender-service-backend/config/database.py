@@ -1,7 +1,10 @@
+from collections.abc import Callable
+from typing import Any
 from urllib.parse import quote_plus
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session
 
 from config.env import DataBaseConfig
 
@@ -26,5 +29,106 @@ async_engine = create_async_engine(
 AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=async_engine)
 
 
+class DbPoolMonitor:
+    """
+    数据库连接池占用监控
+    """
+
+    checked_out: int = 0
+    peak_checked_out: int = 0
+    total_checkouts: int = 0
+
+    @classmethod
+    def on_checkout(cls, *args: Any) -> None:
+        cls.checked_out += 1
+        cls.total_checkouts += 1
+        cls.peak_checked_out = max(cls.peak_checked_out, cls.checked_out)
+
+    @classmethod
+    def on_checkin(cls, *args: Any) -> None:
+        cls.checked_out = max(0, cls.checked_out - 1)
+
+    @classmethod
+    def snapshot(cls, reset_peak: bool = False) -> dict[str, int]:
+        """
+        获取连接池占用快照
+
+        :param reset_peak: 是否在读取后重置峰值
+        :return: 连接池容量、当前占用、峰值占用等信息
+        """
+        pool = async_engine.pool
+        result = {
+            'pool_size': DataBaseConfig.db_pool_size,
+            'max_overflow': DataBaseConfig.db_max_overflow,
+            'checked_out': cls.checked_out,
+            'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else 0,
+            'overflow': max(0, pool.overflow()) if hasattr(pool, 'overflow') else 0,
+            'peak_checked_out': cls.peak_checked_out,
+            'total_checkouts': cls.total_checkouts,
+        }
+        if reset_peak:
+            cls.peak_checked_out = cls.checked_out
+        return result
+
+
+event.listen(async_engine.sync_engine, 'checkout', DbPoolMonitor.on_checkout)
+event.listen(async_engine.sync_engine, 'checkin', DbPoolMonitor.on_checkin)
+
+
+class TableWriteEvents:
+    """
+    表写入事件：记录会话中写入的表（ORM flush 及 ORM insert/update/delete 语句），
+    在会话提交后通知订阅者，回滚时丢弃
+    """
+
+    _subscribers: list[Callable[[set[str]], None]] = []
+
+    @classmethod
+    def subscribe(cls, callback: Callable[[set[str]], None]) -> None:
+        """
+        订阅表写入事件
+
+        :param callback: 回调函数，参数为本次提交写入的表名集合
+        """
+        cls._subscribers.append(callback)
+
+    @staticmethod
+    def _pending_tables(session: Session) -> set[str]:
+        return session.info.setdefault('written_tables', set())
+
+    @classmethod
+    def on_after_flush(cls, session: Session, flush_context: Any) -> None:
+        tables = cls._pending_tables(session)
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            table = getattr(obj, '__table__', None)
+            if table is not None:
+                tables.add(table.name)
+
+    @classmethod
+    def on_orm_execute(cls, orm_execute_state: ORMExecuteState) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, 'table', None)
+            if table is not None:
+                cls._pending_tables(orm_execute_state.session).add(table.name)
+
+    @classmethod
+    def on_after_commit(cls, session: Session) -> None:
+        tables = session.info.pop('written_tables', None)
+        if not tables:
+            return
+        for callback in cls._subscribers:
+            callback(tables)
+
+    @classmethod
+    def on_after_rollback(cls, session: Session) -> None:
+        session.info.pop('written_tables', None)
+
+
+event.listen(Session, 'after_flush', TableWriteEvents.on_after_flush)
+event.listen(Session, 'do_orm_execute', TableWriteEvents.on_orm_execute)
+event.listen(Session, 'after_commit', TableWriteEvents.on_after_commit)
+event.listen(Session, 'after_rollback', TableWriteEvents.on_after_rollback)
+
+
 class Base(AsyncAttrs, DeclarativeBase):
     pass
@@ -34,6 +34,7 @@ class JwtSettings(BaseSettings):
     jwt_algorithm: str = 'HS256'
     jwt_expire_minutes: int = 1440
     jwt_redis_expire_minutes: int = 30
+    jwt_redis_refresh_threshold_minutes: int = 20
 
 
 class DataBaseSettings(BaseSettings):
@@ -216,8 +217,8 @@ class GetConfig:
             # 使用argparse定义命令行参数
             parser = argparse.ArgumentParser(description='命令行参数')
             parser.add_argument('--env', type=str, default='', help='运行环境')
-            # 解析命令行参数
-            args = parser.parse_args()
+            # 解析命令行参数，忽略其他工具（如pytest）的参数
+            args, _ = parser.parse_known_args()
             # 设置环境变量，如果未设置命令行参数，默认APP_ENV为dev
             os.environ['APP_ENV'] = args.env if args.env else 'dev'
         # 读取运行环境
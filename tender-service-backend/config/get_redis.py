@@ -3,10 +3,13 @@ from redis import asyncio as aioredis
 from redis.exceptions import AuthenticationError, RedisError
 from redis.exceptions import TimeoutError as RedisTimeoutError
 
+from config.cache_backend import FailoverCacheBackend
 from config.database import AsyncSessionLocal
 from config.env import RedisConfig
 from module_admin.service.config_service import ConfigService
 from module_admin.service.dict_service import DictDataService
+from module_admin.service.principal_cache_service import PrincipalCacheService
+from module_tender.service.dashboard_cache import TenderDashboardCache
 from utils.log_util import logger
 
 
@@ -15,12 +18,19 @@ class RedisUtil:
     Redis相关方法
     """
 
+    # 建立连接的超时时间（秒），Redis不可达时尽快切换到内存缓存
+    CONNECT_TIMEOUT = 5
+    # 命令读写的超时时间（秒），连接挂起时命令超时失败并切换到内存缓存
+    COMMAND_TIMEOUT = 3
+    # 空闲连接复用前发送PING检查的间隔（秒）
+    HEALTH_CHECK_INTERVAL = 30
+
     @classmethod
-    async def create_redis_pool(cls) -> aioredis.Redis:
+    async def create_redis_pool(cls) -> FailoverCacheBackend:
         """
-        应用启动时初始化redis连接
+        应用启动时初始化redis连接，Redis不可用时以内存缓存降级运行，恢复后自动切换回Redis
 
-        :return: Redis连接对象
+        :return: 可切换的缓存后端对象
         """
         logger.info('🔎 开始连接redis...')
         redis = await aioredis.from_url(
@@ -31,10 +41,15 @@ class RedisUtil:
             db=RedisConfig.redis_database,
             encoding='utf-8',
             decode_responses=True,
+            socket_connect_timeout=cls.CONNECT_TIMEOUT,
+            socket_timeout=cls.COMMAND_TIMEOUT,
+            health_check_interval=cls.HEALTH_CHECK_INTERVAL,
         )
+        healthy = False
         try:
             connection = await redis.ping()
             if connection:
+                healthy = True
                 logger.info('✅️ redis连接成功')
             else:
                 logger.error('❌️ redis连接失败')
@@ -42,9 +57,19 @@ class RedisUtil:
             logger.error(f'❌️ redis用户名或密码错误，详细错误信息：{e}')
         except RedisTimeoutError as e:
             logger.error(f'❌️ redis连接超时，详细错误信息：{e}')
-        except RedisError as e:
+        except (RedisError, OSError) as e:
             logger.error(f'❌️ redis连接错误，详细错误信息：{e}')
-        return redis
+        if not healthy:
+            logger.warning('⚠️ 系统将以内存缓存降级运行，redis恢复后自动切换')
+        backend = FailoverCacheBackend(redis, healthy=healthy)
+        # Redis恢复后重新缓存字典与参数配置
+        backend.add_recover_callback(cls.init_sys_dict)
+        backend.add_recover_callback(cls.init_sys_config)
+        # 权限与概览缓存的版本号在Redis恢复时递增一次，降级期间的变更由此在各工作进程生效
+        backend.add_counter_key(PrincipalCacheService.version_key())
+        backend.add_counter_key(TenderDashboardCache.version_key())
+        backend.start_health_check()
+        return backend
 
     @classmethod
     async def close_redis_pool(cls, app: FastAPI) -> None:
@@ -58,7 +83,7 @@ class RedisUtil:
         logger.info('✅️ 关闭redis连接成功')
 
     @classmethod
-    async def init_sys_dict(cls, redis: FastAPI) -> None:
+    async def init_sys_dict(cls, redis: aioredis.Redis) -> None:
         """
         应用启动时缓存字典表
 
@@ -0,0 +1,329 @@
+import asyncio
+import types
+from typing import Any
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
+
+from config import cache_backend
+from config.cache_backend import FailoverCacheBackend, MemoryCacheBackend
+from module_admin.service.login_service import TOKEN_REFRESH_SCRIPT
+from module_admin.service.online_service import PURGE_EXPIRED_SESSION_SCRIPT
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class FlakyRedis(MemoryCacheBackend):
+    """
+    以内存缓存模拟Redis，down为True时所有命令抛出连接异常
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.down = False
+
+    def __getattribute__(self, name: str) -> Any:
+        attr = super().__getattribute__(name)
+        if (
+            name.startswith('_')
+            or name in ('pipeline', 'register_script', 'pubsub')
+            or not callable(attr)
+            or not object.__getattribute__(self, 'down')
+        ):
+            return attr
+
+        async def fail(*args: Any, **kwargs: Any) -> Any:
+            raise RedisConnectionError('Connection refused')
+
+        return fail
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache_backend, 'time', types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+def run(coro: Any) -> Any:
+    return asyncio.run(coro)
+
+
+def test_string_ttl_and_conditional_set(clock: Clock) -> None:
+    async def scenario() -> None:
+        backend = MemoryCacheBackend()
+        assert await backend.set('a', 1, ex=10)
+        assert await backend.get('a') == '1'
+        assert await backend.ttl('a') == 10
+        assert await backend.set('a', 2, nx=True) is None
+        assert await backend.set('b', 2, xx=True) is None
+        assert await backend.ttl('missing') == -2
+
+        await backend.set('a', 3, keepttl=True)
+        clock.now += 5
+        assert await backend.ttl('a') == 5
+        assert await backend.incr('a') == 4
+        clock.now += 5
+        assert await backend.get('a') is None
+        assert await backend.exists('a') == 0
+
+        await backend.set('c', 'x')
+        assert await backend.ttl('c') == -1
+        with pytest.raises(ResponseError):
+            await backend.incr('c')
+        with pytest.raises(ResponseError):
+            await backend.hget('c', 'field')
+
+    run(scenario())
+
+
+def test_scan_returns_keys_present_for_the_whole_iteration() -> None:
+    async def scenario() -> None:
+        backend = MemoryCacheBackend()
+        for index in range(25):
+            await backend.set(f'user:{index}', index)
+        await backend.set('other', 1)
+
+        cursor, first = await backend.scan(0, match='user:*', count=10)
+        assert cursor != 0
+        # 遍历过程中新增的键不影响游标快照，删除的键不再返回
+        await backend.set('user:new', 1)
+        await backend.delete('user:24')
+        keys = list(first)
+        while cursor != 0:
+            cursor, batch = await backend.scan(cursor, match='user:*', count=10)
+            keys.extend(batch)
+        assert sorted(keys) == sorted(f'user:{index}' for index in range(24))
+        assert await backend.scan(12345) == (0, [])
+
+        assert [key async for key in backend.scan_iter(match='user:1?')] == [f'user:1{index}' for index in range(10)]
+
+    run(scenario())
+
+
+def test_zset_ranges() -> None:
+    async def scenario() -> None:
+        backend = MemoryCacheBackend()
+        assert await backend.zadd('z', {'a': 1, 'b': 2, 'c': 3}) == 3
+        assert await backend.zadd('z', {'a': 5}, nx=True) == 0
+        assert await backend.zadd('z', {'d': 4}, xx=True) == 0
+        assert await backend.zadd('missing', {'d': 4}, xx=True) == 0
+        assert await backend.exists('missing') == 0
+
+        assert await backend.zrangebyscore('z', '-inf', 2) == ['a', 'b']
+        assert await backend.zrangebyscore('z', '(1', '+inf') == ['b', 'c']
+        assert await backend.zrangebyscore('z', 1, 3, start=1, num=1) == ['b']
+        assert await backend.zrangebyscore('z', 2, 3, withscores=True) == [('b', 2.0), ('c', 3.0)]
+        assert await backend.zrevrange('z', 0, 1) == ['c', 'b']
+        assert await backend.zrange('z', -2, -1) == ['b', 'c']
+        assert await backend.zcard('z') == 3
+
+    run(scenario())
+
+
+def test_pipeline_collects_command_errors() -> None:
+    async def scenario() -> None:
+        backend = MemoryCacheBackend()
+        await backend.set('s', 'x')
+        async with backend.pipeline() as pipe:
+            pipe.set('a', 1)
+            pipe.hget('s', 'field')
+            pipe.get('a')
+            results = await pipe.execute(raise_on_error=False)
+        assert results[0] is True
+        assert isinstance(results[1], ResponseError)
+        assert results[2] == '1'
+
+        async with backend.pipeline() as pipe:
+            pipe.incr('s')
+            with pytest.raises(ResponseError):
+                await pipe.execute()
+
+    run(scenario())
+
+
+def test_token_refresh_handler(clock: Clock) -> None:
+    async def scenario() -> None:
+        backend = MemoryCacheBackend()
+        script = backend.register_script(TOKEN_REFRESH_SCRIPT)
+        await backend.set('access_token:1', 'token', ex=100)
+        await backend.zadd('online_session:expire', {'1': clock.now + 100})
+        keys = ['access_token:1', 'online_session:expire']
+
+        # 剩余有效时间高于续期阈值时不续期
+        assert await script(keys=keys, args=['token', 50, 600, int(clock.now) + 600, '1']) == 'token'
+        assert await backend.ttl('access_token:1') == 100
+
+        clock.now += 60
+        assert await script(keys=keys, args=['other', 50, 600, int(clock.now) + 600, '1']) == 'token'
+        assert await backend.ttl('access_token:1') == 40
+
+        assert await script(keys=keys, args=['token', 50, 600, int(clock.now) + 600, '1']) == 'token'
+        assert await backend.ttl('access_token:1') == 600
+        assert await backend.zrangebyscore('online_session:expire', clock.now + 600, clock.now + 600) == ['1']
+
+        # 已移除的会话不会因续期重新登记
+        await backend.zrem('online_session:expire', '1')
+        await backend.expire('access_token:1', 10)
+        await script(keys=keys, args=['token', 50, 600, int(clock.now) + 600, '1'])
+        assert await backend.zcard('online_session:expire') == 0
+
+    run(scenario())
+
+
+def test_purge_expired_session_handler() -> None:
+    async def scenario() -> None:
+        backend = MemoryCacheBackend()
+        script = backend.register_script(PURGE_EXPIRED_SESSION_SCRIPT)
+        await backend.zadd('expire', {'a': 1, 'b': 2, 'c': 30})
+        await backend.hset('info', mapping={'a': 'x', 'b': 'y', 'c': 'z'})
+
+        assert await script(keys=['expire', 'info'], args=[10, 1]) == 1
+        assert await script(keys=['expire', 'info'], args=[10, 100]) == 1
+        assert await script(keys=['expire', 'info'], args=[10, 100]) == 0
+        assert await backend.zrange('expire', 0, -1) == ['c']
+        assert await backend.hgetall('info') == {'c': 'z'}
+
+    run(scenario())
+
+
+def test_unregistered_script_raises() -> None:
+    async def scenario() -> None:
+        with pytest.raises(ResponseError):
+            await MemoryCacheBackend().register_script('return 1')(keys=[], args=[])
+
+    run(scenario())
+
+
+def test_failover_and_recover_merges_into_redis() -> None:
+    async def scenario() -> None:
+        redis = FlakyRedis()
+        backend = FailoverCacheBackend(redis)
+        backend.add_counter_key('user_principal:version')
+        recovered = []
+
+        async def on_recover(target: FailoverCacheBackend) -> None:
+            recovered.append(target.healthy)
+
+        backend.add_recover_callback(on_recover)
+        await redis.set('user_principal:version', 57)
+        await redis.set('shared', 'redis')
+        await redis.hset('online_session:info', 'old', 'redis-session')
+        await redis.zadd('online_session:expire', {'old': 100})
+
+        redis.down = True
+        assert await backend.set('shared', 'memory') is True
+        assert backend.healthy is False
+        await backend.set('only_memory', 'memory', ex=60)
+        assert await backend.incr('user_principal:version') == 1
+        async with backend.pipeline() as pipe:
+            pipe.hset('online_session:info', 'new', 'memory-session')
+            pipe.zadd('online_session:expire', {'new': 200})
+            await pipe.execute()
+        script = backend.register_script(PURGE_EXPIRED_SESSION_SCRIPT)
+        assert await script(keys=['online_session:expire', 'online_session:info'], args=[0, 10]) == 0
+
+        # Redis仍不可用时保持降级
+        await backend._recover()
+        assert backend.healthy is False
+
+        redis.down = False
+        await backend._recover()
+        assert backend.healthy is True
+        assert recovered == [True]
+        assert await backend.fallback.dbsize() == 0
+        assert await redis.hgetall('online_session:info') == {'old': 'redis-session', 'new': 'memory-session'}
+        assert await redis.zrange('online_session:expire', 0, -1) == ['old', 'new']
+        assert await redis.get('shared') == 'redis'
+        assert await redis.get('only_memory') == 'memory'
+        assert 0 < await redis.ttl('only_memory') <= 60
+        assert await redis.get('user_principal:version') == '58'
+        assert await backend.get('shared') == 'redis'
+
+    run(scenario())
+
+
+def test_recover_keeps_writes_made_during_write_back() -> None:
+    async def scenario() -> None:
+        redis = FlakyRedis()
+        backend = FailoverCacheBackend(redis)
+        backend.add_counter_key('version')
+        redis.down = True
+        await backend.set('before', 'memory')
+        await backend.hset('session', 'a', '1')
+        redis.down = False
+
+        pipeline = redis.pipeline
+
+        def pipeline_with_concurrent_write(*args: Any, **kwargs: Any) -> Any:
+            pipe = pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def execute_after_write(*execute_args: Any, **execute_kwargs: Any) -> Any:
+                # 模拟回写命令执行期间其他请求写入内存缓存
+                if not backend.healthy:
+                    await backend.set('during', 'memory')
+                    await backend.hset('session', 'b', '2')
+                return await execute(*execute_args, **execute_kwargs)
+
+            pipe.execute = execute_after_write
+            return pipe
+
+        redis.pipeline = pipeline_with_concurrent_write
+        await backend._recover()
+        assert backend.healthy is True
+        assert await backend.fallback.dbsize() == 0
+        assert await redis.get('before') == 'memory'
+        assert await redis.get('during') == 'memory'
+        assert await redis.hgetall('session') == {'a': '1', 'b': '2'}
+        assert await redis.get('version') == '1'
+
+    run(scenario())
+
+
+def test_memory_pubsub_polling() -> None:
+    async def scenario() -> None:
+        backend = MemoryCacheBackend()
+        async with backend.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.subscribe('channel')
+            assert pubsub.subscribed
+            assert await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.01) is None
+            await backend.publish('channel', 'message')
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.01)
+            assert message['data'] == 'message'
+            await backend.close_pubsubs()
+            assert not pubsub.subscribed
+
+    run(scenario())
+
+
+def test_health_check_switches_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(FailoverCacheBackend, 'HEALTH_CHECK_INTERVAL', 0.01)
+
+    async def scenario() -> None:
+        redis = FlakyRedis()
+        backend = FailoverCacheBackend(redis)
+        backend.add_counter_key('version')
+        backend.start_health_check()
+        try:
+            redis.down = True
+            await asyncio.sleep(0.05)
+            assert backend.healthy is False
+            await backend.set('key', 'value')
+
+            redis.down = False
+            await asyncio.sleep(0.05)
+            assert backend.healthy is True
+            assert await redis.get('key') == 'value'
+            assert await redis.get('version') == '1'
+        finally:
+            await backend.close()
+
+    run(scenario())
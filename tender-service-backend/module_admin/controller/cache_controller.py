@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import Path, Request, Response
+from fastapi import Path, Query, Request, Response
 
 from common.aspect.interface_auth import UserInterfaceAuthDependency
 from common.aspect.pre_auth import PreAuthDependency
@@ -40,7 +40,7 @@ async def get_monitor_cache_info(request: Request) -> Response:
 )
 async def get_monitor_cache_name(request: Request) -> Response:
     # 获取全量数据
-    cache_name_list_result = await CacheService.get_cache_monitor_cache_name_services()
+    cache_name_list_result = await CacheService.get_cache_monitor_cache_name_services(request)
     logger.info('获取成功')
 
     return ResponseUtil.success(data=cache_name_list_result)
@@ -49,16 +49,22 @@ async def get_monitor_cache_name(request: Request) -> Response:
 @cache_controller.get(
     '/getKeys/{cache_name}',
     summary='获取缓存键列表接口',
-    description='用于获取指定缓存名称下的所有缓存键列表',
+    description='用于按游标分页获取指定缓存名称下的缓存键列表，返回的cursor为0时表示已获取全部缓存键',
     response_model=DataResponseModel[list[str]],
     dependencies=[UserInterfaceAuthDependency('monitor:cache:list')],
 )
-async def get_monitor_cache_key(request: Request, cache_name: Annotated[str, Path(description='缓存名称')]) -> Response:
-    # 获取全量数据
-    cache_key_list_result = await CacheService.get_cache_monitor_cache_key_services(request, cache_name)
+async def get_monitor_cache_key(
+    request: Request,
+    cache_name: Annotated[str, Path(description='缓存名称')],
+    cursor: Annotated[int, Query(ge=0, description='起始游标，首次获取为0')] = 0,
+    limit: Annotated[int, Query(ge=1, le=10000, description='本页期望获取的缓存键数量')] = 1000,
+) -> Response:
+    next_cursor, cache_key_list_result = await CacheService.get_cache_monitor_cache_key_services(
+        request, cache_name, cursor, limit
+    )
     logger.info('获取成功')
 
-    return ResponseUtil.success(data=cache_key_list_result)
+    return ResponseUtil.success(data=cache_key_list_result, dict_content={'cursor': next_cursor})
 
 
 @cache_controller.get(
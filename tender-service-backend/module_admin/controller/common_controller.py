@@ -1,13 +1,15 @@
 from typing import Annotated
 
-from fastapi import BackgroundTasks, File, Query, Request, Response, UploadFile
+from fastapi import BackgroundTasks, File, Path, Query, Request, Response, UploadFile
 from fastapi.responses import StreamingResponse
 
-from common.aspect.pre_auth import PreAuthDependency
+from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.router import APIRouterPro
-from common.vo import DynamicResponseModel
-from module_admin.entity.vo.common_vo import UploadResponseModel
+from common.vo import DataResponseModel, DynamicResponseModel
+from module_admin.entity.vo.common_vo import ExportJobModel, UploadResponseModel
+from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.common_service import CommonService
+from module_admin.service.export_job_service import ExportJobService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -46,7 +48,10 @@ async def common_download(
     background_tasks: BackgroundTasks,
     file_name: Annotated[str, Query(alias='fileName')],
     delete: Annotated[bool, Query()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
 ) -> Response:
+    if ExportJobService.is_export_file(file_name):
+        await ExportJobService.check_export_file_owner_services(request, file_name, current_user.user.user_id)
     download_result = await CommonService.download_services(background_tasks, file_name, delete)
     logger.info(download_result.message)
 
@@ -72,3 +77,20 @@ async def common_download_resource(request: Request, resource: Annotated[str, Qu
     logger.info(download_resource_result.message)
 
     return ResponseUtil.streaming(data=download_resource_result.result)
+
+
+@common_controller.get(
+    '/exportJob/{job_id}',
+    summary='获取导出任务进度接口',
+    description='用于轮询异步导出任务的状态与进度，任务成功后返回的文件名称可通过通用文件下载接口下载',
+    response_model=DataResponseModel[ExportJobModel],
+)
+async def get_common_export_job(
+    request: Request,
+    job_id: Annotated[str, Path(description='导出任务ID')],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_job = await ExportJobService.get_export_job_services(request, job_id, current_user.user.user_id)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=export_job)
@@ -18,6 +18,7 @@ from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.vo.dept_vo import DeleteDeptModel, DeptModel, DeptQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.dept_service import DeptService
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -85,6 +86,7 @@ async def add_system_dept(
     add_dept.update_by = current_user.user.user_name
     add_dept.update_time = datetime.now()
     add_dept_result = await DeptService.add_dept_services(query_db, add_dept)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(add_dept_result.message)
 
     return ResponseUtil.success(msg=add_dept_result.message)
@@ -111,6 +113,7 @@ async def edit_system_dept(
     edit_dept.update_by = current_user.user.user_name
     edit_dept.update_time = datetime.now()
     edit_dept_result = await DeptService.edit_dept_services(query_db, edit_dept)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(edit_dept_result.message)
 
     return ResponseUtil.success(msg=edit_dept_result.message)
@@ -140,6 +143,7 @@ async def delete_system_dept(
     delete_dept.update_by = current_user.user.user_name
     delete_dept.update_time = datetime.now()
     delete_dept_result = await DeptService.delete_dept_services(query_db, delete_dept)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(delete_dept_result.message)
 
     return ResponseUtil.success(msg=delete_dept_result.message)
@@ -13,6 +13,7 @@ from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.enums import BusinessType
 from common.router import APIRouterPro
 from common.vo import DataResponseModel, PageResponseModel, ResponseBaseModel
+from module_admin.entity.vo.common_vo import ExportJobModel
 from module_admin.entity.vo.dict_vo import (
     DeleteDictDataModel,
     DeleteDictTypeModel,
@@ -23,6 +24,7 @@ from module_admin.entity.vo.dict_vo import (
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.dict_service import DictDataService, DictTypeService
+from module_admin.service.export_job_service import ExportJobService
 from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
@@ -202,6 +204,33 @@ async def export_system_dict_type_list(
     return ResponseUtil.streaming(data=bytes2file_response(dict_type_export_result))
 
 
+@dict_controller.post(
+    '/type/exportAsync',
+    summary='异步导出字典类型列表接口',
+    description='用于创建导出当前符合查询条件的字典类型列表数据的后台任务，返回任务ID供轮询进度',
+    response_model=DataResponseModel[ExportJobModel],
+    dependencies=[UserInterfaceAuthDependency('system:dict:export')],
+)
+@Log(title='字典类型', business_type=BusinessType.EXPORT)
+async def export_system_dict_type_list_async(
+    request: Request,
+    dict_type_page_query: Annotated[DictTypePageQueryModel, Form()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_job = await ExportJobService.submit_list_export_services(
+        request,
+        'dict_type',
+        lambda query_db: DictTypeService.get_dict_type_list_services(
+            query_db, dict_type_page_query, is_page=False
+        ),
+        DictTypeService.export_dict_type_list_services,
+        current_user.user.user_id,
+    )
+    logger.info('导出任务已创建')
+
+    return ResponseUtil.success(data=export_job)
+
+
 @dict_controller.get(
     '/data/type/{dict_type}',
     summary='获取指定字典类型的数据列表接口',
@@ -358,3 +387,30 @@ async def export_system_dict_data_list(
     logger.info('导出成功')
 
     return ResponseUtil.streaming(data=bytes2file_response(dict_data_export_result))
+
+
+@dict_controller.post(
+    '/data/exportAsync',
+    summary='异步导出字典数据列表接口',
+    description='用于创建导出当前符合查询条件的字典数据列表数据的后台任务，返回任务ID供轮询进度',
+    response_model=DataResponseModel[ExportJobModel],
+    dependencies=[UserInterfaceAuthDependency('system:dict:export')],
+)
+@Log(title='字典数据', business_type=BusinessType.EXPORT)
+async def export_system_dict_data_list_async(
+    request: Request,
+    dict_data_page_query: Annotated[DictDataPageQueryModel, Form()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_job = await ExportJobService.submit_list_export_services(
+        request,
+        'dict_data',
+        lambda query_db: DictDataService.get_dict_data_list_services(
+            query_db, dict_data_page_query, is_page=False
+        ),
+        DictDataService.export_dict_data_list_services,
+        current_user.user.user_id,
+    )
+    logger.info('导出任务已创建')
+
+    return ResponseUtil.success(data=export_job)
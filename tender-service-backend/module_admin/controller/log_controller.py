@@ -7,10 +7,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from common.annotation.log_annotation import Log
 from common.aspect.db_seesion import DBSessionDependency
 from common.aspect.interface_auth import UserInterfaceAuthDependency
-from common.aspect.pre_auth import PreAuthDependency
+from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.enums import BusinessType
 from common.router import APIRouterPro
-from common.vo import PageResponseModel, ResponseBaseModel
+from common.vo import DataResponseModel, PageResponseModel, ResponseBaseModel
+from module_admin.entity.vo.common_vo import ExportJobModel
 from module_admin.entity.vo.log_vo import (
     DeleteLoginLogModel,
     DeleteOperLogModel,
@@ -20,6 +21,8 @@ from module_admin.entity.vo.log_vo import (
     OperLogPageQueryModel,
     UnlockUser,
 )
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.export_job_service import ExportJobService
 from module_admin.service.log_service import LoginLogService, OperationLogService
 from utils.common_util import bytes2file_response
 from utils.log_util import logger
@@ -123,6 +126,33 @@ async def export_system_operation_log_list(
     return ResponseUtil.streaming(data=bytes2file_response(operation_log_export_result))
 
 
+@log_controller.post(
+    '/operlog/exportAsync',
+    summary='异步导出操作日志接口',
+    description='用于创建导出当前符合查询条件的操作日志数据的后台任务，返回任务ID供轮询进度',
+    response_model=DataResponseModel[ExportJobModel],
+    dependencies=[UserInterfaceAuthDependency('monitor:operlog:export')],
+)
+@Log(title='操作日志', business_type=BusinessType.EXPORT)
+async def export_system_operation_log_list_async(
+    request: Request,
+    operation_log_page_query: Annotated[OperLogPageQueryModel, Form()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_job = await ExportJobService.submit_list_export_services(
+        request,
+        'operlog',
+        lambda query_db: OperationLogService.get_operation_log_list_services(
+            query_db, operation_log_page_query, is_page=False
+        ),
+        lambda rows: OperationLogService.export_operation_log_list_services(request, rows),
+        current_user.user.user_id,
+    )
+    logger.info('导出任务已创建')
+
+    return ResponseUtil.success(data=export_job)
+
+
 @log_controller.get(
     '/logininfor/list',
     summary='获取登录日志分页列表接口',
@@ -230,3 +260,30 @@ async def export_system_login_log_list(
     logger.info('导出成功')
 
     return ResponseUtil.streaming(data=bytes2file_response(login_log_export_result))
+
+
+@log_controller.post(
+    '/logininfor/exportAsync',
+    summary='异步导出登录日志接口',
+    description='用于创建导出当前符合查询条件的登录日志数据的后台任务，返回任务ID供轮询进度',
+    response_model=DataResponseModel[ExportJobModel],
+    dependencies=[UserInterfaceAuthDependency('monitor:logininfor:export')],
+)
+@Log(title='登录日志', business_type=BusinessType.EXPORT)
+async def export_system_login_log_list_async(
+    request: Request,
+    login_log_page_query: Annotated[LoginLogPageQueryModel, Form()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_job = await ExportJobService.submit_list_export_services(
+        request,
+        'logininfor',
+        lambda query_db: LoginLogService.get_login_log_list_services(
+            query_db, login_log_page_query, is_page=False
+        ),
+        LoginLogService.export_login_log_list_services,
+        current_user.user.user_id,
+    )
+    logger.info('导出任务已创建')
+
+    return ResponseUtil.success(data=export_job)
@@ -16,8 +16,11 @@ from config.env import AppConfig, JwtConfig
 from module_admin.entity.vo.login_vo import RouterModel, Token, UserLogin, UserRegister
 from module_admin.entity.vo.user_vo import CurrentUserModel, EditUserModel
 from module_admin.service.login_service import CustomOAuth2PasswordRequestForm, LoginService, oauth2_scheme
+from module_admin.service.online_service import OnlineService
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from module_admin.service.user_service import UserService
 from utils.log_util import logger
+from utils.redis_util import RedisBatchUtil
 from utils.response_util import ResponseUtil
 
 login_controller = APIRouterPro(order_num=1, tags=['登录模块'])
@@ -35,9 +38,19 @@ async def login(
     form_data: Annotated[CustomOAuth2PasswordRequestForm, Depends()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    captcha_enabled = (
-        await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled') == 'true'
+    captcha_enabled_key = f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled'
+    # 登录校验所需的配置、锁定状态、错误次数与验证码一次读取
+    await RedisBatchUtil.prefetch(
+        request,
+        [
+            captcha_enabled_key,
+            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.login.blackIPList',
+            f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{form_data.username}',
+            f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{form_data.username}',
+            f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{form_data.uuid}',
+        ],
     )
+    captcha_enabled = await RedisBatchUtil.get(request, captcha_enabled_key) == 'true'
     user = UserLogin(
         userName=form_data.username,
         password=form_data.password,
@@ -59,22 +72,32 @@ async def login(
         },
         expires_delta=access_token_expires,
     )
-    if AppConfig.app_same_time_login:
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
-    else:
-        # 此方法可实现同一账号同一时间只能登录一次
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{result[0].user_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
+    # 不允许同时登录时以用户ID作为会话编号，可实现同一账号同一时间只能登录一次
+    token_id = session_id if AppConfig.app_same_time_login else str(result[0].user_id)
+    await request.app.state.redis.set(
+        f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}',
+        access_token,
+        ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+    )
+    login_info = user.login_info or {}
+    await OnlineService.register_session_services(
+        request,
+        token_id,
+        {
+            'token_id': token_id,
+            'user_name': result[0].user_name,
+            'dept_name': result[1].dept_name if result[1] else None,
+            'ipaddr': login_info.get('ipaddr'),
+            'login_location': login_info.get('loginLocation'),
+            'browser': login_info.get('browser'),
+            'os': login_info.get('os'),
+            'login_time': login_info.get('loginTime'),
+        },
+    )
     await UserService.edit_user_services(
         query_db, EditUserModel(userId=result[0].user_id, loginDate=datetime.now(), type='status')
     )
+    await PrincipalCacheService.invalidate_principal_services(request, result[0].user_id)
     logger.info('登录成功')
     # 判断请求是否来自于api文档，如果是返回指定格式的结果，用于修复api文档认证成功后token显示undefined的bug
     request_from_swagger = request.headers.get('referer').endswith('docs') if request.headers.get('referer') else False
@@ -16,6 +16,7 @@ from module_admin.entity.vo.menu_vo import DeleteMenuModel, MenuModel, MenuQuery
 from module_admin.entity.vo.role_vo import RoleMenuQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.menu_service import MenuService
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -121,6 +122,7 @@ async def edit_system_menu(
     edit_menu.update_by = current_user.user.user_name
     edit_menu.update_time = datetime.now()
     edit_menu_result = await MenuService.edit_menu_services(query_db, edit_menu)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(edit_menu_result.message)
 
     return ResponseUtil.success(msg=edit_menu_result.message)
@@ -141,6 +143,7 @@ async def delete_system_menu(
 ) -> Response:
     delete_menu = DeleteMenuModel(menuIds=menu_ids)
     delete_menu_result = await MenuService.delete_menu_services(query_db, delete_menu)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(delete_menu_result.message)
 
     return ResponseUtil.success(msg=delete_menu_result.message)
@@ -31,13 +31,11 @@ async def get_monitor_online_list(
     request: Request,
     online_page_query: Annotated[OnlineQueryModel, Query()],
 ) -> Response:
-    # 获取全量数据
-    online_query_result = await OnlineService.get_online_list_services(request, online_page_query)
+    # 未传入分页参数时获取全量数据
+    online_query_result, online_total = await OnlineService.get_online_list_services(request, online_page_query)
     logger.info('获取成功')
 
-    return ResponseUtil.success(
-        model_content=OnlinePageResponseModel(rows=online_query_result, total=len(online_query_result))
-    )
+    return ResponseUtil.success(model_content=OnlinePageResponseModel(rows=online_query_result, total=online_total))
 
 
 @online_controller.delete(
@@ -20,6 +20,7 @@ from common.vo import DataResponseModel, DynamicResponseModel, PageResponseModel
 from config.env import UploadConfig
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.do.user_do import SysUser
+from module_admin.entity.vo.common_vo import ExportJobModel
 from module_admin.entity.vo.dept_vo import DeptModel, DeptTreeModel
 from module_admin.entity.vo.user_vo import (
     AddUserModel,
@@ -40,6 +41,8 @@ from module_admin.entity.vo.user_vo import (
     UserRowModel,
 )
 from module_admin.service.dept_service import DeptService
+from module_admin.service.export_job_service import ExportJobService
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from module_admin.service.role_service import RoleService
 from module_admin.service.user_service import UserService
 from utils.common_util import bytes2file_response
@@ -154,6 +157,7 @@ async def edit_system_user(
     edit_user.update_by = current_user.user.user_name
     edit_user.update_time = datetime.now()
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -186,6 +190,7 @@ async def delete_system_user(
                 await UserService.check_user_data_scope_services(query_db, int(user_id), data_scope_sql)
     delete_user = DeleteUserModel(userIds=user_ids, updateBy=current_user.user.user_name, updateTime=datetime.now())
     delete_user_result = await UserService.delete_user_services(query_db, delete_user)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(delete_user_result.message)
 
     return ResponseUtil.success(msg=delete_user_result.message)
@@ -218,6 +223,7 @@ async def reset_system_user_pwd(
         type='pwd',
     )
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -249,6 +255,7 @@ async def change_system_user_status(
         type='status',
     )
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -334,6 +341,7 @@ async def change_system_user_profile_avatar(
             type='avatar',
         )
         edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+        await PrincipalCacheService.invalidate_principal_services(request)
         logger.info(edit_user_result.message)
 
         return ResponseUtil.success(model_content=AvatarModel(imgUrl=edit_user.avatar), msg=edit_user_result.message)
@@ -364,6 +372,7 @@ async def change_system_user_profile_info(
         role=current_user.user.role,
     )
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -391,6 +400,7 @@ async def reset_system_user_password(
         updateTime=datetime.now(),
     )
     reset_user_result = await UserService.reset_user_services(query_db, reset_user)
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(reset_user_result.message)
 
     return ResponseUtil.success(msg=reset_user_result.message)
@@ -416,6 +426,8 @@ async def batch_import_system_user(
     batch_import_result = await UserService.batch_import_user_services(
         request, query_db, file, update_support, current_user, user_data_scope_sql, dept_data_scope_sql
     )
+    if update_support:
+        await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(batch_import_result.message)
 
     return ResponseUtil.success(msg=batch_import_result.message)
@@ -477,6 +489,34 @@ async def export_system_user_list(
     return ResponseUtil.streaming(data=bytes2file_response(user_export_result))
 
 
+@user_controller.post(
+    '/exportAsync',
+    summary='异步导出用户列表接口',
+    description='用于创建导出当前符合查询条件的用户列表数据的后台任务，返回任务ID供轮询进度',
+    response_model=DataResponseModel[ExportJobModel],
+    dependencies=[UserInterfaceAuthDependency('system:user:export')],
+)
+@Log(title='用户管理', business_type=BusinessType.EXPORT)
+async def export_system_user_list_async(
+    request: Request,
+    user_page_query: Annotated[UserPageQueryModel, Form()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    data_scope_sql: Annotated[ColumnElement, DataScopeDependency(SysUser)],
+) -> Response:
+    export_job = await ExportJobService.submit_list_export_services(
+        request,
+        'user',
+        lambda query_db: UserService.get_user_list_services(
+            query_db, user_page_query, data_scope_sql, is_page=False
+        ),
+        UserService.export_user_list_services,
+        current_user.user.user_id,
+    )
+    logger.info('导出任务已创建')
+
+    return ResponseUtil.success(data=export_job)
+
+
 @user_controller.get(
     '/authRole/{user_id}',
     summary='获取用户已分配角色列表接口',
@@ -521,6 +561,7 @@ async def update_system_role_user(
     add_user_role_result = await UserService.add_user_role_services(
         query_db, CrudUserRoleModel(userId=user_id, roleIds=role_ids)
     )
+    await PrincipalCacheService.invalidate_principal_services(request)
     logger.info(add_user_role_result.message)
 
     return ResponseUtil.success(msg=add_user_role_result.message)
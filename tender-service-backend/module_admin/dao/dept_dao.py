@@ -1,11 +1,12 @@
 from collections.abc import Sequence
 from typing import Union
 
-from sqlalchemy import ColumnElement, bindparam, func, select, update
+from sqlalchemy import ColumnElement, bindparam, func, or_, select, union, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.util import immutabledict
 
 from module_admin.entity.do.dept_do import SysDept
+from module_admin.entity.do.role_do import SysRoleDept
 from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.dept_vo import DeptModel
 
@@ -120,6 +121,33 @@ class DeptDao:
 
         return dept_result
 
+    @classmethod
+    async def get_data_scope_dept_ids(
+        cls, db: AsyncSession, custom_role_ids: list[int], dept_id: Union[int, None] = None
+    ) -> list[int]:
+        """
+        查询数据权限范围内的部门id列表
+
+        :param db: orm对象
+        :param custom_role_ids: 自定义数据权限的角色id列表，取角色关联的部门
+        :param dept_id: 部门id，取该部门及其全部子部门
+        :return: 部门id列表
+        """
+        queries = []
+        if custom_role_ids:
+            queries.append(select(SysRoleDept.dept_id).where(SysRoleDept.role_id.in_(custom_role_ids)))
+        if dept_id is not None:
+            queries.append(
+                select(SysDept.dept_id).where(
+                    or_(SysDept.dept_id == dept_id, func.find_in_set(dept_id, SysDept.ancestors))
+                )
+            )
+        if not queries:
+            return []
+        dept_id_result = (await db.execute(union(*queries) if len(queries) > 1 else queries[0])).scalars().all()
+
+        return sorted(set(dept_id_result))
+
     @classmethod
     async def get_dept_list_for_tree(
         cls, db: AsyncSession, dept_info: DeptModel, data_scope_sql: ColumnElement
@@ -8,7 +8,7 @@ from common.vo import PageModel
 from module_admin.entity.do.log_do import SysLogininfor, SysOperLog
 from module_admin.entity.vo.log_vo import LogininforModel, LoginLogPageQueryModel, OperLogModel, OperLogPageQueryModel
 from utils.common_util import SnakeCaseUtil
-from utils.page_util import PageUtil
+from utils.page_util import CursorKey, PageUtil
 from utils.time_format_util import TimeFormatUtil
 
 
@@ -54,12 +54,34 @@ class OperationLogDao:
             .distinct()
             .order_by(order_by_column)
         )
+        if is_page and query_object.cursor is not None:
+            return await PageUtil.paginate_by_cursor(
+                db,
+                query,
+                cls._cursor_keys(query_object),
+                query_object.page_size,
+                query_object.cursor,
+                query_object.with_total,
+            )
         operation_log_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, estimate_total=True
         )
 
         return operation_log_list
 
+    @classmethod
+    def _cursor_keys(cls, query_object: OperLogPageQueryModel) -> list[CursorKey]:
+        """
+        游标分页排序键：排序字段 + 主键（保证排序唯一）
+        """
+        column = None
+        if query_object.order_by_column and query_object.is_asc:
+            column = getattr(SysOperLog, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
+        if column is None:
+            return [(SysOperLog.oper_time, True), (SysOperLog.oper_id, True)]
+        descending = query_object.is_asc == 'descending'
+        return [(column, descending), (SysOperLog.oper_id, descending)]
+
     @classmethod
     async def add_operation_log_dao(cls, db: AsyncSession, operation_log: OperLogModel) -> SysOperLog:
         """
@@ -140,12 +162,34 @@ class LoginLogDao:
             .distinct()
             .order_by(order_by_column)
         )
+        if is_page and query_object.cursor is not None:
+            return await PageUtil.paginate_by_cursor(
+                db,
+                query,
+                cls._cursor_keys(query_object),
+                query_object.page_size,
+                query_object.cursor,
+                query_object.with_total,
+            )
         login_log_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, estimate_total=True
         )
 
         return login_log_list
 
+    @classmethod
+    def _cursor_keys(cls, query_object: LoginLogPageQueryModel) -> list[CursorKey]:
+        """
+        游标分页排序键：排序字段 + 主键（保证排序唯一）
+        """
+        column = None
+        if query_object.order_by_column and query_object.is_asc:
+            column = getattr(SysLogininfor, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
+        if column is None:
+            return [(SysLogininfor.login_time, True), (SysLogininfor.info_id, True)]
+        descending = query_object.is_asc == 'descending'
+        return [(column, descending), (SysLogininfor.info_id, descending)]
+
     @classmethod
     async def add_login_log_dao(cls, db: AsyncSession, login_log: LogininforModel) -> SysLogininfor:
         """
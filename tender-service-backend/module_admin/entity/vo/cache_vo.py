@@ -27,3 +27,6 @@ class CacheInfoModel(BaseModel):
     cache_name: Optional[str] = Field(default=None, description='缓存名称')
     cache_value: Optional[Any] = Field(default=None, description='缓存内容')
     remark: Optional[str] = Field(default=None, description='备注')
+    key_count: Optional[int] = Field(default=None, description='键数量')
+    memory_usage: Optional[int] = Field(default=None, description='内存占用（字节）')
+    is_estimated: Optional[bool] = Field(default=None, description='键数量与内存占用是否为抽样估算值')
@@ -15,3 +15,21 @@ class UploadResponseModel(BaseModel):
     new_file_name: Optional[str] = Field(default=None, description='新文件名称')
     original_filename: Optional[str] = Field(default=None, description='原文件名称')
     url: Optional[str] = Field(default=None, description='新文件url')
+
+
+class ExportJobModel(BaseModel):
+    """
+    导出任务模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    job_id: str = Field(description='导出任务ID')
+    export_name: str = Field(description='导出内容名称')
+    status: str = Field(description='任务状态（pending等待中 running执行中 success成功 failed失败）')
+    progress: int = Field(default=0, description='进度百分比')
+    processed_rows: int = Field(default=0, description='已处理记录数')
+    file_name: Optional[str] = Field(default=None, description='导出文件名称，通过通用下载接口下载')
+    message: Optional[str] = Field(default=None, description='失败原因')
+    create_time: Optional[str] = Field(default=None, description='创建时间')
+    expire_time: Optional[str] = Field(default=None, description='导出文件过期时间')
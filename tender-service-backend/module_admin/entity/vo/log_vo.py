@@ -75,6 +75,8 @@ class OperLogPageQueryModel(OperLogQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    cursor: Optional[str] = Field(default=None, description='游标分页的游标，传入时启用游标分页（空字符串表示第一页）')
+    with_total: bool = Field(default=False, description='游标分页时是否统计总记录数')
 
 
 class DeleteOperLogModel(BaseModel):
@@ -107,6 +109,8 @@ class LoginLogPageQueryModel(LoginLogQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    cursor: Optional[str] = Field(default=None, description='游标分页的游标，传入时启用游标分页（空字符串表示第一页）')
+    with_total: bool = Field(default=False, description='游标分页时是否统计总记录数')
 
 
 class DeleteLoginLogModel(BaseModel):
@@ -54,6 +54,19 @@ class SysFiles(BaseModel):
     usage: Optional[str] = Field(default=None, description='资源的使用率')
 
 
+class DbPoolInfo(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    pool_size: Optional[int] = Field(default=None, description='连接池大小')
+    max_overflow: Optional[int] = Field(default=None, description='允许溢出的最大连接数')
+    checked_out: Optional[int] = Field(default=None, description='当前占用连接数')
+    checked_in: Optional[int] = Field(default=None, description='当前空闲连接数')
+    overflow: Optional[int] = Field(default=None, description='当前溢出连接数')
+    peak_checked_out: Optional[int] = Field(default=None, description='峰值占用连接数')
+    total_checkouts: Optional[int] = Field(default=None, description='累计借出次数')
+    usage: Optional[float] = Field(default=None, description='连接池占用率')
+
+
 class ServerMonitorModel(BaseModel):
     """
     服务监控对应pydantic模型
@@ -66,3 +79,4 @@ class ServerMonitorModel(BaseModel):
     mem: Optional[MemoryInfo] = Field(description='內存相关信息')
     sys: Optional[SysInfo] = Field(description='服务器相关信息')
     sys_files: Optional[list[SysFiles]] = Field(description='磁盘相关信息')
+    db_pool: Optional[DbPoolInfo] = Field(default=None, description='数据库连接池相关信息')
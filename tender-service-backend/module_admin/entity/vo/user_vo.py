@@ -2,7 +2,7 @@ import re
 from datetime import datetime
 from typing import Literal, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from pydantic.alias_generators import to_camel
 from pydantic_validation_decorator import Network, NotBlank, Size, Xss
 
@@ -10,6 +10,7 @@ from exceptions.exception import ModelValidatorException
 from module_admin.entity.vo.dept_vo import DeptModel
 from module_admin.entity.vo.post_vo import PostModel
 from module_admin.entity.vo.role_vo import RoleModel
+from utils.permission_util import PermissionSet
 
 
 class TokenData(BaseModel):
@@ -137,6 +138,37 @@ class CurrentUserModel(BaseModel):
     is_default_modify_pwd: bool = Field(default=False, description='是否初始密码修改提醒')
     is_password_expired: bool = Field(default=False, description='密码是否过期提醒')
 
+    _permission_set: Optional[PermissionSet] = PrivateAttr(default=None)
+    _role_keys: Optional[frozenset[str]] = PrivateAttr(default=None)
+    _data_scope: Optional[dict] = PrivateAttr(default=None)
+
+    @property
+    def permission_set(self) -> PermissionSet:
+        """
+        权限标识集合，用于接口权限校验
+        """
+        if self._permission_set is None:
+            self._permission_set = PermissionSet(self.permissions)
+        return self._permission_set
+
+    @property
+    def role_keys(self) -> frozenset[str]:
+        """
+        角色标识集合，用于接口权限校验
+        """
+        if self._role_keys is None:
+            self._role_keys = frozenset(role.role_key for role in self.user.role if role) if self.user else frozenset()
+        return self._role_keys
+
+    @property
+    def data_scope(self) -> dict:
+        """
+        数据权限范围，由用户权限信息缓存提供
+        """
+        if self._data_scope is None:
+            raise ValueError('当前用户未加载数据权限范围')
+        return self._data_scope
+
 
 class UserDetailModel(BaseModel):
     """
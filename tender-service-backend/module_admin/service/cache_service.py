@@ -1,14 +1,17 @@
+import json
+
 from fastapi import Request
 
 from common.enums import RedisInitKeyConfig
 from common.vo import CrudResponseModel
 from config.get_redis import RedisUtil
 from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel
+from utils.redis_util import RedisNearCacheUtil, RedisScanUtil
 
 
 class CacheService:
     """
-    缓存监控模块服务层
+    缓存监控模块服务层：键的读取与清除均使用SCAN分批完成，键数量与内存占用为抽样估算值
     """
 
     @classmethod
@@ -30,18 +33,25 @@ class CacheService:
         return result
 
     @classmethod
-    async def get_cache_monitor_cache_name_services(cls) -> list[CacheInfoModel]:
+    async def get_cache_monitor_cache_name_services(cls, request: Request) -> list[CacheInfoModel]:
         """
         获取缓存名称列表信息service
 
+        :param request: Request对象
         :return: 缓存名称列表信息
         """
+        prefix_stats = await RedisScanUtil.sample_prefix_stats(
+            request.app.state.redis, [key_config.key for key_config in RedisInitKeyConfig]
+        )
         name_list = [
             CacheInfoModel(
                 cacheKey='',
                 cacheName=key_config.key,
                 cacheValue='',
                 remark=key_config.remark,
+                keyCount=prefix_stats[key_config.key]['key_count'],
+                memoryUsage=prefix_stats[key_config.key]['memory_usage'],
+                isEstimated=prefix_stats[key_config.key]['is_estimated'],
             )
             for key_config in RedisInitKeyConfig
         ]
@@ -49,18 +59,24 @@ class CacheService:
         return name_list
 
     @classmethod
-    async def get_cache_monitor_cache_key_services(cls, request: Request, cache_name: str) -> list[str]:
+    async def get_cache_monitor_cache_key_services(
+        cls, request: Request, cache_name: str, cursor: int = 0, limit: int = RedisScanUtil.SCAN_COUNT
+    ) -> tuple[int, list[str]]:
         """
         获取缓存键名列表信息service
 
         :param request: Request对象
         :param cache_name: 缓存名称
-        :return: 缓存键名列表信息
+        :param cursor: 起始游标，首次读取为0
+        :param limit: 本页期望读取的键数量
+        :return: (下一页游标, 缓存键名列表信息)，游标为0表示已读取全部键名
         """
-        cache_keys: list[str] = await request.app.state.redis.keys(f'{cache_name}*')
-        cache_key_list = [key.split(':', 1)[1] for key in cache_keys if key.startswith(f'{cache_name}:')]
+        next_cursor, cache_keys = await RedisScanUtil.scan_page(
+            request.app.state.redis, f'{RedisScanUtil.escape_pattern(cache_name)}:*', cursor, limit
+        )
+        cache_key_list = [key.split(':', 1)[1] for key in dict.fromkeys(cache_keys)]
 
-        return cache_key_list
+        return next_cursor, cache_key_list
 
     @classmethod
     async def get_cache_monitor_cache_value_services(
@@ -74,7 +90,16 @@ class CacheService:
         :param cache_key: 缓存键名
         :return: 缓存内容信息
         """
-        cache_value = await request.app.state.redis.get(f'{cache_name}:{cache_key}')
+        redis_key = f'{cache_name}:{cache_key}'
+        redis_type = await request.app.state.redis.type(redis_key)
+        if redis_type == 'hash':
+            cache_value = json.dumps(await request.app.state.redis.hgetall(redis_key), ensure_ascii=False)
+        elif redis_type == 'zset':
+            cache_value = json.dumps(
+                dict(await request.app.state.redis.zrange(redis_key, 0, -1, withscores=True)), ensure_ascii=False
+            )
+        else:
+            cache_value = await request.app.state.redis.get(redis_key)
 
         return CacheInfoModel(cacheKey=cache_key, cacheName=cache_name, cacheValue=cache_value, remark='')
 
@@ -87,9 +112,8 @@ class CacheService:
         :param cache_name: 缓存名称
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys(f'{cache_name}*')
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        await RedisScanUtil.delete_by_pattern(request.app.state.redis, f'{RedisScanUtil.escape_pattern(cache_name)}:*')
+        await RedisNearCacheUtil.invalidate(request.app.state.redis, [f'{cache_name}:*'])
 
         return CrudResponseModel(is_success=True, message=f'{cache_name}对应键值清除成功')
 
@@ -102,9 +126,8 @@ class CacheService:
         :param cache_key: 缓存键名
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys(f'*{cache_key}')
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        await RedisScanUtil.delete_by_pattern(request.app.state.redis, f'*{RedisScanUtil.escape_pattern(cache_key)}')
+        await RedisNearCacheUtil.invalidate(request.app.state.redis, ['*'])
 
         return CrudResponseModel(is_success=True, message=f'{cache_key}清除成功')
 
@@ -116,9 +139,9 @@ class CacheService:
         :param request: Request对象
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys()
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        # 异步清空当前数据库，由Redis后台线程释放内存
+        await request.app.state.redis.flushdb(asynchronous=True)
+        await RedisNearCacheUtil.invalidate(request.app.state.redis, ['*'])
 
         await RedisUtil.init_sys_dict(request.app.state.redis)
         await RedisUtil.init_sys_config(request.app.state.redis)
@@ -12,6 +12,7 @@ from module_admin.dao.config_dao import ConfigDao
 from module_admin.entity.vo.config_vo import ConfigModel, ConfigPageQueryModel, DeleteConfigModel
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
+from utils.redis_util import RedisNearCacheUtil, RedisScanUtil
 
 
 class ConfigService:
@@ -44,17 +45,24 @@ class ConfigService:
         :param redis: redis对象
         :return:
         """
-        # 获取以sys_config:开头的键列表
-        keys = await redis.keys(f'{RedisInitKeyConfig.SYS_CONFIG.key}:*')
-        # 删除匹配的键
-        if keys:
-            await redis.delete(*keys)
         config_all = await ConfigDao.get_config_list(query_db, ConfigPageQueryModel(), is_page=False)
-        for config_obj in config_all:
-            await redis.set(
-                f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_obj.get("configKey")}',
-                config_obj.get('configValue'),
-            )
+        cache_mapping = {
+            f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_obj.get("configKey")}': config_obj.get('configValue')
+            for config_obj in config_all
+        }
+        # 使用SCAN获取以sys_config:开头的键列表，在同一事务中删除已失效的键并批量写入，重建期间不会读取到空缓存
+        stale_keys = [
+            key
+            for key in await RedisScanUtil.scan_keys(redis, f'{RedisInitKeyConfig.SYS_CONFIG.key}:*')
+            if key not in cache_mapping
+        ]
+        async with redis.pipeline(transaction=True) as pipe:
+            if stale_keys:
+                pipe.unlink(*stale_keys)
+            if cache_mapping:
+                pipe.mset(cache_mapping)
+            await pipe.execute()
+        await RedisNearCacheUtil.invalidate(redis, [f'{RedisInitKeyConfig.SYS_CONFIG.key}:*'])
 
     @classmethod
     async def query_config_list_from_cache_services(cls, redis: aioredis.Redis, config_key: str) -> Any:
@@ -65,7 +73,7 @@ class ConfigService:
         :param config_key: 参数键名
         :return: 参数键名对应值
         """
-        result = await redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_key}')
+        result = await RedisNearCacheUtil.get(redis, f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_key}')
 
         return result
 
@@ -104,6 +112,9 @@ class ConfigService:
             await request.app.state.redis.set(
                 f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}', page_object.config_value
             )
+            await RedisNearCacheUtil.invalidate(
+                request.app.state.redis, [f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}']
+            )
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
@@ -136,6 +147,13 @@ class ConfigService:
                 await request.app.state.redis.set(
                     f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}', page_object.config_value
                 )
+                await RedisNearCacheUtil.invalidate(
+                    request.app.state.redis,
+                    {
+                        f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_info.config_key}',
+                        f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}',
+                    },
+                )
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -168,6 +186,7 @@ class ConfigService:
                 await query_db.commit()
                 if delete_config_key_list:
                     await request.app.state.redis.delete(*delete_config_key_list)
+                    await RedisNearCacheUtil.invalidate(request.app.state.redis, delete_config_key_list)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
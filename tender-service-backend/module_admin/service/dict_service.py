@@ -22,6 +22,7 @@ from module_admin.entity.vo.dict_vo import (
 )
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
+from utils.redis_util import RedisNearCacheUtil, RedisScanUtil
 
 
 class DictTypeService:
@@ -80,6 +81,9 @@ class DictTypeService:
             await DictTypeDao.add_dict_type_dao(query_db, page_object)
             await query_db.commit()
             await request.app.state.redis.set(f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}', '')
+            await RedisNearCacheUtil.invalidate(
+                request.app.state.redis, [f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}']
+            )
             result = {'is_success': True, 'message': '新增成功'}
         except Exception as e:
             await query_db.rollback()
@@ -124,6 +128,9 @@ class DictTypeService:
                         f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                         json.dumps(dict_data, ensure_ascii=False, default=str),
                     )
+                    await RedisNearCacheUtil.invalidate(
+                        request.app.state.redis, [f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}']
+                    )
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -156,6 +163,7 @@ class DictTypeService:
                 await query_db.commit()
                 if delete_dict_type_list:
                     await request.app.state.redis.delete(*delete_dict_type_list)
+                    await RedisNearCacheUtil.invalidate(request.app.state.redis, delete_dict_type_list)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -265,20 +273,29 @@ class DictDataService:
         :param redis: redis对象
         :return:
         """
-        # 获取以sys_dict:开头的键列表
-        keys = await redis.keys(f'{RedisInitKeyConfig.SYS_DICT.key}:*')
-        # 删除匹配的键
-        if keys:
-            await redis.delete(*keys)
         dict_type_all = await DictTypeDao.get_all_dict_type(query_db)
-        for dict_type_obj in [item for item in dict_type_all if item.status == '0']:
-            dict_type = dict_type_obj.dict_type
-            dict_data_list = await DictDataDao.query_dict_data_list(query_db, dict_type)
-            dict_data = [CamelCaseUtil.transform_result(row) for row in dict_data_list if row]
-            await redis.set(
-                f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}',
-                json.dumps(dict_data, ensure_ascii=False, default=str),
-            )
+        dict_data_map = {item.dict_type: [] for item in dict_type_all if item.status == '0'}
+        # 一次查询全部启用的字典数据后按字典类型分组，已按字典排序排列
+        for row in await DictDataDao.query_dict_data_list(query_db, ''):
+            if row and row.dict_type in dict_data_map:
+                dict_data_map[row.dict_type].append(CamelCaseUtil.transform_result(row))
+        cache_mapping = {
+            f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}': json.dumps(dict_data, ensure_ascii=False, default=str)
+            for dict_type, dict_data in dict_data_map.items()
+        }
+        # 使用SCAN获取以sys_dict:开头的键列表，在同一事务中删除已失效的键并批量写入，重建期间不会读取到空缓存
+        stale_keys = [
+            key
+            for key in await RedisScanUtil.scan_keys(redis, f'{RedisInitKeyConfig.SYS_DICT.key}:*')
+            if key not in cache_mapping
+        ]
+        async with redis.pipeline(transaction=True) as pipe:
+            if stale_keys:
+                pipe.unlink(*stale_keys)
+            if cache_mapping:
+                pipe.mset(cache_mapping)
+            await pipe.execute()
+        await RedisNearCacheUtil.invalidate(redis, [f'{RedisInitKeyConfig.SYS_DICT.key}:*'])
 
     @classmethod
     async def query_dict_data_list_from_cache_services(
@@ -292,7 +309,7 @@ class DictDataService:
         :return: 字典数据列表信息对象
         """
         result = []
-        dict_data_list_result = await redis.get(f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}')
+        dict_data_list_result = await RedisNearCacheUtil.get(redis, f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}')
         if dict_data_list_result:
             result = json.loads(dict_data_list_result)
 
@@ -337,6 +354,9 @@ class DictDataService:
                 f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                 json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
             )
+            await RedisNearCacheUtil.invalidate(
+                request.app.state.redis, [f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}']
+            )
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
@@ -369,6 +389,9 @@ class DictDataService:
                     f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                     json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
                 )
+                await RedisNearCacheUtil.invalidate(
+                    request.app.state.redis, [f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}']
+                )
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -403,6 +426,10 @@ class DictDataService:
                         f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}',
                         json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
                     )
+                await RedisNearCacheUtil.invalidate(
+                    request.app.state.redis,
+                    [f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}' for dict_type in set(delete_dict_type_list)],
+                )
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
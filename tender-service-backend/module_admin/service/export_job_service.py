@@ -0,0 +1,271 @@
+import asyncio
+import contextlib
+import json
+import os
+import time
+import uuid
+from collections.abc import AsyncIterable, Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import aiofiles
+from fastapi import Request
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.enums import RedisInitKeyConfig
+from config.database import AsyncSessionLocal
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.entity.vo.common_vo import ExportJobModel
+from utils.log_util import logger
+
+
+class ExportJobProgress:
+    """
+    导出任务进度上报对象
+    """
+
+    def __init__(self, redis: aioredis.Redis, job: dict) -> None:
+        self._redis = redis
+        self._job = job
+
+    async def update(self, progress: Optional[int] = None, processed_rows: Optional[int] = None) -> None:
+        """
+        更新导出任务进度，进度百分比未变化时不写入Redis
+
+        :param progress: 进度百分比
+        :param processed_rows: 已处理记录数
+        """
+        changed = False
+        if progress is not None and min(progress, 99) > self._job['progress']:
+            self._job['progress'] = min(progress, 99)
+            changed = True
+        if processed_rows is not None:
+            self._job['processed_rows'] = processed_rows
+        if changed:
+            await ExportJobService.save_job(self._redis, self._job)
+
+
+ExportBuilder = Callable[[ExportJobProgress], AsyncIterable[bytes]]
+
+
+class ExportJobService:
+    """
+    异步导出任务服务层：请求仅登记任务并返回任务ID，导出在后台执行并写入下载目录，
+    完成后通过通用下载接口下载，任务信息与导出文件到期后自动清理；任务进度与导出文件仅创建用户可查询和下载
+    """
+
+    # 导出任务信息及导出文件的保留时长（秒）
+    ARTIFACT_TTL = 24 * 60 * 60
+    # 单个进程同时执行的导出任务数
+    MAX_CONCURRENCY = 2
+    # 导出文件名前缀，用于识别并清理过期的导出文件
+    FILE_PREFIX = 'export_'
+    # 任务被取消（如服务关闭）时保存任务状态的最长等待时间（秒）
+    CANCEL_SAVE_TIMEOUT = 2
+
+    _semaphore: asyncio.Semaphore | None = None
+    _tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def _job_key(cls, job_id: str) -> str:
+        return f'{RedisInitKeyConfig.EXPORT_JOB.key}:{job_id}'
+
+    @classmethod
+    def _file_owner_key(cls, file_name: str) -> str:
+        return f'{RedisInitKeyConfig.EXPORT_JOB.key}:file:{file_name}'
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(cls.MAX_CONCURRENCY)
+        return cls._semaphore
+
+    @classmethod
+    async def save_job(cls, redis: aioredis.Redis, job: dict) -> None:
+        """
+        保存导出任务信息
+
+        :param redis: redis对象
+        :param job: 导出任务信息
+        """
+        await redis.set(cls._job_key(job['job_id']), json.dumps(job, ensure_ascii=False), ex=cls.ARTIFACT_TTL)
+
+    @classmethod
+    async def submit_export_job_services(
+        cls,
+        request: Request,
+        export_name: str,
+        builder: ExportBuilder,
+        user_id: int,
+        file_type: str = 'xlsx',
+    ) -> ExportJobModel:
+        """
+        登记导出任务并在后台执行
+
+        :param request: Request对象
+        :param export_name: 导出内容名称
+        :param builder: 产出导出文件二进制数据块的函数
+        :param user_id: 任务创建用户ID，查询进度及下载导出文件时校验
+        :param file_type: 导出文件类型
+        :return: 导出任务信息
+        """
+        redis = getattr(request.app.state, 'redis', None)
+        if redis is None:
+            raise ServiceException(message='缓存服务不可用，暂无法创建导出任务')
+        await asyncio.to_thread(cls.clean_expired_files)
+
+        now = datetime.now()
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'export_name': export_name,
+            'status': 'pending',
+            'progress': 0,
+            'processed_rows': 0,
+            'file_name': f'{cls.FILE_PREFIX}{export_name}_{now.strftime("%Y%m%d%H%M%S")}_{job_id[:8]}.{file_type}',
+            'message': None,
+            'create_time': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'expire_time': (now + timedelta(seconds=cls.ARTIFACT_TTL)).strftime('%Y-%m-%d %H:%M:%S'),
+            'user_id': user_id,
+        }
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(cls._job_key(job_id), json.dumps(job, ensure_ascii=False), ex=cls.ARTIFACT_TTL)
+            pipe.set(cls._file_owner_key(job['file_name']), user_id, ex=cls.ARTIFACT_TTL)
+            await pipe.execute()
+        task = asyncio.create_task(cls._run_job(redis, job, builder))
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+        return cls._to_model(job)
+
+    @classmethod
+    async def submit_list_export_services(
+        cls,
+        request: Request,
+        export_name: str,
+        fetch: Callable[[AsyncSession], Awaitable[list]],
+        export: Callable[[list], Awaitable[bytes]],
+        user_id: int,
+    ) -> ExportJobModel:
+        """
+        登记查询全量列表后生成excel的导出任务
+
+        :param request: Request对象
+        :param export_name: 导出内容名称
+        :param fetch: 查询全量列表数据的函数
+        :param export: 将列表数据转换为excel二进制数据的函数
+        :param user_id: 任务创建用户ID
+        :return: 导出任务信息
+        """
+
+        async def builder(progress: ExportJobProgress) -> AsyncIterable[bytes]:
+            async with AsyncSessionLocal() as query_db:
+                rows = await fetch(query_db)
+            await progress.update(50, len(rows))
+            yield await export(rows)
+
+        return await cls.submit_export_job_services(request, export_name, builder, user_id)
+
+    @classmethod
+    async def _run_job(cls, redis: aioredis.Redis, job: dict, builder: ExportBuilder) -> None:
+        filepath = os.path.join(UploadConfig.DOWNLOAD_PATH, job['file_name'])
+        temp_filepath = f'{filepath}.part'
+        try:
+            async with cls._get_semaphore():
+                job['status'] = 'running'
+                await cls.save_job(redis, job)
+                async with aiofiles.open(temp_filepath, 'wb') as f:
+                    async for chunk in builder(ExportJobProgress(redis, job)):
+                        await f.write(chunk)
+                os.replace(temp_filepath, filepath)
+            job['status'] = 'success'
+            job['progress'] = 100
+            logger.info(f'导出任务{job["job_id"]}（{job["export_name"]}）完成')
+        except asyncio.CancelledError:
+            logger.warning(f'导出任务{job["job_id"]}（{job["export_name"]}）被中断')
+            job['status'] = 'failed'
+            job['message'] = '导出任务被中断'
+            if os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(asyncio.shield(cls.save_job(redis, job)), cls.CANCEL_SAVE_TIMEOUT)
+            raise
+        except Exception as e:
+            logger.exception(f'导出任务{job["job_id"]}（{job["export_name"]}）失败: {e}')
+            job['status'] = 'failed'
+            job['message'] = str(e) or e.__class__.__name__
+            if os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+        await cls.save_job(redis, job)
+
+    @classmethod
+    async def get_export_job_services(cls, request: Request, job_id: str, user_id: int) -> ExportJobModel:
+        """
+        获取导出任务进度service
+
+        :param request: Request对象
+        :param job_id: 导出任务ID
+        :param user_id: 当前用户ID
+        :return: 导出任务信息
+        """
+        redis = getattr(request.app.state, 'redis', None)
+        raw = await redis.get(cls._job_key(job_id)) if redis is not None else None
+        job = json.loads(raw) if raw else None
+        if not job or job.get('user_id') != user_id:
+            raise ServiceException(message='导出任务不存在或已过期')
+
+        return cls._to_model(job)
+
+    @classmethod
+    def is_export_file(cls, file_name: str) -> bool:
+        """
+        判断下载目录中的文件是否为导出任务生成的文件
+
+        :param file_name: 下载的文件名称
+        :return: 是否为导出文件
+        """
+        return os.path.basename(file_name).startswith(cls.FILE_PREFIX)
+
+    @classmethod
+    async def check_export_file_owner_services(cls, request: Request, file_name: str, user_id: int) -> None:
+        """
+        校验导出文件是否由当前用户创建的导出任务生成，否则拒绝下载
+
+        :param request: Request对象
+        :param file_name: 下载的文件名称
+        :param user_id: 当前用户ID
+        :return:
+        """
+        redis = getattr(request.app.state, 'redis', None)
+        owner = await redis.get(cls._file_owner_key(file_name)) if redis is not None else None
+        if owner is None or str(owner) != str(user_id):
+            raise ServiceException(message='文件不存在')
+
+    @classmethod
+    def clean_expired_files(cls) -> int:
+        """
+        删除下载目录中超过保留时长的导出文件
+
+        :return: 删除的文件数
+        """
+        deadline = time.time() - cls.ARTIFACT_TTL
+        removed = 0
+        with os.scandir(UploadConfig.DOWNLOAD_PATH) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.startswith(cls.FILE_PREFIX) and entry.stat().st_mtime < deadline:
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+        return removed
+
+    @staticmethod
+    def _to_model(job: dict[str, Any]) -> ExportJobModel:
+        fields = {key: value for key, value in job.items() if key != 'user_id'}
+        # 导出完成前不暴露文件名，避免下载到未写完的文件
+        if job['status'] != 'success':
+            fields['file_name'] = None
+        return ExportJobModel(**fields)
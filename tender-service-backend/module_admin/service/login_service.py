@@ -1,4 +1,5 @@
 import random
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
@@ -7,13 +8,17 @@ import jwt
 from fastapi import Depends, Form, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
+from redis import asyncio as aioredis
+from redis.commands.core import AsyncScript
 from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.aspect.data_scope import GetDataScope
 from common.constant import CommonConstant, MenuConstant
 from common.context import RequestContext
 from common.enums import RedisInitKeyConfig
 from common.vo import CrudResponseModel
+from config.cache_backend import MemoryCacheBackend
 from config.env import AppConfig, JwtConfig
 from config.get_db import get_db
 from exceptions.exception import AuthException, LoginException, ServiceException
@@ -24,14 +29,46 @@ from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.login_vo import MenuTreeModel, MetaModel, RouterModel, SmsCode, UserLogin, UserRegister
 from module_admin.entity.vo.user_vo import AddUserModel, CurrentUserModel, ResetUserModel, TokenData, UserInfoModel
+from module_admin.service.online_service import OnlineService
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from module_admin.service.user_service import UserService
 from utils.common_util import CamelCaseUtil
 from utils.log_util import logger
 from utils.message_util import message_service
 from utils.pwd_util import PwdUtil
+from utils.redis_util import RedisBatchUtil, RedisNearCacheUtil
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='login')
 
+# KEYS[1]: 令牌键 KEYS[2]: 在线会话过期时间有序集合
+# ARGV[1]: 请求携带的令牌 ARGV[2]: 续期阈值（秒） ARGV[3]: 令牌过期时间（秒）
+# ARGV[4]: 续期后的会话过期时间戳 ARGV[5]: 会话编号
+TOKEN_REFRESH_SCRIPT = """
+local token = redis.call('GET', KEYS[1])
+if token and token == ARGV[1] and redis.call('TTL', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    redis.call('ZADD', KEYS[2], 'XX', ARGV[4], ARGV[5])
+end
+return token
+"""
+
+
+@MemoryCacheBackend.script_handler(TOKEN_REFRESH_SCRIPT)
+async def refresh_token_in_memory(backend: MemoryCacheBackend, keys: list, args: list) -> Optional[str]:
+    """
+    令牌校验及续期脚本在内存缓存后端中的等价实现
+
+    :param backend: 内存缓存后端
+    :param keys: 脚本KEYS参数
+    :param args: 脚本ARGV参数
+    :return: 令牌
+    """
+    token = await backend.get(keys[0])
+    if token and token == args[0] and await backend.ttl(keys[0]) < int(args[1]):
+        await backend.expire(keys[0], int(args[2]))
+        await backend.zadd(keys[1], {args[4]: int(args[3])}, xx=True)
+    return token
+
 
 class CustomOAuth2PasswordRequestForm(OAuth2PasswordRequestForm):
     """
@@ -68,6 +105,8 @@ class LoginService:
     登录模块服务层
     """
 
+    _token_refresh_script: Optional[AsyncScript] = None
+
     @classmethod
     async def authenticate_user(
         cls, request: Request, query_db: AsyncSession, login_user: UserLogin
@@ -81,8 +120,8 @@ class LoginService:
         :return: 校验结果
         """
         await cls.__check_login_ip(request)
-        account_lock = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}'
+        account_lock = await RedisBatchUtil.get(
+            request, f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}'
         )
         if login_user.user_name == account_lock:
             logger.warning('账号已锁定，请稍后再试')
@@ -106,8 +145,8 @@ class LoginService:
             logger.warning('用户不存在')
             raise LoginException(data='', message='用户不存在')
         if not PwdUtil.verify_password(login_user.password, user[0].password):
-            cache_password_error_count = await request.app.state.redis.get(
-                f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
+            cache_password_error_count = await RedisBatchUtil.get(
+                request, f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
             )
             password_error_counted = 0
             if cache_password_error_count:
@@ -145,7 +184,7 @@ class LoginService:
         :param request: Request对象
         :return: 校验结果
         """
-        black_ip_value = await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.login.blackIPList')
+        black_ip_value = await RedisBatchUtil.get(request, f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.login.blackIPList')
         black_ip_list = black_ip_value.split(',') if black_ip_value else []
         if request.headers.get('X-Forwarded-For') in black_ip_list:
             logger.warning('当前IP禁止登录')
@@ -161,7 +200,7 @@ class LoginService:
         :param login_user: 登录用户对象
         :return: 校验结果
         """
-        captcha_value = await request.app.state.redis.get(f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{login_user.uuid}')
+        captcha_value = await RedisBatchUtil.get(request, f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{login_user.uuid}')
         if not captcha_value:
             logger.warning('验证码已失效')
             raise LoginException(data='', message='验证码已失效')
@@ -217,64 +256,123 @@ class LoginService:
         except InvalidTokenError as e:
             logger.warning('用户token已失效，请重新登录')
             raise AuthException(data='', message='用户token已失效，请重新登录') from e
-        query_user = await UserDao.get_user_by_id(query_db, user_id=token_data.user_id)
-        if query_user.get('user_basic_info') is None:
-            logger.warning('用户token不合法')
-            raise AuthException(data='', message='用户token不合法')
+        # 同一请求内认证依赖与当前用户依赖共用一次解析结果
+        request_user = getattr(request.state, 'current_user', None)
+        if request_user is not None and getattr(request.state, 'current_user_token', None) == token:
+            RequestContext.set_current_user(request_user)
+            return request_user
         if AppConfig.app_same_time_login:
-            redis_token = await request.app.state.redis.get(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}')
+            token_id = session_id
         else:
             # 此方法可实现同一账号同一时间只能登录一次
-            redis_token = await request.app.state.redis.get(
-                f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get("user_basic_info").user_id}'
+            token_id = str(token_data.user_id)
+        token_key = f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}'
+        config_keys = [
+            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.initPasswordModify',
+            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.passwordValidateDays',
+        ]
+        # 密码策略配置优先读取进程内缓存，令牌校验及续期、未命中的配置与用户权限信息在一次管道往返中完成
+        near_cache_generation = RedisNearCacheUtil.generation()
+        config_values = RedisNearCacheUtil.peek_many(config_keys)
+        async with request.app.state.redis.pipeline(transaction=False) as pipe:
+            await cls.__get_token_refresh_script(request.app.state.redis)(
+                keys=[token_key, OnlineService.session_expire_key()],
+                args=[
+                    token,
+                    JwtConfig.jwt_redis_refresh_threshold_minutes * 60,
+                    JwtConfig.jwt_redis_expire_minutes * 60,
+                    int(time.time()) + JwtConfig.jwt_redis_expire_minutes * 60,
+                    token_id,
+                ],
+                client=pipe,
             )
-        if token == redis_token:
-            if AppConfig.app_same_time_login:
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
-            else:
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get("user_basic_info").user_id}',
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
+            if config_values is None:
+                pipe.mget(config_keys)
+            PrincipalCacheService.queue_lookup(pipe, token_data.user_id)
+            results = await pipe.execute()
+        redis_token = results.pop(0)
+        if config_values is None:
+            config_values = results.pop(0)
+            RedisNearCacheUtil.store(near_cache_generation, config_keys, config_values)
+        RedisBatchUtil.remember(request, config_keys, config_values)
+        version, principal = PrincipalCacheService.resolve_lookup(token_data.user_id, results)
+        if token != redis_token:
+            logger.warning('用户token已失效，请重新登录')
+            raise AuthException(data='', message='用户token已失效，请重新登录')
+        # 缺少数据权限范围的缓存为旧格式，同样重新生成
+        if principal is None or 'data_scope' not in principal:
+            query_user = await UserDao.get_user_by_id(query_db, user_id=token_data.user_id)
+            if query_user.get('user_basic_info') is None:
+                logger.warning('用户token不合法')
+                raise AuthException(data='', message='用户token不合法')
+            principal = await cls.__build_principal(query_db, query_user)
+            await PrincipalCacheService.save_principal(request.app.state.redis, token_data.user_id, version, principal)
+
+        user = UserInfoModel(**principal['user'])
+        is_default_modify_pwd = await cls.__init_password_is_modify(request, user.pwd_update_date)
+        is_password_expired = await cls.__password_is_expired(request, user.pwd_update_date)
+        current_user = CurrentUserModel(
+            permissions=principal['permissions'],
+            roles=principal['roles'],
+            user=user,
+            isDefaultModifyPwd=is_default_modify_pwd,
+            isPasswordExpired=is_password_expired,
+        )
+        current_user._data_scope = principal['data_scope']
+        if 'permission_set' in principal:
+            current_user._permission_set = principal['permission_set']
+            current_user._role_keys = principal['role_keys']
+        request.state.current_user = current_user
+        request.state.current_user_token = token
+        # 设置当前用户信息到上下文
+        RequestContext.set_current_user(current_user)
+        return current_user
 
-            role_id_list = [item.role_id for item in query_user.get('user_role_info')]
-            if 1 in role_id_list:  # noqa: SIM108
-                permissions = ['*:*:*']
-            else:
-                permissions = [row.perms for row in query_user.get('user_menu_info')]
-            post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
-            role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
-            roles = [row.role_key for row in query_user.get('user_role_info')]
-            is_default_modify_pwd = await cls.__init_password_is_modify(
-                request, query_user.get('user_basic_info').pwd_update_date
-            )
-            is_password_expired = await cls.__password_is_expired(
-                request, query_user.get('user_basic_info').pwd_update_date
-            )
+    @classmethod
+    def __get_token_refresh_script(cls, redis: aioredis.Redis) -> AsyncScript:
+        """
+        获取令牌校验及续期脚本：令牌与当前令牌一致且剩余有效时间低于续期阈值时才重置过期时间，
+        并同步延长在线会话的过期时间，读取与续期原子完成
 
-            current_user = CurrentUserModel(
-                permissions=permissions,
-                roles=roles,
-                user=UserInfoModel(
-                    **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
-                    postIds=post_ids,
-                    roleIds=role_ids,
-                    dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
-                    role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
-                ),
-                isDefaultModifyPwd=is_default_modify_pwd,
-                isPasswordExpired=is_password_expired,
-            )
-            # 设置当前用户信息到上下文
-            RequestContext.set_current_user(current_user)
-            return current_user
-        logger.warning('用户token已失效，请重新登录')
-        raise AuthException(data='', message='用户token已失效，请重新登录')
+        :param redis: redis对象
+        :return: 令牌校验及续期脚本
+        """
+        if cls._token_refresh_script is None:
+            cls._token_refresh_script = redis.register_script(TOKEN_REFRESH_SCRIPT)
+        return cls._token_refresh_script
+
+    @classmethod
+    async def __build_principal(cls, query_db: AsyncSession, query_user: dict[str, Any]) -> dict[str, Any]:
+        """
+        根据数据库查询结果生成可缓存的用户权限信息
+
+        :param query_db: orm对象
+        :param query_user: 用户信息查询结果
+        :return: 用户权限信息
+        """
+        role_id_list = [item.role_id for item in query_user.get('user_role_info')]
+        if 1 in role_id_list:  # noqa: SIM108
+            permissions = ['*:*:*']
+        else:
+            permissions = [row.perms for row in query_user.get('user_menu_info')]
+        post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
+        role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
+        roles = [row.role_key for row in query_user.get('user_role_info')]
+        user = UserInfoModel(
+            **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
+            postIds=post_ids,
+            roleIds=role_ids,
+            dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
+            role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
+        )
+
+        # 缓存中不保存密码
+        return {
+            'permissions': permissions,
+            'roles': roles,
+            'user': user.model_dump(mode='json', by_alias=True, exclude={'password'}),
+            'data_scope': await GetDataScope.build_data_scope(query_db, user),
+        }
 
     @classmethod
     async def __init_password_is_modify(cls, request: Request, pwd_update_date: datetime) -> bool:
@@ -285,8 +383,8 @@ class LoginService:
         :param pwd_update_date: 密码最后更新时间
         :return: 是否初始密码登录
         """
-        init_password_is_modify = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.initPasswordModify'
+        init_password_is_modify = await RedisBatchUtil.get(
+            request, f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.initPasswordModify'
         )
         return init_password_is_modify == '1' and pwd_update_date is None
 
@@ -299,8 +397,8 @@ class LoginService:
         :param pwd_update_date: 密码最后更新时间
         :return: 密码是否过期
         """
-        password_validate_days = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.passwordValidateDays'
+        password_validate_days = await RedisBatchUtil.get(
+            request, f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.passwordValidateDays'
         )
         if password_validate_days and int(password_validate_days) > 0:
             if pwd_update_date is None:
@@ -431,19 +529,16 @@ class LoginService:
         :param user_register: 注册用户对象
         :return: 注册结果
         """
-        register_enabled = (
-            await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.registerUser') == 'true'
-        )
-        captcha_enabled = (
-            await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled')
-            == 'true'
-        )
+        register_enabled_key = f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.registerUser'
+        captcha_enabled_key = f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled'
+        captcha_key = f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{user_register.uuid}'
+        await RedisBatchUtil.prefetch(request, [register_enabled_key, captcha_enabled_key, captcha_key])
+        register_enabled = await RedisBatchUtil.get(request, register_enabled_key) == 'true'
+        captcha_enabled = await RedisBatchUtil.get(request, captcha_enabled_key) == 'true'
         if user_register.password == user_register.confirm_password:
             if register_enabled:
                 if captcha_enabled:
-                    captcha_value = await request.app.state.redis.get(
-                        f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{user_register.uuid}'
-                    )
+                    captcha_value = await RedisBatchUtil.get(request, captcha_key)
                     if not captcha_value:
                         raise ServiceException(message='验证码已失效')
                     if user_register.code != str(captcha_value):
@@ -523,7 +618,7 @@ class LoginService:
         :param token_id: 令牌编号
         :return: 退出登录结果
         """
-        await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}')
+        await OnlineService.remove_session_services(request, [token_id])
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_access_token')
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_session_id')
 
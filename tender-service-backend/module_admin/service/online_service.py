@@ -1,65 +1,231 @@
-from typing import Any
+import json
+import time
+from typing import Any, Optional
 
 import jwt
 from fastapi import Request
+from redis import asyncio as aioredis
+from redis.commands.core import AsyncScript
 
 from common.enums import RedisInitKeyConfig
 from common.vo import CrudResponseModel
-from config.env import AppConfig, JwtConfig
+from config.cache_backend import MemoryCacheBackend
+from config.env import JwtConfig
 from exceptions.exception import ServiceException
 from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlineQueryModel
 from utils.common_util import CamelCaseUtil
 
+# KEYS[1]: 会话过期时间有序集合 KEYS[2]: 会话信息哈希 ARGV[1]: 当前时间戳 ARGV[2]: 单次清理数量
+PURGE_EXPIRED_SESSION_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #expired > 0 then
+    redis.call('ZREM', KEYS[1], unpack(expired))
+    redis.call('HDEL', KEYS[2], unpack(expired))
+end
+return #expired
+"""
+
+
+@MemoryCacheBackend.script_handler(PURGE_EXPIRED_SESSION_SCRIPT)
+async def purge_expired_session_in_memory(backend: MemoryCacheBackend, keys: list, args: list) -> int:
+    """
+    过期会话清理脚本在内存缓存后端中的等价实现
+
+    :param backend: 内存缓存后端
+    :param keys: 脚本KEYS参数
+    :param args: 脚本ARGV参数
+    :return: 清理的会话数量
+    """
+    expired = await backend.zrangebyscore(keys[0], '-inf', args[0], start=0, num=int(args[1]))
+    if expired:
+        await backend.zrem(keys[0], *expired)
+        await backend.hdel(keys[1], *expired)
+    return len(expired)
+
 
 class OnlineService:
     """
-    在线用户管理模块服务层
+    在线用户管理模块服务层：在线会话登记在会话注册表中，以有序集合记录各会话的过期时间，以哈希记录会话的登录信息，
+    登录时登记、令牌续期时同步延长、退出或强退时移除，过期会话在登记与查询时清理
     """
 
+    # 单次清理的过期会话数量
+    PURGE_BATCH_SIZE = 1000
+    # 回填会话注册表时单次读取的令牌数量
+    BACKFILL_BATCH_SIZE = 500
+
+    _purge_script: Optional[AsyncScript] = None
+
     @classmethod
-    async def get_online_list_services(cls, request: Request, query_object: OnlineQueryModel) -> list[dict[str, Any]]:
+    def session_expire_key(cls) -> str:
         """
-        获取在线用户表信息service
+        获取在线会话过期时间有序集合的键，成员为会话编号，分值为会话过期时间戳
 
-        :param request: Request对象
-        :param query_object: 查询参数对象
-        :return: 在线用户列表信息
+        :return: 有序集合的键
         """
-        access_token_keys = await request.app.state.redis.keys(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}*')
-        if not access_token_keys:
-            access_token_keys = []
-        access_token_values_list = [await request.app.state.redis.get(key) for key in access_token_keys]
-        online_info_list = []
-        for item in access_token_values_list:
-            payload = jwt.decode(item, JwtConfig.jwt_secret_key, algorithms=[JwtConfig.jwt_algorithm])
-            online_dict = {
-                'token_id': payload.get('session_id') if AppConfig.app_same_time_login else payload.get('user_id'),
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}:expire'
+
+    @classmethod
+    def session_info_key(cls) -> str:
+        """
+        获取在线会话信息哈希的键，字段为会话编号，值为会话登录信息
+
+        :return: 哈希的键
+        """
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}:info'
+
+    @classmethod
+    async def _purge_expired_sessions(cls, redis: aioredis.Redis) -> None:
+        if cls._purge_script is None:
+            cls._purge_script = redis.register_script(PURGE_EXPIRED_SESSION_SCRIPT)
+        purged = cls.PURGE_BATCH_SIZE
+        while purged >= cls.PURGE_BATCH_SIZE:
+            purged = await cls._purge_script(
+                keys=[cls.session_expire_key(), cls.session_info_key()],
+                args=[int(time.time()), cls.PURGE_BATCH_SIZE],
+                client=redis,
+            )
+
+    @classmethod
+    async def _backfill_session_batch(cls, redis: aioredis.Redis, token_keys: list[str]) -> int:
+        async with redis.pipeline(transaction=False) as pipe:
+            for token_key in token_keys:
+                pipe.get(token_key)
+                pipe.ttl(token_key)
+            results = await pipe.execute()
+        now = int(time.time())
+        infos: dict[str, str] = {}
+        expires: dict[str, int] = {}
+        for index, token_key in enumerate(token_keys):
+            access_token, ttl = results[index * 2], results[index * 2 + 1]
+            if not access_token or ttl is None or ttl <= 0:
+                continue
+            try:
+                payload = jwt.decode(
+                    access_token,
+                    JwtConfig.jwt_secret_key,
+                    algorithms=[JwtConfig.jwt_algorithm],
+                    options={'verify_exp': False},
+                )
+            except jwt.PyJWTError:
+                continue
+            token_id = token_key.split(':', 1)[-1]
+            login_info = payload.get('login_info') or {}
+            online_info = {
+                'token_id': token_id,
                 'user_name': payload.get('user_name'),
                 'dept_name': payload.get('dept_name'),
-                'ipaddr': payload.get('login_info').get('ipaddr'),
-                'login_location': payload.get('login_info').get('loginLocation'),
-                'browser': payload.get('login_info').get('browser'),
-                'os': payload.get('login_info').get('os'),
-                'login_time': payload.get('login_info').get('loginTime'),
+                'ipaddr': login_info.get('ipaddr'),
+                'login_location': login_info.get('loginLocation'),
+                'browser': login_info.get('browser'),
+                'os': login_info.get('os'),
+                'login_time': login_info.get('loginTime'),
             }
-            if query_object.user_name and not query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name'):
-                    online_info_list = [online_dict]
-                    break
-            elif not query_object.user_name and query_object.ipaddr:
-                if query_object.ipaddr == payload.get('login_info').get('ipaddr'):
-                    online_info_list = [online_dict]
-                    break
-            elif query_object.user_name and query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name') and query_object.ipaddr == payload.get(
-                    'login_info'
-                ).get('ipaddr'):
+            infos[token_id] = json.dumps(online_info, ensure_ascii=False, default=str)
+            expires[token_id] = now + ttl
+        if not expires:
+            return 0
+        # 仅补充注册表中不存在的会话，不覆盖登录或续期时登记的信息
+        async with redis.pipeline(transaction=False) as pipe:
+            for token_id, info in infos.items():
+                pipe.hsetnx(cls.session_info_key(), token_id, info)
+            pipe.zadd(cls.session_expire_key(), expires, nx=True)
+            results = await pipe.execute()
+        return results[-1]
+
+    @classmethod
+    async def backfill_session_services(cls, redis: aioredis.Redis) -> int:
+        """
+        根据现有令牌回填会话注册表，使注册表启用前已登录的会话可在在线用户列表中查询和强退，应用启动时执行
+
+        :param redis: redis对象
+        :return: 回填的会话数量
+        """
+        backfilled = 0
+        token_keys = []
+        async for token_key in redis.scan_iter(
+            match=f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:*', count=cls.BACKFILL_BATCH_SIZE
+        ):
+            token_keys.append(token_key)
+            if len(token_keys) >= cls.BACKFILL_BATCH_SIZE:
+                backfilled += await cls._backfill_session_batch(redis, token_keys)
+                token_keys = []
+        if token_keys:
+            backfilled += await cls._backfill_session_batch(redis, token_keys)
+        return backfilled
+
+    @classmethod
+    async def register_session_services(cls, request: Request, token_id: str, online_info: dict[str, Any]) -> None:
+        """
+        登记在线会话
+
+        :param request: Request对象
+        :param token_id: 会话编号
+        :param online_info: 会话登录信息
+        :return:
+        """
+        redis = request.app.state.redis
+        await cls._purge_expired_sessions(redis)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(cls.session_info_key(), token_id, json.dumps(online_info, ensure_ascii=False, default=str))
+            pipe.zadd(cls.session_expire_key(), {token_id: int(time.time()) + JwtConfig.jwt_redis_expire_minutes * 60})
+            await pipe.execute()
+
+    @classmethod
+    async def remove_session_services(cls, request: Request, token_ids: list[str]) -> None:
+        """
+        删除在线会话及对应的令牌
+
+        :param request: Request对象
+        :param token_ids: 会话编号列表
+        :return:
+        """
+        if not token_ids:
+            return
+        async with request.app.state.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*[f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}' for token_id in token_ids])
+            pipe.zrem(cls.session_expire_key(), *token_ids)
+            pipe.hdel(cls.session_info_key(), *token_ids)
+            await pipe.execute()
+
+    @classmethod
+    async def get_online_list_services(
+        cls, request: Request, query_object: OnlineQueryModel
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        获取在线用户表信息service
+
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :return: (在线用户列表信息, 总记录数)，传入分页参数时只读取当前页
+        """
+        redis = request.app.state.redis
+        await cls._purge_expired_sessions(redis)
+        if query_object.user_name or query_object.ipaddr:
+            online_info_list = []
+            for item in await redis.hvals(cls.session_info_key()):
+                online_dict = json.loads(item)
+                if (not query_object.user_name or query_object.user_name == online_dict.get('user_name')) and (
+                    not query_object.ipaddr or query_object.ipaddr == online_dict.get('ipaddr')
+                ):
                     online_info_list = [online_dict]
                     break
-            else:
-                online_info_list.append(online_dict)
+            return CamelCaseUtil.transform_result(online_info_list), len(online_info_list)
+
+        # 按会话过期时间倒序，即最近活跃的会话在前
+        if query_object.page_num and query_object.page_size:
+            start = (query_object.page_num - 1) * query_object.page_size
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zrevrange(cls.session_expire_key(), start, start + query_object.page_size - 1)
+                pipe.zcard(cls.session_expire_key())
+                token_ids, total = await pipe.execute()
+        else:
+            token_ids = await redis.zrevrange(cls.session_expire_key(), 0, -1)
+            total = len(token_ids)
+        online_info_values = await redis.hmget(cls.session_info_key(), token_ids) if token_ids else []
+        online_info_list = [json.loads(item) for item in online_info_values if item]
 
-        return CamelCaseUtil.transform_result(online_info_list)
+        return CamelCaseUtil.transform_result(online_info_list), total
 
     @classmethod
     async def delete_online_services(cls, request: Request, page_object: DeleteOnlineModel) -> CrudResponseModel:
@@ -71,8 +237,6 @@ class OnlineService:
         :return: 强退在线用户校验结果
         """
         if page_object.token_ids:
-            token_id_list = page_object.token_ids.split(',')
-            for token_id in token_id_list:
-                await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}')
+            await cls.remove_session_services(request, page_object.token_ids.split(','))
             return CrudResponseModel(is_success=True, message='强退成功')
         raise ServiceException(message='传入session_id为空')
@@ -0,0 +1,130 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Optional
+
+from fastapi import Request
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
+
+from common.enums import RedisInitKeyConfig
+from config.env import JwtConfig
+from utils.permission_util import PermissionSet
+
+
+class PrincipalCacheService:
+    """
+    当前登录用户权限信息缓存服务层：以用户ID为键缓存用户基本信息、部门、角色、岗位与权限标识，
+    Redis中以哈希结构存储并附带权限版本号，进程内再保留一层短时效的LRU缓存；
+    用户、角色、菜单、部门及岗位变更时递增权限版本号，版本号不一致的缓存视为失效
+    """
+
+    # 进程内缓存的有效时长（秒）与最大条目数
+    LOCAL_TTL = 10
+    LOCAL_MAX_SIZE = 1024
+
+    _local: OrderedDict[int, tuple[float, str, dict[str, Any]]] = OrderedDict()
+
+    @classmethod
+    def _principal_key(cls, user_id: int) -> str:
+        return f'{RedisInitKeyConfig.USER_PRINCIPAL.key}:{user_id}'
+
+    @classmethod
+    def version_key(cls) -> str:
+        return f'{RedisInitKeyConfig.USER_PRINCIPAL.key}:version'
+
+    @classmethod
+    def _get_local(cls, user_id: int) -> Optional[tuple[float, str, dict[str, Any]]]:
+        entry = cls._local.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            cls._local.pop(user_id, None)
+            return None
+        cls._local.move_to_end(user_id)
+        return entry
+
+    @classmethod
+    def _set_local(cls, user_id: int, version: str, principal: dict[str, Any]) -> None:
+        # 进程内缓存同时保存预先生成的权限标识集合与角色标识集合，命中时接口权限校验无需重新生成
+        principal = {
+            **principal,
+            'permission_set': PermissionSet(principal['permissions']),
+            'role_keys': frozenset(principal['roles']),
+        }
+        cls._local[user_id] = (time.monotonic() + cls.LOCAL_TTL, version, principal)
+        cls._local.move_to_end(user_id)
+        while len(cls._local) > cls.LOCAL_MAX_SIZE:
+            cls._local.popitem(last=False)
+
+    @classmethod
+    def queue_lookup(cls, pipe: Pipeline, user_id: int) -> int:
+        """
+        将读取权限版本号及用户权限信息的命令加入管道，与同一请求的其他Redis读取合并为一次往返
+
+        :param pipe: redis管道对象
+        :param user_id: 用户ID
+        :return: 加入管道的命令数
+        """
+        pipe.get(cls.version_key())
+        if cls._get_local(user_id) is None:
+            pipe.hgetall(cls._principal_key(user_id))
+            return 2
+        return 1
+
+    @classmethod
+    def resolve_lookup(cls, user_id: int, results: list[Any]) -> tuple[str, Optional[dict[str, Any]]]:
+        """
+        根据管道执行结果获取有效的用户权限信息
+
+        :param user_id: 用户ID
+        :param results: queue_lookup加入的命令对应的执行结果
+        :return: (当前权限版本号, 用户权限信息)，缓存未命中或已失效时用户权限信息为None
+        """
+        version = str(results[0] or 0)
+        local_entry = cls._get_local(user_id)
+        if local_entry is not None and local_entry[1] == version:
+            return version, local_entry[2]
+        cached = results[1] if len(results) > 1 else None
+        if cached and cached.get('version') == version:
+            cls._set_local(user_id, version, json.loads(cached['principal']))
+            return version, cls._local[user_id][2]
+        return version, None
+
+    @classmethod
+    async def save_principal(cls, redis: aioredis.Redis, user_id: int, version: str, principal: dict[str, Any]) -> None:
+        """
+        缓存用户权限信息
+
+        :param redis: redis对象
+        :param user_id: 用户ID
+        :param version: 读取数据库前获取的权限版本号
+        :param principal: 用户权限信息
+        :return:
+        """
+        key = cls._principal_key(user_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={'version': version, 'principal': json.dumps(principal, ensure_ascii=False)})
+            pipe.expire(key, timedelta(minutes=JwtConfig.jwt_redis_expire_minutes))
+            await pipe.execute()
+        cls._set_local(user_id, version, principal)
+
+    @classmethod
+    async def invalidate_principal_services(cls, request: Request, user_id: Optional[int] = None) -> None:
+        """
+        使用户权限信息缓存失效
+
+        :param request: Request对象
+        :param user_id: 用户ID，为空时递增权限版本号使全部用户的缓存失效
+        :return:
+        """
+        redis = getattr(request.app.state, 'redis', None)
+        if user_id is None:
+            cls._local.clear()
+            if redis is not None:
+                await redis.incr(cls.version_key())
+        else:
+            cls._local.pop(user_id, None)
+            if redis is not None:
+                await redis.delete(cls._principal_key(user_id))
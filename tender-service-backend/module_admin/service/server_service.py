@@ -5,7 +5,16 @@ import time
 
 import psutil
 
-from module_admin.entity.vo.server_vo import CpuInfo, MemoryInfo, PyInfo, ServerMonitorModel, SysFiles, SysInfo
+from config.database import DbPoolMonitor
+from module_admin.entity.vo.server_vo import (
+    CpuInfo,
+    DbPoolInfo,
+    MemoryInfo,
+    PyInfo,
+    ServerMonitorModel,
+    SysFiles,
+    SysInfo,
+)
 from utils.common_util import bytes2human
 
 
@@ -97,6 +106,20 @@ class ServerService:
                 # 忽略所有异常，跳过有问题的磁盘
                 continue
 
-        result = ServerMonitorModel(cpu=cpu, mem=mem, sys=sys, py=py, sysFiles=sys_files)
+        # 数据库连接池信息
+        pool_snapshot = DbPoolMonitor.snapshot()
+        pool_capacity = pool_snapshot['pool_size'] + pool_snapshot['max_overflow']
+        db_pool = DbPoolInfo(
+            poolSize=pool_snapshot['pool_size'],
+            maxOverflow=pool_snapshot['max_overflow'],
+            checkedOut=pool_snapshot['checked_out'],
+            checkedIn=pool_snapshot['checked_in'],
+            overflow=pool_snapshot['overflow'],
+            peakCheckedOut=pool_snapshot['peak_checked_out'],
+            totalCheckouts=pool_snapshot['total_checkouts'],
+            usage=round(pool_snapshot['checked_out'] / pool_capacity * 100, 2) if pool_capacity > 0 else 0.0,
+        )
+
+        result = ServerMonitorModel(cpu=cpu, mem=mem, sys=sys, py=py, sysFiles=sys_files, dbPool=db_pool)
 
         return result
@@ -1 +1,3 @@
+from . import export_job_task  # noqa: F401
 from . import scheduler_test  # noqa: F401
+from . import tender_stats_task  # noqa: F401
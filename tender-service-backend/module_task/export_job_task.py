@@ -0,0 +1,12 @@
+from module_admin.service.export_job_service import ExportJobService
+from utils.log_util import logger
+
+
+def clean_expired_export_files(*args, **kwargs) -> None:
+    """
+    清理下载目录中已过期的导出文件
+
+    调用目标示例：module_task.export_job_task.clean_expired_export_files
+    """
+    removed = ExportJobService.clean_expired_files()
+    logger.info(f'已清理{removed}个过期导出文件')
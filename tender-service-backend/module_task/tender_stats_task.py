@@ -0,0 +1,25 @@
+from datetime import date
+
+from module_tender.service.tender_service import TenderService
+from utils.time_format_util import TimeFormatUtil
+
+
+def _to_date(value: str | None) -> date | None:
+    if not value:
+        return None
+    parsed = TimeFormatUtil.parse_date(value)
+    if not isinstance(parsed, date):
+        raise ValueError(f'无效的日期参数: {value}')
+    return parsed
+
+
+async def rebuild_tender_daily_stats(*args, **kwargs) -> None:
+    """
+    回填招标信息按日汇总表
+
+    调用目标示例：module_task.tender_stats_task.rebuild_tender_daily_stats('2025-01-01', '2025-12-31')，
+    不传日期时重建全部汇总
+    """
+    begin_date = _to_date(args[0] if len(args) > 0 else kwargs.get('begin_date'))
+    end_date = _to_date(args[1] if len(args) > 1 else kwargs.get('end_date'))
+    await TenderService.rebuild_daily_stats(begin_date, end_date)
@@ -4,6 +4,7 @@ from module_tender.agent.nodes.fetch_node import FetchNode
 from module_tender.agent.nodes.parse_node import ParseNode
 from module_tender.agent.nodes.analyze_node import AnalyzeNode
 from module_tender.agent.nodes.strategy_node import StrategyNode
+from module_tender.service.integration.similar_projects import SimilarProjectStatsModel
 
 class TenderAgent:
     def __init__(self):
@@ -23,14 +24,29 @@ class TenderAgent:
         
         self.app = self.workflow.compile()
         
-    async def run(self, tender_id: int, db_session, qualifications: list[str] | None = None):
+    async def run(
+        self,
+        tender_id: int,
+        tender_data: dict,
+        source_text: str = "",
+        qualifications: list[str] | None = None,
+        similar_projects: SimilarProjectStatsModel | None = None,
+    ):
+        """
+        执行分析流程
+
+        图中不持有数据库会话：招标数据、公告原文与同类项目统计由调用方预先读取后传入，
+        分析结果由调用方在结束后通过短生命周期会话写回。
+        """
         initial_state = AgentState(
             tender_id=tender_id,
-            db_session=db_session,
             progress=0,
             current_step="开始分析",
-            tender_data={},
+            tender_data=tender_data or {},
+            source_text=source_text or "",
+            similar_projects=similar_projects,
             project_text="",
+            source_cleaned=False,
             analysis_result=None,
             error=None,
             intermediate_data={},
@@ -3,6 +3,7 @@ from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 from module_tender.agent.prompts.analysis_prompts import ANALYSIS_PROMPT
 from module_tender.agent.state.state import AgentState
+from module_tender.service.integration.context_budget import ContextBudget
 from module_tender.service.integration.structured_output import extract_structured_data
 from module_tender.entity.vo.tender_vo import AiRequirementItemModel, RadarItemModel
 
@@ -21,13 +22,15 @@ class CoreAnalysisResult(BaseModel):
 
 class AnalyzeNode:
     async def __call__(self, state: AgentState) -> dict:
-        text = state.get("project_text", "")
+        # 在 token 预算内保留与分析字段最相关的章节（资格要求、评分办法等）
+        text = ContextBudget.pack(state.get("project_text", ""), CoreAnalysisResult, ANALYSIS_PROMPT)
         
         def run_analysis():
             return extract_structured_data(
                 text, 
                 CoreAnalysisResult, 
-                instruction=ANALYSIS_PROMPT
+                instruction=ANALYSIS_PROMPT,
+                max_chars=len(text),
             )
             
         result = await asyncio.to_thread(run_analysis)
@@ -1,11 +1,10 @@
 import asyncio
 from curl_cffi import requests as curl_requests
 from module_tender.agent.state.state import AgentState
-from module_tender.dao.tender_dao import TenderDao
 from utils.log_util import logger
 
 class FetchNode:
-    def _build_context(self, tender) -> str:
+    def _build_context(self, tender: dict) -> str:
         parts = []
 
         def add(label: str, value: object | None) -> None:
@@ -16,45 +15,45 @@ class FetchNode:
                 return
             parts.append(f"{label}: {text}")
 
-        add("项目名称", tender.project_name)
-        add("项目编号", tender.project_code)
-        add("所在区县", tender.district)
-        add("建设单位", tender.construction_unit)
-        add("项目阶段", tender.project_stage)
-        add("项目类型", tender.project_type)
-        add("招标控制价（万元）", tender.bid_control_price)
-        add("中标价（万元）", tender.bid_price)
-        add("建设规模", tender.construction_scale)
-        add("施工内容", tender.construction_content)
-        add("招标范围", tender.tender_scope)
-        add("工期", tender.duration)
-        add("报名截止时间", tender.registration_deadline)
-        add("代理机构", tender.agency)
-        add("信息发布时间", tender.release_time)
-        add("公告网站", tender.announcement_website)
-        add("预审公告收集网址", tender.pre_qualification_url)
-        add("中标公告网址", tender.bid_announcement_url)
-        add("备注", tender.remark)
+        add("项目名称", tender.get("project_name"))
+        add("项目编号", tender.get("project_code"))
+        add("所在区县", tender.get("district"))
+        add("建设单位", tender.get("construction_unit"))
+        add("项目阶段", tender.get("project_stage"))
+        add("项目类型", tender.get("project_type"))
+        add("招标控制价（万元）", tender.get("bid_control_price"))
+        add("中标价（万元）", tender.get("bid_price"))
+        add("建设规模", tender.get("construction_scale"))
+        add("施工内容", tender.get("construction_content"))
+        add("招标范围", tender.get("tender_scope"))
+        add("工期", tender.get("duration"))
+        add("报名截止时间", tender.get("registration_deadline"))
+        add("代理机构", tender.get("agency"))
+        add("信息发布时间", tender.get("release_time"))
+        add("公告网站", tender.get("announcement_website"))
+        add("预审公告收集网址", tender.get("pre_qualification_url"))
+        add("中标公告网址", tender.get("bid_announcement_url"))
+        add("备注", tender.get("remark"))
 
         return "\n".join(parts)
 
     async def __call__(self, state: AgentState) -> dict:
-        tender_id = state['tender_id']
-        db = state['db_session']
-        
+        tender = state.get('tender_data') or {}
+
         try:
-            tender = await TenderDao.get_tender_detail_by_id(db, tender_id)
             if not tender:
                 return {"error": "未找到招标信息", "progress": 100, "current_step": "获取失败"}
 
-            url = tender.pre_qualification_url or tender.bid_announcement_url
+            url = tender.get("pre_qualification_url") or tender.get("bid_announcement_url")
             context = self._build_context(tender)
             qualifications = state.get("qualifications") or []
             if qualifications:
                 context = f"{context}\n企业资质: {', '.join(qualifications)}"
 
-            content = ""
-            if url:
+            # 优先使用入库时已清洗的公告原文，仅在缺失时回退为实时抓取
+            content = state.get("source_text") or ""
+            source_cleaned = bool(content)
+            if not content and url:
                 def fetch():
                     try:
                         resp = curl_requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30, impersonate="chrome")
@@ -78,7 +77,7 @@ class FetchNode:
 
             return {
                 "project_text": content,
-                "tender_data": tender.__dict__,
+                "source_cleaned": source_cleaned,
                 "progress": 10,
                 "current_step": "文件获取中"
             }
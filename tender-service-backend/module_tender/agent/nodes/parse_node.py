@@ -13,12 +13,14 @@ class ParseNode:
                 tag.decompose()
             return soup.get_text(separator="\n", strip=True)
             
-        text = parse(html)
+        # 入库时已清洗的正文无需再做一次完整的 HTML 解析
+        text = html if state.get("source_cleaned") else parse(html)
         # Simple cleanup
         text = "\n".join([line for line in text.splitlines() if len(line) > 5])
         
         return {
-            "project_text": text[:25000],
+            # 不再按固定长度截断，由各分析节点按 token 预算挑选相关分块
+            "project_text": text,
             "progress": 30,
             "current_step": "解析进行中"
         }
@@ -2,8 +2,10 @@ import asyncio
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 from module_tender.agent.state.state import AgentState
+from module_tender.service.integration.context_budget import ContextBudget
+from module_tender.service.integration.similar_projects import SimilarProjectRetriever, SimilarProjectStatsModel
 from module_tender.service.integration.structured_output import extract_structured_data
-from module_tender.entity.vo.tender_vo import AiTenderAnalysisModel, CompetitorModel, PriceStatsModel
+from module_tender.entity.vo.tender_vo import AiTenderAnalysisModel
 from module_tender.agent.prompts.analysis_prompts import STRATEGY_PROMPT
 
 class StrategyAnalysisResult(BaseModel):
@@ -11,32 +13,29 @@ class StrategyAnalysisResult(BaseModel):
 
     risks: list[str] = Field(description='风险列表')
     strategy: str = Field(description='投标响应策略建议')
-    competitors: list[CompetitorModel] = Field(description='潜在竞争对手预测')
-    price_stats: PriceStatsModel = Field(description='同类项目报价分布')
 
 class StrategyNode:
     async def __call__(self, state: AgentState) -> dict:
-        text = state.get("project_text", "")
+        # 竞争对手与报价分布来自同类项目的真实统计，大模型只基于统计摘要生成风险与策略
+        stats = state.get("similar_projects") or SimilarProjectStatsModel()
+        summary = SimilarProjectRetriever.to_prompt(stats)
+        budget = ContextBudget.SINGLE_CALL_TOKENS - ContextBudget.estimate_tokens(summary)
+        text = ContextBudget.pack(state.get("project_text", ""), StrategyAnalysisResult, STRATEGY_PROMPT, max_tokens=budget)
+        text = f"{summary}\n\n{text}"
         intermediate = state.get("intermediate_data", {})
         
         def run_strategy():
             return extract_structured_data(
                 text,
                 StrategyAnalysisResult,
-                instruction=STRATEGY_PROMPT
+                instruction=STRATEGY_PROMPT,
+                max_chars=len(text),
             )
             
         result = await asyncio.to_thread(run_strategy)
         
         if not result:
-            # Create a default result if extraction fails, matching the new structure but with empty/default values
-            from module_tender.entity.vo.tender_vo import PriceStatsModel, CompetitorModel
-            result = StrategyAnalysisResult(
-                risks=[], 
-                strategy="无法生成策略",
-                competitors=[],
-                price_stats=PriceStatsModel(avg_discount="0%", max_discount="0%", distribution=[])
-            )
+            result = StrategyAnalysisResult(risks=[], strategy="无法生成策略")
         
         final_model = AiTenderAnalysisModel(
             score=intermediate.get('score', 0),
@@ -50,8 +49,8 @@ class StrategyNode:
             focus_points=intermediate.get('focus_points', []),
             risks=result.risks,
             strategy=result.strategy,
-            competitors=result.competitors,
-            price_stats=result.price_stats
+            competitors=SimilarProjectRetriever.to_competitors(stats),
+            price_stats=SimilarProjectRetriever.to_price_stats(stats)
         )
 
         return {
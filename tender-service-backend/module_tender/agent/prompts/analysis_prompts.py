@@ -11,9 +11,7 @@ ANALYSIS_PROMPT = """请分析该招标文件，提供以下内容（注意：
 9. 给出3条重点关注事项（focusPoints），要求：每条简明扼要，单条不超过40个字。例如："工期紧张，建议提前锁定专业劳务班组。"
 """
 
-STRATEGY_PROMPT = """请分析该招标文件，提供以下内容：
+STRATEGY_PROMPT = """请分析该招标文件，提供以下内容（输入开头的“同类项目历史数据”来自系统中已出中标结果的同类项目统计，请作为竞争与报价判断的依据，不要另行编造竞争对手或报价数据）：
 1. 识别潜在风险列表
-2. 给出投标响应策略建议
-3. 基于行业经验和文件内容，预测3-5个可能的竞争对手（包含名称、竞争原因、历史胜率估算、威胁等级）
-4. 预估同类项目的报价分布情况（平均下浮率、最大下浮率，以及不同下浮率区间的分布数量）。
+2. 给出投标响应策略建议，需结合同类项目的高频竞争对手与下浮率分布给出报价区间建议
 """
@@ -1,14 +1,17 @@
-from typing import TypedDict, Optional, Any
+from typing import TypedDict, Optional
 from module_tender.entity.vo.tender_vo import AiTenderAnalysisModel
+from module_tender.service.integration.similar_projects import SimilarProjectStatsModel
 
 class AgentState(TypedDict):
     tender_id: int
     tender_data: dict
+    source_text: str
+    similar_projects: Optional[SimilarProjectStatsModel]
     project_text: str
+    source_cleaned: Optional[bool]
     analysis_result: Optional[AiTenderAnalysisModel]
     progress: int
     current_step: str
     error: Optional[str]
     intermediate_data: Optional[dict]
-    db_session: Any
     qualifications: Optional[list[str]]
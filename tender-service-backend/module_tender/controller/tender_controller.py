@@ -1,23 +1,30 @@
-from typing import Annotated
+from datetime import date
+from typing import Annotated, Literal
 import json
 
 from fastapi import Depends, Form, Query, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.aspect.pre_auth import CurrentUserDependency
 from common.router import APIRouterPro
 from common.vo import DataResponseModel, PageModel
 from config.get_db import get_db
+from module_admin.entity.vo.common_vo import ExportJobModel
+from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_tender.entity.vo.tender_vo import (
     AiTenderAnalysisModel,
     AiAnalysisHistoryItemModel,
+    AiBatchAnalysisModel,
     DeleteTenderModel,
+    DistrictPriceStatModel,
     TenderDashboardModel,
     TenderModel,
     TenderPageQueryModel,
+    TenderTrendBucketModel,
+    TenderTrendQueryModel,
 )
 from module_tender.service.tender_service import TenderService
-from utils.common_util import bytes2file_response
 from utils.response_util import ResponseUtil
 
 # 实例化路由对象
@@ -30,6 +37,10 @@ tender_controller = APIRouterPro(prefix='/tenders', tags=['招标信息管理'])
 async def get_tender_list(
     page_num: int = Query(1, description='页码'),
     page_size: int = Query(10, description='每页记录数'),
+    cursor: str = Query(None, description='游标分页的游标，传入时启用游标分页（空字符串表示第一页）'),
+    with_total: bool = Query(False, description='游标分页时是否统计总记录数'),
+    fields: str = Query(None, description='需要返回的字段，逗号分隔（如 projectName,district），为空时返回全部字段'),
+    keyword: str = Query(None, description='全文检索关键词，多个关键词以空格分隔'),
     project_name: str = Query(None, description='项目名称'),
     project_code: str = Query(None, description='项目编号'),
     district: str = Query(None, description='所在区县'),
@@ -45,6 +56,10 @@ async def get_tender_list(
     tender_page_query = TenderPageQueryModel(
         page_num=page_num,
         page_size=page_size,
+        cursor=cursor,
+        with_total=with_total,
+        fields=fields,
+        keyword=keyword,
         project_name=project_name,
         project_code=project_code,
         district=district,
@@ -63,11 +78,58 @@ async def get_tender_list(
     summary='获取招标数据概览',
     description='用于获取数据概览页面所需的统计数据',
 )
-async def get_tender_dashboard(db: AsyncSession = Depends(get_db)) -> Response:
-    dashboard = await TenderService.get_dashboard_stats(db)
+async def get_tender_dashboard(request: Request, db: AsyncSession = Depends(get_db)) -> Response:
+    dashboard = await TenderService.get_dashboard_stats(db, getattr(request.app.state, 'redis', None))
     return ResponseUtil.success(data=dashboard)
 
 
+@tender_controller.get(
+    '/stats/trend',
+    response_model=DataResponseModel[list[TenderTrendBucketModel]],
+    summary='获取招标信息趋势统计',
+    description='按日、周（周一起始）或月统计指定日期范围内的招标信息数量与金额',
+)
+async def get_tender_trend_stats(
+    granularity: Literal['day', 'week', 'month'] = Query('day', description='统计粒度：day/week/month'),
+    begin_date: date = Query(None, description='开始日期'),
+    end_date: date = Query(None, description='结束日期'),
+    district: str = Query(None, description='所在区县'),
+    project_stage: str = Query(None, description='所处阶段'),
+    project_type: str = Query(None, description='项目类型'),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    trend_query = TenderTrendQueryModel(
+        granularity=granularity,
+        begin_date=begin_date,
+        end_date=end_date,
+        district=district,
+        project_stage=project_stage,
+        project_type=project_type,
+    )
+    trend_stats = await TenderService.get_trend_stats(trend_query, db)
+    return ResponseUtil.success(data=trend_stats)
+
+
+@tender_controller.get(
+    '/stats/district-price',
+    response_model=DataResponseModel[list[DistrictPriceStatModel]],
+    summary='获取区县招标金额统计',
+    description='统计指定日期范围内各区县的招标信息数量、招标控制价与中标价合计',
+)
+async def get_district_price_stats(
+    begin_date: date = Query(None, description='开始日期'),
+    end_date: date = Query(None, description='结束日期'),
+    project_stage: str = Query(None, description='所处阶段'),
+    project_type: str = Query(None, description='项目类型'),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    trend_query = TenderTrendQueryModel(
+        begin_date=begin_date, end_date=end_date, project_stage=project_stage, project_type=project_type
+    )
+    district_stats = await TenderService.get_district_price_stats(trend_query, db)
+    return ResponseUtil.success(data=district_stats)
+
+
 @tender_controller.get(
     '/{tender_id}', response_model=DataResponseModel[TenderModel], summary='获取招标信息详细信息', description='获取招标信息详细信息'
 )
@@ -89,13 +151,11 @@ async def get_tender_detail(
     summary='AI 智能参谋分析',
     description='对指定招标项目进行AI分析，返回摘要、风险与策略建议',
 )
-async def analyze_tender_ai(
-    tender_id: int, db: AsyncSession = Depends(get_db)
-) -> Response:
+async def analyze_tender_ai(tender_id: int) -> Response:
     """
-    对单个招标项目进行 AI 智能分析
+    对单个招标项目进行 AI 智能分析（服务层按需使用短连接，不占用请求级会话）
     """
-    analysis = await TenderService.analyze_tender_ai(tender_id, db)
+    analysis = await TenderService.analyze_tender_ai(tender_id)
     return ResponseUtil.success(data=analysis)
 
 
@@ -107,7 +167,6 @@ async def analyze_tender_ai(
 async def analyze_tender_ai_stream(
     tender_id: int,
     qualifications: str | None = Query(None, description='企业资质列表JSON字符串'),
-    db: AsyncSession = Depends(get_db),
 ) -> StreamingResponse:
     """
     流式返回 AI 分析进度
@@ -122,7 +181,25 @@ async def analyze_tender_ai_stream(
             parsed_qualifications = [q.strip() for q in qualifications.split(",") if q.strip()]
 
     return StreamingResponse(
-        TenderService.analyze_tender_ai_stream(tender_id, db, parsed_qualifications),
+        TenderService.analyze_tender_ai_stream(tender_id, parsed_qualifications),
+        media_type="text/event-stream"
+    )
+
+
+@tender_controller.post(
+    '/ai-analysis/batch',
+    summary='AI 智能参谋批量分析（流式）',
+    description='批量分析多个招标项目，通过 Server-Sent Events 按完成顺序逐个返回结果；已有分析结果的项目立即返回',
+    response_class=StreamingResponse,
+)
+async def analyze_tender_ai_batch(batch: AiBatchAnalysisModel) -> StreamingResponse:
+    """
+    批量 AI 分析，所有项目共享全局并发与 token 预算
+    """
+    tender_ids = TenderService.check_ai_batch_size(batch.tender_ids)
+    qualifications = [q.strip() for q in batch.qualifications or [] if q and q.strip()] or None
+    return StreamingResponse(
+        TenderService.analyze_tender_ai_batch_stream(tender_ids, qualifications),
         media_type="text/event-stream"
     )
 
@@ -184,13 +261,14 @@ async def delete_tender(
 @tender_controller.post(
     '/export',
     summary='导出招标信息列表接口',
-    description='用于导出当前符合查询条件的招标信息列表数据',
+    description='用于导出当前符合查询条件的招标信息列表数据，服务端分批读取并流式输出，支持 xlsx 与 csv',
     response_class=StreamingResponse,
     responses={
         200: {
-            'description': '流式返回招标信息列表excel文件',
+            'description': '流式返回招标信息列表excel或csv文件',
             'content': {
                 'application/octet-stream': {},
+                'text/csv': {},
             },
         }
     },
@@ -198,8 +276,29 @@ async def delete_tender(
 async def export_tender_list(
     request: Request,
     tender_page_query: Annotated[TenderPageQueryModel, Form()],
-    db: AsyncSession = Depends(get_db),
+    file_type: Literal['xlsx', 'csv'] = Query('xlsx', description='导出文件类型：xlsx/csv'),
 ) -> Response:
-    tender_query_result = await TenderService.get_tender_list(tender_page_query, db, is_page=False)
-    tender_export_result = await TenderService.export_tender_list_services(tender_query_result)
-    return ResponseUtil.streaming(data=bytes2file_response(tender_export_result))
+    media_type = 'text/csv; charset=utf-8' if file_type == 'csv' else 'application/octet-stream'
+    return ResponseUtil.streaming(
+        data=TenderService.stream_export_tender_list(tender_page_query, file_type),
+        headers={'Content-Disposition': f'attachment; filename=tender_list.{file_type}'},
+        media_type=media_type,
+    )
+
+
+@tender_controller.post(
+    '/export/async',
+    response_model=DataResponseModel[ExportJobModel],
+    summary='异步导出招标信息列表接口',
+    description='创建导出当前符合查询条件的招标信息列表的后台任务，通过 /common/exportJob/{jobId} 轮询进度，完成后通过通用下载接口下载',
+)
+async def export_tender_list_async(
+    request: Request,
+    tender_page_query: Annotated[TenderPageQueryModel, Form()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    file_type: Literal['xlsx', 'csv'] = Query('xlsx', description='导出文件类型：xlsx/csv'),
+) -> Response:
+    export_job = await TenderService.submit_export_tender_job(
+        request, tender_page_query, current_user.user.user_id, file_type
+    )
+    return ResponseUtil.success(data=export_job)
@@ -17,6 +17,17 @@ class TenderAiDao:
         result = await db.execute(query)
         return result.scalars().first()
 
+    @classmethod
+    async def get_analysis_by_tender_ids(cls, db: AsyncSession, tender_ids: list[int]) -> list[BizTenderAiAnalysis]:
+        """
+        根据tender_id列表批量获取分析结果
+        """
+        if not tender_ids:
+            return []
+        query = select(BizTenderAiAnalysis).where(BizTenderAiAnalysis.tender_id.in_(tender_ids))
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
     @classmethod
     async def save_or_update_analysis(cls, db: AsyncSession, tender_id: int, result_data: dict) -> BizTenderAiAnalysis:
         """
@@ -1,11 +1,18 @@
-from datetime import date, datetime
+import re
+from collections.abc import AsyncGenerator, Sequence
+from datetime import datetime
+from typing import Any
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import ColumnElement, Row, Select, and_, case, delete, func, or_, select, update
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
-from module_tender.entity.do.tender_do import BizTenderInfo
-from module_tender.entity.vo.tender_vo import TenderModel, TenderPageQueryModel
+from config.env import DataBaseConfig
+from module_tender.dao.tender_source_dao import TenderSourceDao
+from module_tender.dao.tender_stats_dao import TENDER_STAT_FIELDS, TenderStatsDao
+from module_tender.entity.do.tender_do import TENDER_SEARCH_COLUMNS, TENDER_SEARCH_TEXT, BizTenderInfo
+from module_tender.entity.vo.tender_vo import TenderModel, TenderPageQueryModel, TenderQueryModel
 from utils.page_util import PageUtil
 from utils.time_format_util import TimeFormatUtil
 
@@ -28,6 +35,9 @@ BEIJING_DISTRICTS = (
     '延庆区',
 )
 OTHER_DISTRICT_LABEL = '其他'
+# MySQL ngram 全文索引的分词长度（ngram_token_size 默认值）
+NGRAM_TOKEN_SIZE = 2
+_BOOLEAN_OPERATOR_PATTERN = re.compile(r'[+\-<>()~*"@]')
 
 
 class TenderDao:
@@ -50,6 +60,23 @@ class TenderDao:
 
         return tender_info
 
+    @classmethod
+    async def get_tenders_by_ids(cls, db: AsyncSession, tender_ids: list[int]) -> list[BizTenderInfo]:
+        """
+        根据招标信息id列表批量获取招标信息
+
+        :param db: orm对象
+        :param tender_ids: 招标信息id列表
+        :return: 招标信息对象列表
+        """
+        if not tender_ids:
+            return []
+        tender_list = (
+            await db.execute(select(BizTenderInfo).where(BizTenderInfo.tender_id.in_(tender_ids)))
+        ).scalars().all()
+
+        return list(tender_list)
+
     @classmethod
     async def get_tender_detail_by_project_code(cls, db: AsyncSession, project_code: str) -> BizTenderInfo | None:
         """
@@ -65,19 +92,56 @@ class TenderDao:
 
         return tender_info
 
+    @staticmethod
+    def _escape_like(term: str) -> str:
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
     @classmethod
-    async def get_tender_list(
-        cls, db: AsyncSession, query_object: TenderPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[BizTenderInfo]:
+    def build_keyword_search(cls, keyword: str) -> tuple[list[ColumnElement], ColumnElement | None]:
         """
-        根据查询参数获取招标信息列表信息
+        构建全文检索条件与相关度表达式，检索范围为项目名称、建设单位、施工内容、招标范围
+
+        MySQL 使用 ngram 全文索引（BOOLEAN MODE 短语匹配，多个关键词须同时命中）；
+        PostgreSQL 使用 pg_trgm 表达式索引（ILIKE 匹配，word_similarity 计算相关度）
+
+        :param keyword: 检索关键词，多个关键词以空格分隔
+        :return: (过滤条件列表, 相关度表达式)，无有效关键词时相关度为None
+        """
+        terms = [term for term in keyword.split() if term]
+        if not terms:
+            return [], None
+        if DataBaseConfig.db_type == 'postgresql':
+            conditions = [TENDER_SEARCH_TEXT.ilike(f'%{cls._escape_like(term)}%', escape='\\') for term in terms]
+            return conditions, func.word_similarity(' '.join(terms), TENDER_SEARCH_TEXT)
+
+        conditions = []
+        phrases = []
+        for term in terms:
+            phrase = _BOOLEAN_OPERATOR_PATTERN.sub(' ', term).strip()
+            if len(phrase) >= NGRAM_TOKEN_SIZE:
+                phrases.append(f'+"{phrase}"')
+            else:
+                # 短于分词长度的关键词无法命中 ngram 索引，回退为模糊匹配
+                conditions.append(
+                    or_(*[column.like(f'%{cls._escape_like(term)}%', escape='\\') for column in TENDER_SEARCH_COLUMNS])
+                )
+        if not phrases:
+            return conditions, None
+        relevance = match(*TENDER_SEARCH_COLUMNS, against=' '.join(phrases)).in_boolean_mode()
+        return [relevance, *conditions], relevance
+
+    @classmethod
+    def build_tender_list_query(
+        cls, query_object: TenderQueryModel, *entities: Any
+    ) -> tuple[Select, ColumnElement | None]:
+        """
+        根据查询参数构造招标信息列表查询（不含排序）
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 招标信息列表信息对象
+        :param entities: 查询的列，为空时查询整个模型
+        :return: (查询语句, 全文检索相关度表达式)
         """
-        query = select(BizTenderInfo)
+        query = select(*entities) if entities else select(BizTenderInfo)
         if query_object.tender_ids:
             id_list = query_object.tender_ids.split(',')
             ids = [int(i) for i in id_list if i.strip()]
@@ -85,6 +149,10 @@ class TenderDao:
                 query = query.where(BizTenderInfo.tender_id.in_(ids))
         if query_object.project_name:
             query = query.where(BizTenderInfo.project_name.like(f'%{query_object.project_name}%'))
+        relevance = None
+        if query_object.keyword:
+            conditions, relevance = cls.build_keyword_search(query_object.keyword)
+            query = query.where(*conditions)
         if query_object.project_code:
             query = query.where(BizTenderInfo.project_code.like(f'%{query_object.project_code}%'))
         if query_object.district:
@@ -99,12 +167,136 @@ class TenderDao:
             if start_date and end_date:
                 query = query.where(BizTenderInfo.release_time.between(start_date, end_date))
 
-        query = query.order_by(BizTenderInfo.release_time.desc(), BizTenderInfo.create_time.desc())
+        return query, relevance
 
-        tender_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
+    @staticmethod
+    def order_tender_list_query(query: Select, relevance: ColumnElement | None) -> Select:
+        if relevance is not None:
+            query = query.order_by(relevance.desc())
+        return query.order_by(BizTenderInfo.release_time.desc(), BizTenderInfo.create_time.desc())
+
+    @classmethod
+    async def get_tender_list(
+        cls, db: AsyncSession, query_object: TenderPageQueryModel, is_page: bool = False
+    ) -> PageModel | list[BizTenderInfo]:
+        """
+        根据查询参数获取招标信息列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 招标信息列表信息对象
+        """
+        columns = PageUtil.resolve_columns(BizTenderInfo, query_object.fields, ('tender_id',))
+        query, relevance = cls.build_tender_list_query(query_object, *(columns or ()))
+        if is_page and query_object.cursor is not None:
+            # 游标分页按发布时间排序（命中 idx_biz_tender_info_release），不按全文检索相关度排序
+            return await PageUtil.paginate_by_cursor(
+                db,
+                query,
+                [
+                    (BizTenderInfo.release_time, True),
+                    (BizTenderInfo.create_time, True),
+                    (BizTenderInfo.tender_id, True),
+                ],
+                query_object.page_size,
+                query_object.cursor,
+                query_object.with_total,
+                projected=columns is not None,
+            )
+        query = cls.order_tender_list_query(query, relevance)
+
+        tender_list = await PageUtil.paginate(
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            estimate_total=True,
+            projected=columns is not None,
+        )
 
         return tender_list
 
+    @classmethod
+    async def count_tender_list(cls, db: AsyncSession, query_object: TenderQueryModel) -> int:
+        """
+        统计符合查询条件的招标信息数量
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :return: 记录数
+        """
+        query, _ = cls.build_tender_list_query(query_object, BizTenderInfo.tender_id)
+        return await PageUtil.count(db, query, estimate_total=True)
+
+    @classmethod
+    async def stream_tender_list(
+        cls, db: AsyncSession, query_object: TenderQueryModel, columns: list[str], batch_size: int = 1000
+    ) -> AsyncGenerator[Sequence[Row]]:
+        """
+        使用服务端游标按批次读取符合查询条件的招标信息，仅查询指定列
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param columns: 需要查询的字段名
+        :param batch_size: 每批次记录数
+        :return: 按批次产出的记录
+        """
+        query, relevance = cls.build_tender_list_query(
+            query_object, *[getattr(BizTenderInfo, column) for column in columns]
+        )
+        result = await db.stream(cls.order_tender_list_query(query, relevance).execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+    @classmethod
+    async def get_similar_awarded_tenders(
+        cls,
+        db: AsyncSession,
+        project_type: str | None,
+        district: str | None = None,
+        price_range: tuple[float, float] | None = None,
+        exclude_tender_id: int | None = None,
+        limit: int = 200,
+    ) -> list[Row]:
+        """
+        检索同类已出中标结果的项目，仅查询统计所需列（命中 idx_biz_tender_info_similar 索引）
+
+        :param db: orm对象
+        :param project_type: 项目类型
+        :param district: 所在区县，为空时不限制
+        :param price_range: 招标控制价区间（万元），为空时不限制
+        :param exclude_tender_id: 需要排除的招标信息id
+        :param limit: 最大返回条数
+        :return: 同类项目记录列表
+        """
+        query = select(
+            BizTenderInfo.tender_id,
+            BizTenderInfo.district,
+            BizTenderInfo.construction_scale,
+            BizTenderInfo.bid_control_price,
+            BizTenderInfo.bid_price,
+            BizTenderInfo.unit_price,
+            BizTenderInfo.discount_rate,
+            BizTenderInfo.winner_rank_1,
+            BizTenderInfo.winner_rank_2,
+            BizTenderInfo.winner_rank_3,
+        ).where(
+            BizTenderInfo.project_type == project_type,
+            BizTenderInfo.winner_rank_1.is_not(None),
+            BizTenderInfo.winner_rank_1 != '',
+        )
+        if district:
+            query = query.where(BizTenderInfo.district == district)
+        if price_range:
+            query = query.where(BizTenderInfo.bid_control_price.between(*price_range))
+        if exclude_tender_id:
+            query = query.where(BizTenderInfo.tender_id != exclude_tender_id)
+        query = query.order_by(BizTenderInfo.release_time.desc()).limit(limit)
+
+        return list((await db.execute(query)).all())
+
     @classmethod
     async def get_by_code_and_stage(cls, db: AsyncSession, project_code: str, project_stage: str) -> BizTenderInfo | None:
         """
@@ -123,7 +315,7 @@ class TenderDao:
     @classmethod
     async def add_tender_dao(cls, db: AsyncSession, tender: TenderModel) -> BizTenderInfo:
         """
-        新增招标信息数据库操作
+        新增招标信息数据库操作，同一事务内累加按日汇总
 
         :param db: orm对象
         :param tender: 招标信息对象
@@ -132,54 +324,85 @@ class TenderDao:
         db_tender = BizTenderInfo(**tender.model_dump(exclude_unset=True))
         db.add(db_tender)
         await db.flush()
+        await TenderStatsDao.apply_delta(db, {field: getattr(db_tender, field) for field in TENDER_STAT_FIELDS})
 
         return db_tender
 
     @classmethod
     async def edit_tender_dao(cls, db: AsyncSession, tender: dict) -> None:
         """
-        编辑招标信息数据库操作
+        编辑招标信息数据库操作，汇总相关字段变化时同一事务内修正按日汇总
 
         :param db: orm对象
         :param tender: 需要更新的招标信息字典
         :return:
         """
+        old_values = None
+        if any(field in tender for field in TENDER_STAT_FIELDS):
+            old_values = await TenderStatsDao.get_tender_stat_values(db, tender['tender_id'])
         await db.execute(update(BizTenderInfo).where(BizTenderInfo.tender_id == tender['tender_id']).values(**tender))
+        if old_values is not None:
+            new_values = {**old_values, **{k: v for k, v in tender.items() if k in TENDER_STAT_FIELDS}}
+            if TenderStatsDao.build_stat_row(old_values) != TenderStatsDao.build_stat_row(new_values):
+                await TenderStatsDao.apply_delta(db, old_values, -1)
+                await TenderStatsDao.apply_delta(db, new_values)
 
     @classmethod
     async def delete_tender_dao(cls, db: AsyncSession, tender: TenderModel) -> None:
         """
-        删除招标信息数据库操作
+        删除招标信息数据库操作，同一事务内扣减按日汇总并删除公告原文
 
         :param db: orm对象
         :param tender: 招标信息对象
         :return:
         """
+        old_values = await TenderStatsDao.get_tender_stat_values(db, tender.tender_id)
+        if old_values is not None:
+            await TenderStatsDao.apply_delta(db, old_values, -1)
         await db.execute(delete(BizTenderInfo).where(BizTenderInfo.tender_id.in_([tender.tender_id])))
+        await TenderSourceDao.delete_source_dao(db, [tender.tender_id])
 
     @classmethod
-    async def get_dashboard_total_projects(cls, db: AsyncSession) -> int:
+    async def get_dashboard_summary(cls, db: AsyncSession, month_start: datetime) -> tuple[int, int, float]:
+        """
+        单次查询获取概览汇总指标
+
+        :param db: orm对象
+        :param month_start: 本月起始时间
+        :return: (项目总数, 本月新增, 招标控制价合计（万元）)
+        """
         result = await db.execute(
-            select(func.count(func.distinct(BizTenderInfo.project_code))).where(
-                BizTenderInfo.project_code.is_not(None),
-                BizTenderInfo.project_code != '',
+            select(
+                func.count(
+                    func.distinct(
+                        case(
+                            (
+                                and_(BizTenderInfo.project_code.is_not(None), BizTenderInfo.project_code != ''),
+                                BizTenderInfo.project_code,
+                            )
+                        )
+                    )
+                ),
+                func.sum(case((BizTenderInfo.create_time >= month_start, 1), else_=0)),
+                func.sum(BizTenderInfo.bid_control_price),
             )
         )
-        return int(result.scalar() or 0)
+        total_projects, month_new, total_amount_wan = result.one()
+        return int(total_projects or 0), int(month_new or 0), float(total_amount_wan or 0)
 
     @classmethod
-    async def get_dashboard_month_new(cls, db: AsyncSession, month_start: datetime) -> int:
-        result = await db.execute(select(func.count(BizTenderInfo.tender_id)).where(BizTenderInfo.create_time >= month_start))
-        return int(result.scalar() or 0)
+    async def get_dashboard_last_sync_time(cls, db: AsyncSession) -> datetime | None:
+        result = await db.execute(select(func.max(BizTenderInfo.update_time)))
+        return result.scalar()
 
     @classmethod
-    async def get_dashboard_total_amount_wan(cls, db: AsyncSession) -> float:
-        result = await db.execute(select(func.sum(BizTenderInfo.bid_control_price)))
-        value = result.scalar()
-        return float(value or 0)
+    async def get_dashboard_district_stats(cls, db: AsyncSession) -> tuple[list[tuple[str, int]], str]:
+        """
+        单次分组查询获取区县分布及项目数最多的区县（非北京区县合并为“其他”）
 
-    @classmethod
-    async def get_dashboard_top_district(cls, db: AsyncSession) -> str:
+        :param db: orm对象
+        :return: (区县分布, 项目数最多的区县)
+        """
         result = await db.execute(
             select(BizTenderInfo.district, func.count(func.distinct(BizTenderInfo.project_code)).label('cnt'))
             .where(
@@ -187,15 +410,25 @@ class TenderDao:
                 BizTenderInfo.district != '',
             )
             .group_by(BizTenderInfo.district)
-            .order_by(func.count(func.distinct(BizTenderInfo.project_code)).desc())
         )
         rows = [(str(r[0]), int(r[1] or 0)) for r in result.all() if r[0]]
-        if not rows:
-            return ''
+        return cls.group_district_counts(rows)
+
+    @staticmethod
+    def group_district_counts(rows: list[tuple[str, int]]) -> tuple[list[tuple[str, int]], str]:
+        """
+        按北京区县顺序整理区县计数，非北京区县合并为“其他”
 
+        :param rows: (区县, 项目数) 列表
+        :return: (区县分布, 项目数最多的区县)
+        """
         count_by_district = dict(rows)
         other_sum = sum(count for district, count in rows if district not in BEIJING_DISTRICTS)
 
+        stats = [(d, count_by_district[d]) for d in BEIJING_DISTRICTS if count_by_district.get(d, 0) > 0]
+        if other_sum > 0:
+            stats.append((OTHER_DISTRICT_LABEL, other_sum))
+
         best_name = ''
         best_count = 0
         for district in BEIJING_DISTRICTS:
@@ -205,33 +438,7 @@ class TenderDao:
                 best_name = district
         if other_sum > best_count:
             best_name = OTHER_DISTRICT_LABEL
-
-        return best_name
-
-    @classmethod
-    async def get_dashboard_last_sync_time(cls, db: AsyncSession) -> datetime | None:
-        result = await db.execute(select(func.max(BizTenderInfo.update_time)))
-        return result.scalar()
-
-    @classmethod
-    async def get_dashboard_district_stats(cls, db: AsyncSession) -> list[tuple[str, int]]:
-        result = await db.execute(
-            select(BizTenderInfo.district, func.count(func.distinct(BizTenderInfo.project_code)).label('cnt'))
-            .where(
-                BizTenderInfo.district.is_not(None),
-                BizTenderInfo.district != '',
-            )
-            .group_by(BizTenderInfo.district)
-            .order_by(func.count(func.distinct(BizTenderInfo.project_code)).desc())
-        )
-        rows = [(str(r[0]), int(r[1] or 0)) for r in result.all() if r[0]]
-        count_by_district = dict(rows)
-        other_sum = sum(count for district, count in rows if district not in BEIJING_DISTRICTS)
-
-        stats = [(d, count_by_district[d]) for d in BEIJING_DISTRICTS if count_by_district.get(d, 0) > 0]
-        if other_sum > 0:
-            stats.append((OTHER_DISTRICT_LABEL, other_sum))
-        return stats
+        return stats, best_name
 
     @classmethod
     async def get_dashboard_stage_stats(cls, db: AsyncSession) -> list[tuple[str, int]]:
@@ -242,14 +449,3 @@ class TenderDao:
             .order_by(func.count(BizTenderInfo.tender_id).desc())
         )
         return [(str(r[0]), int(r[1] or 0)) for r in result.all() if r[0]]
-
-    @classmethod
-    async def get_dashboard_trend(cls, db: AsyncSession, start_date: date, end_date: date) -> list[tuple[date, int]]:
-        date_expr = func.coalesce(BizTenderInfo.release_time, func.date(BizTenderInfo.create_time)).label('d')
-        result = await db.execute(
-            select(date_expr, func.count(BizTenderInfo.tender_id).label('cnt'))
-            .where(date_expr.between(start_date, end_date))
-            .group_by(date_expr)
-            .order_by(date_expr.asc())
-        )
-        return [(r[0], int(r[1] or 0)) for r in result.all() if r[0]]
@@ -0,0 +1,102 @@
+import zlib
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from module_tender.entity.do.tender_source_do import BizTenderSource
+
+
+class TenderSourceDao:
+    """
+    招标公告原文DAO
+    """
+
+    @staticmethod
+    def compress_text(text: str) -> bytes:
+        """
+        压缩正文文本
+        """
+        return zlib.compress(text.encode('utf-8'), 6)
+
+    @staticmethod
+    def decompress_text(content: bytes | None) -> str:
+        """
+        解压正文文本
+        """
+        if not content:
+            return ''
+        return zlib.decompress(content).decode('utf-8')
+
+    @classmethod
+    async def get_source_by_tender_id(cls, db: AsyncSession, tender_id: int) -> BizTenderSource | None:
+        """
+        根据tender_id获取公告原文记录
+        """
+        query = select(BizTenderSource).where(BizTenderSource.tender_id == tender_id)
+        result = await db.execute(query)
+        return result.scalars().first()
+
+    @classmethod
+    async def get_source_text_by_tender_id(cls, db: AsyncSession, tender_id: int) -> str:
+        """
+        根据tender_id获取解压后的公告正文，不存在时返回空字符串
+        """
+        result = await db.execute(select(BizTenderSource.content).where(BizTenderSource.tender_id == tender_id))
+        return cls.decompress_text(result.scalar())
+
+    @classmethod
+    async def get_source_texts_by_tender_ids(cls, db: AsyncSession, tender_ids: list[int]) -> dict[int, str]:
+        """
+        根据tender_id列表批量获取解压后的公告正文
+        """
+        if not tender_ids:
+            return {}
+        result = await db.execute(
+            select(BizTenderSource.tender_id, BizTenderSource.content).where(BizTenderSource.tender_id.in_(tender_ids))
+        )
+        return {row.tender_id: cls.decompress_text(row.content) for row in result.all()}
+
+    @classmethod
+    async def save_source_dao(
+        cls, db: AsyncSession, tender_id: int, source_url: str | None, source_text: str | None
+    ) -> BizTenderSource | None:
+        """
+        保存或更新公告原文，正文为空时不写入
+
+        :param db: orm对象
+        :param tender_id: 招标信息id
+        :param source_url: 原文网址
+        :param source_text: 清洗后的正文
+        :return: 公告原文记录
+        """
+        text = (source_text or '').strip()
+        if not text:
+            return None
+        existing = await cls.get_source_by_tender_id(db, tender_id)
+        if existing:
+            existing.source_url = source_url
+            existing.content = cls.compress_text(text)
+            existing.content_length = len(text)
+            await db.flush()
+            return existing
+        source = BizTenderSource(
+            tender_id=tender_id,
+            source_url=source_url,
+            content=cls.compress_text(text),
+            content_length=len(text),
+        )
+        db.add(source)
+        await db.flush()
+        return source
+
+    @classmethod
+    async def delete_source_dao(cls, db: AsyncSession, tender_ids: list[int]) -> None:
+        """
+        根据tender_id列表删除公告原文
+
+        :param db: orm对象
+        :param tender_ids: 招标信息id列表
+        :return:
+        """
+        if tender_ids:
+            await db.execute(delete(BizTenderSource).where(BizTenderSource.tender_id.in_(tender_ids)))
@@ -0,0 +1,232 @@
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.env import DataBaseConfig
+from module_tender.entity.do.tender_do import BizTenderInfo
+from module_tender.entity.do.tender_stats_do import BizTenderDailyStats
+
+# 参与按日汇总的招标信息字段
+TENDER_STAT_FIELDS = (
+    'release_time',
+    'create_time',
+    'district',
+    'project_stage',
+    'project_type',
+    'bid_control_price',
+    'bid_price',
+)
+
+
+class TenderStatsDao:
+    """
+    招标信息按日汇总数据库操作层
+    """
+
+    @staticmethod
+    def _stat_date_expr() -> Any:
+        return func.coalesce(BizTenderInfo.release_time, func.date(BizTenderInfo.create_time))
+
+    @staticmethod
+    def build_stat_row(values: Mapping[str, Any], sign: int = 1) -> dict[str, Any]:
+        """
+        根据招标信息字段生成汇总增量行
+
+        :param values: 招标信息字段（见 TENDER_STAT_FIELDS）
+        :param sign: 1 为计入，-1 为扣除
+        :return: 汇总增量行
+        """
+        stat_date = values.get('release_time')
+        if stat_date is None:
+            create_time = values.get('create_time')
+            stat_date = create_time.date() if isinstance(create_time, datetime) else date.today()
+        elif isinstance(stat_date, datetime):
+            stat_date = stat_date.date()
+        return {
+            'stat_date': stat_date,
+            'district': values.get('district') or '',
+            'project_stage': values.get('project_stage') or '',
+            'project_type': values.get('project_type') or '',
+            'tender_count': sign,
+            'control_price_sum': sign * float(values.get('bid_control_price') or 0),
+            'bid_price_sum': sign * float(values.get('bid_price') or 0),
+        }
+
+    @classmethod
+    async def apply_delta(cls, db: AsyncSession, values: Mapping[str, Any], sign: int = 1) -> None:
+        """
+        在当前事务中累加一条招标信息对汇总表的贡献（原子 upsert）
+
+        :param db: orm对象
+        :param values: 招标信息字段
+        :param sign: 1 为计入，-1 为扣除
+        :return:
+        """
+        row = cls.build_stat_row(values, sign)
+        if DataBaseConfig.db_type == 'postgresql':
+            stmt = pg_insert(BizTenderDailyStats).values(**row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['stat_date', 'district', 'project_stage', 'project_type'],
+                set_={
+                    'tender_count': BizTenderDailyStats.tender_count + stmt.excluded.tender_count,
+                    'control_price_sum': BizTenderDailyStats.control_price_sum + stmt.excluded.control_price_sum,
+                    'bid_price_sum': BizTenderDailyStats.bid_price_sum + stmt.excluded.bid_price_sum,
+                    'update_time': func.now(),
+                },
+            )
+        else:
+            stmt = mysql_insert(BizTenderDailyStats).values(**row)
+            stmt = stmt.on_duplicate_key_update(
+                tender_count=BizTenderDailyStats.tender_count + stmt.inserted.tender_count,
+                control_price_sum=BizTenderDailyStats.control_price_sum + stmt.inserted.control_price_sum,
+                bid_price_sum=BizTenderDailyStats.bid_price_sum + stmt.inserted.bid_price_sum,
+                update_time=func.now(),
+            )
+        await db.execute(stmt)
+
+    @classmethod
+    async def get_tender_stat_values(cls, db: AsyncSession, tender_id: int) -> dict[str, Any] | None:
+        """
+        获取招标信息当前参与汇总的字段值
+
+        :param db: orm对象
+        :param tender_id: 招标信息id
+        :return: 字段值字典，不存在时返回None
+        """
+        row = (
+            await db.execute(
+                select(*[getattr(BizTenderInfo, field) for field in TENDER_STAT_FIELDS]).where(
+                    BizTenderInfo.tender_id == tender_id
+                )
+            )
+        ).first()
+        return dict(row._mapping) if row else None
+
+    @classmethod
+    async def rebuild_range(cls, db: AsyncSession, begin_date: date | None = None, end_date: date | None = None) -> int:
+        """
+        按原始数据重建指定日期范围内的汇总（回填），日期为空时重建全部
+
+        :param db: orm对象
+        :param begin_date: 开始日期
+        :param end_date: 结束日期
+        :return: 重建的汇总行数
+        """
+        stat_date = cls._stat_date_expr()
+        delete_stmt = delete(BizTenderDailyStats)
+        source = select(
+            stat_date.label('stat_date'),
+            func.coalesce(BizTenderInfo.district, literal('')).label('district'),
+            func.coalesce(BizTenderInfo.project_stage, literal('')).label('project_stage'),
+            func.coalesce(BizTenderInfo.project_type, literal('')).label('project_type'),
+            func.count(BizTenderInfo.tender_id).label('tender_count'),
+            func.coalesce(func.sum(BizTenderInfo.bid_control_price), 0).label('control_price_sum'),
+            func.coalesce(func.sum(BizTenderInfo.bid_price), 0).label('bid_price_sum'),
+        ).where(stat_date.is_not(None))
+        if begin_date:
+            delete_stmt = delete_stmt.where(BizTenderDailyStats.stat_date >= begin_date)
+            source = source.where(stat_date >= begin_date)
+        if end_date:
+            delete_stmt = delete_stmt.where(BizTenderDailyStats.stat_date <= end_date)
+            source = source.where(stat_date <= end_date)
+        source = source.group_by(
+            stat_date,
+            func.coalesce(BizTenderInfo.district, literal('')),
+            func.coalesce(BizTenderInfo.project_stage, literal('')),
+            func.coalesce(BizTenderInfo.project_type, literal('')),
+        )
+
+        await db.execute(delete_stmt)
+        result = await db.execute(
+            BizTenderDailyStats.__table__.insert().from_select(
+                [
+                    'stat_date',
+                    'district',
+                    'project_stage',
+                    'project_type',
+                    'tender_count',
+                    'control_price_sum',
+                    'bid_price_sum',
+                ],
+                source,
+            )
+        )
+        return result.rowcount or 0
+
+    @classmethod
+    async def get_daily_stats(
+        cls,
+        db: AsyncSession,
+        begin_date: date,
+        end_date: date,
+        district: str | None = None,
+        project_stage: str | None = None,
+        project_type: str | None = None,
+    ) -> list[tuple[date, int, float, float]]:
+        """
+        按日汇总指定日期范围内的招标信息数量与金额
+
+        :param db: orm对象
+        :param begin_date: 开始日期
+        :param end_date: 结束日期
+        :param district: 所在区县
+        :param project_stage: 所处阶段
+        :param project_type: 项目类型
+        :return: (日期, 数量, 招标控制价合计, 中标价合计) 列表
+        """
+        query = select(
+            BizTenderDailyStats.stat_date,
+            func.sum(BizTenderDailyStats.tender_count),
+            func.sum(BizTenderDailyStats.control_price_sum),
+            func.sum(BizTenderDailyStats.bid_price_sum),
+        ).where(BizTenderDailyStats.stat_date.between(begin_date, end_date))
+        if district:
+            query = query.where(BizTenderDailyStats.district == district)
+        if project_stage:
+            query = query.where(BizTenderDailyStats.project_stage == project_stage)
+        if project_type:
+            query = query.where(BizTenderDailyStats.project_type == project_type)
+        result = await db.execute(
+            query.group_by(BizTenderDailyStats.stat_date).order_by(BizTenderDailyStats.stat_date.asc())
+        )
+        return [(r[0], int(r[1] or 0), float(r[2] or 0), float(r[3] or 0)) for r in result.all()]
+
+    @classmethod
+    async def get_district_price_sums(
+        cls,
+        db: AsyncSession,
+        begin_date: date,
+        end_date: date,
+        project_stage: str | None = None,
+        project_type: str | None = None,
+    ) -> list[tuple[str, int, float, float]]:
+        """
+        按区县汇总指定日期范围内的招标信息数量与金额
+
+        :param db: orm对象
+        :param begin_date: 开始日期
+        :param end_date: 结束日期
+        :param project_stage: 所处阶段
+        :param project_type: 项目类型
+        :return: (区县, 数量, 招标控制价合计, 中标价合计) 列表，按招标控制价合计降序
+        """
+        control_price_sum = func.sum(BizTenderDailyStats.control_price_sum)
+        query = select(
+            BizTenderDailyStats.district,
+            func.sum(BizTenderDailyStats.tender_count),
+            control_price_sum,
+            func.sum(BizTenderDailyStats.bid_price_sum),
+        ).where(BizTenderDailyStats.stat_date.between(begin_date, end_date))
+        if project_stage:
+            query = query.where(BizTenderDailyStats.project_stage == project_stage)
+        if project_type:
+            query = query.where(BizTenderDailyStats.project_type == project_type)
+        result = await db.execute(
+            query.group_by(BizTenderDailyStats.district).order_by(control_price_sum.desc())
+        )
+        return [(r[0], int(r[1] or 0), float(r[2] or 0), float(r[3] or 0)) for r in result.all()]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Column, Date, DateTime, Numeric, String, UniqueConstraint
+from sqlalchemy import DDL, BigInteger, Column, Date, DateTime, Index, Numeric, String, UniqueConstraint, event, func, literal_column
 
 from config.database import Base
 from config.env import DataBaseConfig
@@ -15,6 +15,17 @@ class BizTenderInfo(Base):
     __tablename__ = 'biz_tender_info'
     __table_args__ = (
         UniqueConstraint('project_code', 'project_stage', name='uq_biz_tender_info_code_stage'),
+        # 列表默认排序 release_time DESC, create_time DESC
+        Index('idx_biz_tender_info_release', 'release_time', 'create_time'),
+        # 列表等值筛选 + 发布时间排序
+        Index('idx_biz_tender_info_district', 'district', 'release_time'),
+        Index('idx_biz_tender_info_stage', 'project_stage', 'release_time'),
+        Index('idx_biz_tender_info_type', 'project_type', 'release_time'),
+        # 概览：本月新增（create_time 范围）与最近同步时间（max(update_time)）
+        Index('idx_biz_tender_info_create_time', 'create_time'),
+        Index('idx_biz_tender_info_update_time', 'update_time'),
+        # 同类项目检索
+        Index('idx_biz_tender_info_similar', 'project_type', 'district', 'bid_control_price'),
         {'comment': '招标信息表'},
     )
 
@@ -200,3 +211,35 @@ class BizTenderInfo(Base):
         server_default=SqlalchemyUtil.get_server_default_null(DataBaseConfig.db_type),
         comment='备注',
     )
+
+
+# 全文检索覆盖的字段
+TENDER_SEARCH_COLUMNS = (
+    BizTenderInfo.project_name,
+    BizTenderInfo.construction_unit,
+    BizTenderInfo.construction_content,
+    BizTenderInfo.tender_scope,
+)
+
+if DataBaseConfig.db_type == 'postgresql':
+    # 检索字段拼接表达式，查询时需与表达式索引保持完全一致（常量以字面量形式渲染）
+    TENDER_SEARCH_TEXT = func.coalesce(TENDER_SEARCH_COLUMNS[0], literal_column("''"))
+    for _column in TENDER_SEARCH_COLUMNS[1:]:
+        TENDER_SEARCH_TEXT = TENDER_SEARCH_TEXT.op('||')(literal_column("' '")).op('||')(
+            func.coalesce(_column, literal_column("''"))
+        )
+    Index(
+        'idx_biz_tender_info_search',
+        TENDER_SEARCH_TEXT.label('search_text'),
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+    event.listen(BizTenderInfo.__table__, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+else:
+    TENDER_SEARCH_TEXT = None
+    Index(
+        'ft_biz_tender_info_search',
+        *TENDER_SEARCH_COLUMNS,
+        mysql_prefix='FULLTEXT',
+        mysql_with_parser='ngram',
+    )
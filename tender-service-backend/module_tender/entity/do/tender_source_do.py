@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, LargeBinary, String, func
+
+from config.database import Base
+
+
+class BizTenderSource(Base):
+    """
+    招标公告原文表（入库时清洗后的正文，zlib压缩存储）
+    """
+
+    __tablename__ = 'biz_tender_source'
+    __table_args__ = ({'comment': '招标公告原文表'},)
+
+    source_id = Column(BigInteger, primary_key=True, nullable=False, autoincrement=True, comment='主键ID')
+    tender_id = Column(BigInteger, nullable=False, unique=True, index=True, comment='招标信息ID')
+    source_url = Column(String(255), nullable=True, comment='原文网址')
+    content = Column(LargeBinary(16 * 1024 * 1024), nullable=True, comment='清洗后正文（zlib压缩）')
+    content_length = Column(Integer, nullable=True, server_default='0', comment='正文原始字符数')
+    create_time = Column(DateTime, server_default=func.now(), comment='创建时间')
+    update_time = Column(DateTime, server_default=func.now(), onupdate=func.now(), comment='更新时间')
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Date, DateTime, Integer, Numeric, String, func
+
+from config.database import Base
+
+
+class BizTenderDailyStats(Base):
+    """
+    招标信息按日汇总表（入库时增量维护，可通过定时任务回填）
+    """
+
+    __tablename__ = 'biz_tender_daily_stats'
+    __table_args__ = ({'comment': '招标信息按日汇总表'},)
+
+    stat_date = Column(Date, primary_key=True, nullable=False, comment='统计日期（信息发布日期，缺失时取创建日期）')
+    district = Column(String(100), primary_key=True, nullable=False, server_default='', comment='所在区县')
+    project_stage = Column(String(50), primary_key=True, nullable=False, server_default='', comment='所处阶段')
+    project_type = Column(String(100), primary_key=True, nullable=False, server_default='', comment='项目类型')
+    tender_count = Column(Integer, nullable=False, server_default='0', comment='招标信息数量')
+    control_price_sum = Column(Numeric(20, 6), nullable=False, server_default='0', comment='招标控制价合计（万元）')
+    bid_price_sum = Column(Numeric(20, 6), nullable=False, server_default='0', comment='中标价合计（万元）')
+    update_time = Column(DateTime, server_default=func.now(), onupdate=func.now(), comment='更新时间')
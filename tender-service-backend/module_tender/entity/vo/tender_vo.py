@@ -1,4 +1,5 @@
 from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
@@ -52,6 +53,7 @@ class TenderQueryModel(TenderModel):
     招标信息管理不分页查询模型
     """
 
+    keyword: str | None = Field(default=None, description='全文检索关键词（项目名称、建设单位、施工内容、招标范围）')
     begin_time: str | None = Field(default=None, description='开始时间')
     end_time: str | None = Field(default=None, description='结束时间')
     tender_ids: str | None = Field(default=None, description='选中的招标信息ID集合，逗号分隔')
@@ -64,6 +66,9 @@ class TenderPageQueryModel(TenderQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    cursor: str | None = Field(default=None, description='游标分页的游标，传入时启用游标分页（空字符串表示第一页）')
+    with_total: bool = Field(default=False, description='游标分页时是否统计总记录数')
+    fields: str | None = Field(default=None, description='需要返回的字段，逗号分隔（如 projectName,district），为空时返回全部字段')
 
 
 class DeleteTenderModel(BaseModel):
@@ -112,6 +117,47 @@ class TenderDashboardModel(BaseModel):
     trend_stats: list[TrendStatModel] = Field(description='趋势统计')
 
 
+class TenderTrendQueryModel(BaseModel):
+    """
+    招标信息趋势统计查询模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    granularity: Literal['day', 'week', 'month'] = Field(default='day', description='统计粒度')
+    begin_date: date | None = Field(default=None, description='开始日期')
+    end_date: date | None = Field(default=None, description='结束日期')
+    district: str | None = Field(default=None, description='所在区县')
+    project_stage: str | None = Field(default=None, description='所处阶段')
+    project_type: str | None = Field(default=None, description='项目类型')
+
+
+class TenderTrendBucketModel(BaseModel):
+    """
+    招标信息趋势统计（按日/周/月）
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    period: str = Field(description='统计周期起始日期')
+    count: int = Field(description='招标信息数量')
+    control_price_sum: float = Field(description='招标控制价合计（万元）')
+    bid_price_sum: float = Field(description='中标价合计（万元）')
+
+
+class DistrictPriceStatModel(BaseModel):
+    """
+    区县招标金额统计
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    district: str = Field(description='所在区县')
+    count: int = Field(description='招标信息数量')
+    control_price_sum: float = Field(description='招标控制价合计（万元）')
+    bid_price_sum: float = Field(description='中标价合计（万元）')
+
+
 class AiRequirementItemModel(BaseModel):
     """
     AI 智能参谋 - 单条关键/硬性要求
@@ -194,6 +240,17 @@ class AiTenderAnalysisModel(BaseModel):
     focus_points: list[str] = Field(description='重点关注事项')
 
 
+class AiBatchAnalysisModel(BaseModel):
+    """
+    AI 智能参谋 - 批量分析请求
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    tender_ids: list[int] = Field(description='需要分析的招标信息ID列表')
+    qualifications: list[str] | None = Field(default=None, description='企业资质列表')
+
+
 class AiAnalysisHistoryItemModel(BaseModel):
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
@@ -69,15 +69,15 @@ class GovProcurementBase:
                 return None
 
     @staticmethod
-    def _sanitize_text_for_ai(text: str, max_len: int = 6000) -> str:
+    def _sanitize_text_for_ai(text: str, max_len: int | None = None) -> str:
         """
-        排除敏感信息
+        排除敏感信息（长度由结构化提取的分块预算控制，默认不截断）
         """
         t = text or ""
         t = re.sub(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', '', t)
         t = re.sub(r'\b1[3-9]\d{9}\b', '', t)
         t = re.sub(r'\b0\d{2,3}-\d{7,8}\b', '', t)
-        return t[:max_len]
+        return t[:max_len] if max_len else t
 
     @classmethod
     async def check_and_skip_if_exists(cls, item: dict, db: AsyncSession, project_stage: str) -> bool:
@@ -2,10 +2,14 @@ import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_tender.dao.tender_dao import TenderDao
+from module_tender.dao.tender_source_dao import TenderSourceDao
 from module_tender.entity.structured_entity.gov_tender_notice_entity import GovTenderNoticeEntity
 from module_tender.entity.vo.tender_vo import TenderModel
 from module_tender.service.beijing_gov_procurement.base import GovProcurementBase, Landscaping
-from module_tender.service.integration.structured_output import extract_structured_data
+from module_tender.service.integration.structured_output import (
+    extract_structured_data,
+    extract_structured_data_chunked,
+)
 
 
 from prompts.prompts import get_classify_landscaping_prompt
@@ -35,7 +39,7 @@ class GovTenderNoticeFetcher(GovProcurementBase):
         semaphore = asyncio.Semaphore(10)
         db_lock = asyncio.Lock()
 
-        async def process_item(item: dict) -> TenderModel | None:
+        async def process_item(item: dict) -> tuple[TenderModel, dict] | None:
             async with semaphore:
                 url = item.get('project_url')
                 if not url:
@@ -97,7 +101,7 @@ class GovTenderNoticeFetcher(GovProcurementBase):
                             release_time=cls._parse_release_date(item.get("project_time")),
                             remark=parsed.get("remark")
                         )
-                    return tender
+                    return tender, parsed
                 except Exception:
                     return None
 
@@ -105,10 +109,14 @@ class GovTenderNoticeFetcher(GovProcurementBase):
         tenders = await asyncio.gather(*tasks)
 
         inserted = 0
-        for tender in tenders:
-            if tender:
+        for processed in tenders:
+            if processed:
+                tender, parsed = processed
                 try:
-                    await TenderDao.add_tender_dao(db, tender)
+                    db_tender = await TenderDao.add_tender_dao(db, tender)
+                    await TenderSourceDao.save_source_dao(
+                        db, db_tender.tender_id, parsed.get("preQualificationUrl"), parsed.get("sourceText")
+                    )
                     await db.commit()
                     inserted += 1
                 except Exception:
@@ -136,8 +144,7 @@ class GovTenderNoticeFetcher(GovProcurementBase):
         使用 AI 提取招标公告关键信息
         """
         try:
-            result = await asyncio.to_thread(
-                extract_structured_data,
+            result = await extract_structured_data_chunked(
                 text=text,
                 response_model=GovTenderNoticeEntity,
                 instruction="从下述公告中提取相关信息：",
@@ -157,6 +164,7 @@ class GovTenderNoticeFetcher(GovProcurementBase):
         if content_str is None:
             content_str = await GovProcurementBase.get_html_detail_content(json_item.get('project_url'))
         html_url = json_item.get('project_url')
+        source_text = content_str
 
         # 使用 AI 提取补充字段
         content_str = cls._sanitize_text_for_ai(content_str)
@@ -178,7 +186,8 @@ class GovTenderNoticeFetcher(GovProcurementBase):
             "tenderScope": ai_result.tenderScope,
             "announcementWebsite": "政府采购",
             "preQualificationUrl": html_url,
-            "remark": remark_text
+            "remark": remark_text,
+            "sourceText": source_text,
         }
 
 
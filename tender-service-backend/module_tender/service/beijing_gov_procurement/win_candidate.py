@@ -2,10 +2,14 @@ import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_tender.dao.tender_dao import TenderDao
+from module_tender.dao.tender_source_dao import TenderSourceDao
 from module_tender.entity.structured_entity.gov_win_candidate_entity import GovWinCandidateEntity
 from module_tender.entity.vo.tender_vo import TenderModel
 from module_tender.service.beijing_gov_procurement.base import GovProcurementBase, Landscaping
-from module_tender.service.integration.structured_output import extract_structured_data
+from module_tender.service.integration.structured_output import (
+    extract_structured_data,
+    extract_structured_data_chunked,
+)
 from prompts.prompts import get_classify_landscaping_prompt
 
 
@@ -35,7 +39,7 @@ class GovWinCandidateFetcher(GovProcurementBase):
         semaphore = asyncio.Semaphore(10)
         db_lock = asyncio.Lock()
 
-        async def process_item(item: dict) -> TenderModel | None:
+        async def process_item(item: dict) -> tuple[TenderModel, dict] | None:
             async with semaphore:
                 url = item.get('project_url')
                 if not url:
@@ -103,7 +107,7 @@ class GovWinCandidateFetcher(GovProcurementBase):
                         # registration_deadline=cls._parse_release_date(item.get("noticeEndTime")),
                         remark=parsed.get("remark"),
                         )
-                    return tender
+                    return tender, parsed
                 except Exception:
                     return None
 
@@ -111,10 +115,14 @@ class GovWinCandidateFetcher(GovProcurementBase):
         tenders = await asyncio.gather(*tasks)
 
         inserted = 0
-        for tender in tenders:
-            if tender:
+        for processed in tenders:
+            if processed:
+                tender, parsed = processed
                 try:
-                    await TenderDao.add_tender_dao(db, tender)
+                    db_tender = await TenderDao.add_tender_dao(db, tender)
+                    await TenderSourceDao.save_source_dao(
+                        db, db_tender.tender_id, parsed.get("bidAnnouncementUrl"), parsed.get("sourceText")
+                    )
                     await db.commit()
                     inserted += 1
                 except Exception:
@@ -143,8 +151,7 @@ class GovWinCandidateFetcher(GovProcurementBase):
     @classmethod
     async def _extract_ai_data(cls, text: str) -> tuple[GovWinCandidateEntity, bool]:
         try:
-            result = await asyncio.to_thread(
-                extract_structured_data,
+            result = await extract_structured_data_chunked(
                 text=text,
                 response_model=GovWinCandidateEntity,
                 instruction="从下述公告和中标详情中请仅返回结构化字段，不要输出或处理任何联系方式、邮箱、电话等信息。",
@@ -163,6 +170,7 @@ class GovWinCandidateFetcher(GovProcurementBase):
         if content_str is None:
             content_str = await GovProcurementBase.get_html_detail_content(json_item.get('project_url'))
         html_url = json_item.get('project_url')
+        source_text = content_str
 
         # 使用 AI 提取补充字段
         content_str = cls._sanitize_text_for_ai(content_str)
@@ -190,6 +198,7 @@ class GovWinCandidateFetcher(GovProcurementBase):
             "bidAnnouncementUrl": html_url,
             "evaluationReport1": html_url,
             "remark": remark_text,
+            "sourceText": source_text,
         }
 
 
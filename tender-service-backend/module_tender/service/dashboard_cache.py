@@ -0,0 +1,124 @@
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from datetime import date
+
+from redis import asyncio as aioredis
+
+from common.enums import RedisInitKeyConfig
+from config.database import TableWriteEvents
+from utils.log_util import logger
+
+# 影响概览统计的表，提交写入后使概览缓存失效
+DASHBOARD_SOURCE_TABLES = frozenset({'biz_tender_info', 'sys_job_log'})
+
+
+class TenderDashboardCache:
+    """
+    招标数据概览聚合缓存：聚合结果快照存放于 Redis，读取时一次 MGET 取回快照与数据版本号；
+    相关表提交写入后递增版本号使快照失效，下次读取时重建
+    """
+
+    # 快照兜底有效期（秒），防止绕过 ORM 的写入导致长期不一致
+    SNAPSHOT_TTL = 600
+
+    _redis: aioredis.Redis | None = None
+    _rebuild_lock: asyncio.Lock | None = None
+    _pending: set[asyncio.Task] = set()
+
+    @classmethod
+    def snapshot_key(cls) -> str:
+        return f'{RedisInitKeyConfig.TENDER_DASHBOARD.key}:snapshot'
+
+    @classmethod
+    def version_key(cls) -> str:
+        return f'{RedisInitKeyConfig.TENDER_DASHBOARD.key}:version'
+
+    @classmethod
+    def bind(cls, redis: aioredis.Redis | None) -> None:
+        """
+        绑定 Redis 连接，供写入事件触发的失效操作使用
+
+        :param redis: redis对象
+        """
+        cls._redis = redis
+
+    @classmethod
+    def _get_rebuild_lock(cls) -> asyncio.Lock:
+        if cls._rebuild_lock is None:
+            cls._rebuild_lock = asyncio.Lock()
+        return cls._rebuild_lock
+
+    @classmethod
+    async def _read(cls, redis: aioredis.Redis) -> tuple[dict | None, int]:
+        snapshot_raw, version_raw = await redis.mget(cls.snapshot_key(), cls.version_key())
+        version = int(version_raw or 0)
+        if not snapshot_raw:
+            return None, version
+        snapshot = json.loads(snapshot_raw)
+        if snapshot.get('version') != version or snapshot.get('as_of') != date.today().isoformat():
+            return None, version
+        return snapshot, version
+
+    @classmethod
+    async def get_or_build(
+        cls, redis: aioredis.Redis | None, builder: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """
+        获取概览聚合快照，缓存失效或不可用时重建（同一进程内并发请求只重建一次）
+
+        :param redis: redis对象，为空时直接重建
+        :param builder: 从数据库计算聚合快照的函数
+        :return: 聚合快照
+        """
+        if redis is None:
+            return await builder()
+        try:
+            snapshot, _ = await cls._read(redis)
+            if snapshot is not None:
+                return snapshot
+            async with cls._get_rebuild_lock():
+                snapshot, version = await cls._read(redis)
+                if snapshot is not None:
+                    return snapshot
+                snapshot = await builder()
+                snapshot['version'] = version
+                snapshot['as_of'] = date.today().isoformat()
+                await redis.set(cls.snapshot_key(), json.dumps(snapshot, ensure_ascii=False), ex=cls.SNAPSHOT_TTL)
+                return snapshot
+        except Exception as e:
+            logger.warning(f'概览缓存读取失败，直接查询数据库: {e}')
+            return await builder()
+
+    @classmethod
+    async def invalidate(cls, redis: aioredis.Redis | None = None) -> None:
+        """
+        递增数据版本号使概览快照失效
+
+        :param redis: redis对象，为空时使用已绑定的连接
+        """
+        redis = redis or cls._redis
+        if redis is None:
+            return
+        try:
+            await redis.incr(cls.version_key())
+        except Exception as e:
+            logger.warning(f'概览缓存失效失败: {e}')
+
+    @classmethod
+    def on_tables_written(cls, tables: set[str]) -> None:
+        """
+        表写入事件回调：涉及概览数据源时异步触发失效
+        """
+        if cls._redis is None or not tables & DASHBOARD_SOURCE_TABLES:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(cls.invalidate())
+        cls._pending.add(task)
+        task.add_done_callback(cls._pending.discard)
+
+
+TableWriteEvents.subscribe(TenderDashboardCache.on_tables_written)
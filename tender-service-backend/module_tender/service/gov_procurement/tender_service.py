@@ -3,10 +3,11 @@ import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_tender.dao.tender_dao import TenderDao
+from module_tender.dao.tender_source_dao import TenderSourceDao
 from module_tender.entity.structured_entity.ccgp_gov_entity import CCGPGovEntity
 from module_tender.entity.vo.tender_vo import TenderModel
 from module_tender.service.gov_procurement.base import GovProcurement
-from module_tender.service.integration.structured_output import extract_structured_data
+from module_tender.service.integration.structured_output import extract_structured_data_chunked
 
 
 class TenderService(GovProcurement):
@@ -26,7 +27,7 @@ class TenderService(GovProcurement):
         semaphore = asyncio.Semaphore(10)
         db_lock = asyncio.Lock()
 
-        async def process_item(item: dict) -> TenderModel | None:
+        async def process_item(item: dict) -> tuple[TenderModel, dict] | None:
             async with semaphore:
                 url = item.get('project_url')
                 if not url:
@@ -78,7 +79,7 @@ class TenderService(GovProcurement):
                         discount_rate=parsed.get("discountRate"),
                         unit_price=parsed.get("unitPrice")
                     )
-                    return tender
+                    return tender, parsed
                 except Exception as e:
                     print(f"Error processing item {url}: {e}")
                     return None
@@ -87,10 +88,14 @@ class TenderService(GovProcurement):
         tenders = await asyncio.gather(*tasks)
 
         inserted = 0
-        for tender in tenders:
-            if tender:
+        for processed in tenders:
+            if processed:
+                tender, parsed = processed
                 try:
-                    await TenderDao.add_tender_dao(db, tender)
+                    db_tender = await TenderDao.add_tender_dao(db, tender)
+                    await TenderSourceDao.save_source_dao(
+                        db, db_tender.tender_id, parsed.get("preQualificationUrl"), parsed.get("sourceText")
+                    )
                     await db.commit()
                     inserted += 1
                 except Exception:
@@ -126,8 +131,7 @@ class TenderService(GovProcurement):
         使用 AI 提取招标公告关键信息
         """
         try:
-            result = await asyncio.to_thread(
-                extract_structured_data,
+            result = await extract_structured_data_chunked(
                 text=text,
                 response_model=CCGPGovEntity,
                 instruction="从下述公告中提取相关信息：",
@@ -151,6 +155,7 @@ class TenderService(GovProcurement):
         construction_unit = json_item.get('construction_unit')
         project_stage = json_item.get('project_type')
         release_time = json_item.get('release_time')
+        source_text = content_str
 
         # 使用 AI 提取补充字段
         content_str = cls._sanitize_text_for_ai(content_str)
@@ -182,5 +187,6 @@ class TenderService(GovProcurement):
             "bidAnnouncementUrl": html_url if project_stage == "中标公告" else "",
             "bid_date": release_time if project_stage == "中标公告" else "",
             "releaseTime": release_time,
-            "remark": remark_text
+            "remark": remark_text,
+            "sourceText": source_text,
         }
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from module_tender.service.integration.context_budget import ContextBudget
+from utils.log_util import logger
+
+
+class AiAnalysisScheduler:
+    """
+    AI 分析调度器：进程内所有 AI 分析请求共享同一并发上限与 token 预算（令牌桶），
+    同一招标项目且资质条件相同的并发分析请求合并为一次执行
+    """
+
+    # 同时运行的 AI 分析数上限
+    MAX_CONCURRENCY = 4
+    # 每分钟允许消耗的 token 预算
+    TOKENS_PER_MINUTE = 120000
+    # 单次分析的固定开销（提示词与输出），按 token 估算
+    BASE_TOKENS_PER_ANALYSIS = 3000
+    # 一次分析包含的 LLM 调用次数（核心分析 + 策略建议）
+    LLM_CALLS_PER_ANALYSIS = 2
+
+    _semaphore: asyncio.Semaphore | None = None
+    _budget_lock: asyncio.Lock | None = None
+    _tokens: float = float(TOKENS_PER_MINUTE)
+    _last_refill: float = 0.0
+    _inflight: dict[tuple[int, tuple[str, ...]], asyncio.Task] = {}
+    _waiters: dict[tuple[int, tuple[str, ...]], int] = {}
+    _started: set[tuple[int, tuple[str, ...]]] = set()
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(cls.MAX_CONCURRENCY)
+        return cls._semaphore
+
+    @classmethod
+    def _get_budget_lock(cls) -> asyncio.Lock:
+        if cls._budget_lock is None:
+            cls._budget_lock = asyncio.Lock()
+        return cls._budget_lock
+
+    @classmethod
+    def estimate_tokens(cls, tender_data: dict, source_text: str) -> int:
+        """
+        估算一次分析的 token 消耗，单次调用输入受 ContextBudget 预算约束
+
+        :param tender_data: 招标信息字典
+        :param source_text: 公告原文
+        :return: 估算 token 数
+        """
+        context_tokens = ContextBudget.estimate_tokens(' '.join(str(v) for v in tender_data.values() if v))
+        input_tokens = min(
+            context_tokens + ContextBudget.estimate_tokens(source_text), ContextBudget.SINGLE_CALL_TOKENS
+        )
+        return cls.BASE_TOKENS_PER_ANALYSIS + input_tokens * cls.LLM_CALLS_PER_ANALYSIS
+
+    @classmethod
+    async def _consume_tokens(cls, tokens: int) -> None:
+        """
+        从令牌桶中扣除 token，预算不足时等待补充
+        """
+        tokens = min(tokens, cls.TOKENS_PER_MINUTE)
+        refill_rate = cls.TOKENS_PER_MINUTE / 60
+        async with cls._get_budget_lock():
+            while True:
+                now = time.monotonic()
+                if cls._last_refill:
+                    cls._tokens = min(
+                        float(cls.TOKENS_PER_MINUTE), cls._tokens + (now - cls._last_refill) * refill_rate
+                    )
+                cls._last_refill = now
+                if cls._tokens >= tokens:
+                    cls._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - cls._tokens) / refill_rate)
+
+    @classmethod
+    @asynccontextmanager
+    async def slot(cls, estimated_tokens: int) -> AsyncIterator[None]:
+        """
+        获取一个分析执行槽位：先占用并发名额，再扣除 token 预算
+
+        :param estimated_tokens: 本次分析估算 token 数
+        """
+        async with cls._get_semaphore():
+            await cls._consume_tokens(estimated_tokens)
+            yield
+
+    @classmethod
+    async def run(
+        cls,
+        tender_id: int,
+        estimated_tokens: int,
+        factory: Callable[[], Awaitable[Any]],
+        qualifications: list[str] | None = None,
+    ) -> Any:
+        """
+        在共享并发与 token 预算下执行分析；同一项目以相同资质条件已在执行时直接等待其结果。
+        调用方取消时，尚未开始的分析随之取消，已开始的分析继续执行以便结果落库。
+
+        :param tender_id: 招标信息id
+        :param estimated_tokens: 本次分析估算 token 数
+        :param factory: 生成分析协程的工厂函数
+        :param qualifications: 本次分析使用的企业资质列表，资质不同的分析不合并
+        :return: 分析结果
+        """
+        key = (tender_id, tuple(sorted(qualifications or ())))
+        task = cls._inflight.get(key)
+        if task is None or task.done():
+
+            async def runner() -> Any:
+                async with cls.slot(estimated_tokens):
+                    cls._started.add(key)
+                    try:
+                        return await factory()
+                    finally:
+                        cls._started.discard(key)
+
+            task = asyncio.create_task(runner())
+            cls._inflight[key] = task
+            task.add_done_callback(lambda t: cls._release(key, t))
+        else:
+            logger.info(f'AI 分析合并执行: tender_id={tender_id}')
+
+        cls._waiters[key] = cls._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            remaining = cls._waiters.get(key, 1) - 1
+            if remaining > 0:
+                cls._waiters[key] = remaining
+            else:
+                cls._waiters.pop(key, None)
+                # 无人等待且尚未开始执行的分析直接取消，避免浪费并发名额与 token 预算
+                if not task.done() and key not in cls._started:
+                    task.cancel()
+
+    @classmethod
+    def _release(cls, key: tuple[int, tuple[str, ...]], task: asyncio.Task) -> None:
+        if cls._inflight.get(key) is task:
+            cls._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f'AI 分析执行失败: tender_id={key[0]}, {task.exception()}')
@@ -0,0 +1,278 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Type, get_args
+
+from pydantic import BaseModel
+
+# 招标文件中通常承载关键信息、但字段描述里未必出现的章节关键词
+TENDER_SECTION_KEYWORDS = (
+    '资格要求',
+    '资质要求',
+    '投标人资格',
+    '项目经理',
+    '业绩要求',
+    '评标办法',
+    '评分标准',
+    '招标控制价',
+    '最高投标限价',
+    '计划工期',
+    '招标范围',
+    '建设规模',
+    '付款方式',
+    '投标保证金',
+    '中标候选人',
+    '下浮率',
+)
+
+_CJK_PATTERN = re.compile(r'[一-鿿]')
+_WORD_PATTERN = re.compile(r'[A-Za-z0-9]+')
+_CJK_RUN_PATTERN = re.compile(r'[一-鿿]+')
+_SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[。；;！!？?])')
+
+
+class ContextBudget:
+    """
+    大模型上下文预算工具：按 token 估算切块，并按与目标结构字段的相关性排序
+    """
+
+    # 单个分块的目标 token 数
+    CHUNK_TOKENS = 2500
+    # 单次调用允许的最大输入 token 数，未超出时不切块
+    SINGLE_CALL_TOKENS = 6000
+    # map 阶段最多并行抽取的分块数
+    TOP_K = 4
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        估算文本 token 数：中文约 1 字 1 token，其余字符约 4 字符 1 token
+
+        :param text: 文本
+        :return: 估算 token 数
+        """
+        if not text:
+            return 0
+        cjk = len(_CJK_PATTERN.findall(text))
+        return cjk + math.ceil((len(text) - cjk) / 4)
+
+    @classmethod
+    def _split_long_line(cls, line: str, max_tokens: int) -> list[str]:
+        """
+        将超出分块预算的单行按句切分，仍超长时按字符硬切
+        """
+        pieces: list[str] = []
+        buffer = ''
+        for sentence in _SENTENCE_SPLIT_PATTERN.split(line):
+            if not sentence:
+                continue
+            if cls.estimate_tokens(buffer + sentence) <= max_tokens:
+                buffer += sentence
+                continue
+            if buffer:
+                pieces.append(buffer)
+            while cls.estimate_tokens(sentence) > max_tokens:
+                pieces.append(sentence[:max_tokens])
+                sentence = sentence[max_tokens:]
+            buffer = sentence
+        if buffer:
+            pieces.append(buffer)
+        return pieces
+
+    @classmethod
+    def split_chunks(cls, text: str, max_tokens: int | None = None) -> list[str]:
+        """
+        按行累积切分文本，保证每个分块不超过 token 预算且不截断段落
+
+        :param text: 待切分文本
+        :param max_tokens: 单个分块 token 上限
+        :return: 分块列表（保持原文顺序）
+        """
+        max_tokens = max_tokens or cls.CHUNK_TOKENS
+        chunks: list[str] = []
+        lines: list[str] = []
+        used = 0
+        for raw_line in (text or '').splitlines():
+            line = raw_line.strip()
+            if not line:
+                continue
+            for piece in cls._split_long_line(line, max_tokens):
+                cost = cls.estimate_tokens(piece) + 1
+                if lines and used + cost > max_tokens:
+                    chunks.append('\n'.join(lines))
+                    lines, used = [], 0
+                lines.append(piece)
+                used += cost
+        if lines:
+            chunks.append('\n'.join(lines))
+        return chunks
+
+    @staticmethod
+    def _terms(text: str) -> list[str]:
+        """
+        将文本切分为检索词：中文取相邻二元组，英文数字取整词
+        """
+        terms = [w.lower() for w in _WORD_PATTERN.findall(text or '')]
+        for run in _CJK_RUN_PATTERN.findall(text or ''):
+            terms.extend(run[i : i + 2] for i in range(len(run) - 1))
+        return terms
+
+    @classmethod
+    def _schema_text(cls, response_model: Type[BaseModel], seen: set[type] | None = None) -> list[str]:
+        """
+        收集结构化模型（含嵌套模型）的字段标题与描述
+        """
+        seen = seen if seen is not None else set()
+        if response_model in seen:
+            return []
+        seen.add(response_model)
+        parts: list[str] = []
+        for field in response_model.model_fields.values():
+            parts.extend(p for p in (field.title, field.description) if p)
+            for arg in (field.annotation, *get_args(field.annotation)):
+                if isinstance(arg, type) and issubclass(arg, BaseModel):
+                    parts.extend(cls._schema_text(arg, seen))
+        return parts
+
+    @classmethod
+    def build_query_terms(cls, response_model: Type[BaseModel], instruction: str = '') -> Counter:
+        """
+        根据目标模型字段、提示词及章节关键词构建相关性检索词
+
+        :param response_model: 目标 Pydantic 模型类
+        :param instruction: 提取指令
+        :return: 检索词及其权重
+        """
+        query = Counter(cls._terms('\n'.join(cls._schema_text(response_model))))
+        query.update(cls._terms(instruction))
+        query.update(cls._terms('\n'.join(TENDER_SECTION_KEYWORDS)))
+        return query
+
+    @classmethod
+    def rank_chunks(cls, chunks: list[str], query_terms: Counter) -> list[int]:
+        """
+        使用 BM25 对分块按相关性排序
+
+        :param chunks: 分块列表
+        :param query_terms: 检索词及其权重
+        :return: 按相关性降序的分块下标
+        """
+        if not chunks:
+            return []
+        k1, b = 1.2, 0.75
+        chunk_terms = [Counter(cls._terms(chunk)) for chunk in chunks]
+        lengths = [sum(c.values()) or 1 for c in chunk_terms]
+        avg_len = sum(lengths) / len(lengths)
+        doc_freq = Counter(term for c in chunk_terms for term in c)
+        total = len(chunks)
+
+        def score(index: int) -> float:
+            tf_map = chunk_terms[index]
+            value = 0.0
+            for term, weight in query_terms.items():
+                tf = tf_map.get(term)
+                if not tf:
+                    continue
+                idf = math.log((total - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5) + 1)
+                value += weight * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[index] / avg_len))
+            return value
+
+        return sorted(range(total), key=lambda i: (-score(i), i))
+
+    @classmethod
+    def select_chunks(
+        cls,
+        text: str,
+        response_model: Type[BaseModel],
+        instruction: str = '',
+        *,
+        top_k: int | None = None,
+        chunk_tokens: int | None = None,
+    ) -> list[str]:
+        """
+        切块并选出与目标结构最相关的若干分块，文档首块（项目概况）始终保留
+
+        :return: 选中的分块，按相关性降序
+        """
+        chunks = cls.split_chunks(text, chunk_tokens)
+        if len(chunks) <= 1:
+            return chunks
+        top_k = top_k or cls.TOP_K
+        ranked = cls.rank_chunks(chunks, cls.build_query_terms(response_model, instruction))
+        selected = [0, *[i for i in ranked if i != 0]][:top_k]
+        return [chunks[i] for i in sorted(selected, key=ranked.index)]
+
+    @classmethod
+    def pack(
+        cls,
+        text: str,
+        response_model: Type[BaseModel],
+        instruction: str = '',
+        *,
+        max_tokens: int | None = None,
+        chunk_tokens: int | None = None,
+    ) -> str:
+        """
+        在 token 预算内拼装最相关的分块，供需要整体理解全文的单次调用使用
+
+        :param text: 原文
+        :param response_model: 目标 Pydantic 模型类
+        :param instruction: 提取指令
+        :param max_tokens: 输入 token 预算
+        :param chunk_tokens: 单个分块 token 上限
+        :return: 按原文顺序拼接的文本
+        """
+        max_tokens = max_tokens or cls.SINGLE_CALL_TOKENS
+        if cls.estimate_tokens(text) <= max_tokens:
+            return text or ''
+        chunks = cls.split_chunks(text, chunk_tokens)
+        ranked = cls.rank_chunks(chunks, cls.build_query_terms(response_model, instruction))
+        chosen: list[int] = []
+        used = 0
+        for index in [0, *[i for i in ranked if i != 0]]:
+            cost = cls.estimate_tokens(chunks[index])
+            if used + cost > max_tokens:
+                continue
+            chosen.append(index)
+            used += cost
+        return '\n...\n'.join(chunks[i] for i in sorted(chosen))
+
+    @staticmethod
+    def _is_empty(value: Any) -> bool:
+        if value is None:
+            return True
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, (int, float)):
+            return value == 0
+        if isinstance(value, str):
+            return not value.strip()
+        if isinstance(value, (list, dict)):
+            return len(value) == 0
+        return False
+
+    @classmethod
+    def merge_results(cls, results: list[BaseModel], response_model: Type[BaseModel]) -> BaseModel | None:
+        """
+        合并多个分块的抽取结果：标量字段取相关性最高的非空值，列表字段按序去重合并
+
+        :param results: 按分块相关性降序排列的抽取结果
+        :param response_model: 目标 Pydantic 模型类
+        :return: 合并后的模型实例
+        """
+        dumps = [r.model_dump() for r in results if r is not None]
+        if not dumps:
+            return None
+        merged: dict[str, Any] = {}
+        for name in response_model.model_fields:
+            values = [d.get(name) for d in dumps]
+            if any(isinstance(v, list) for v in values):
+                combined: list = []
+                for value in values:
+                    for item in value or []:
+                        if item not in combined:
+                            combined.append(item)
+                merged[name] = combined
+                continue
+            merged[name] = next((v for v in values if not cls._is_empty(v)), values[0])
+        return response_model.model_validate(merged)
@@ -0,0 +1,296 @@
+import re
+import statistics
+from collections import Counter
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from module_tender.dao.tender_dao import TenderDao
+from module_tender.entity.vo.tender_vo import CompetitorModel, PriceDistributionItemModel, PriceStatsModel
+
+_NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+_SCALE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(万)?\s*(平方米|平米|㎡|m2|m²|公里|km|千米|延米|米)', re.IGNORECASE)
+_SCALE_UNITS = {
+    '平方米': 'area',
+    '平米': 'area',
+    '㎡': 'area',
+    'm2': 'area',
+    'm²': 'area',
+    '公里': 'length_km',
+    'km': 'length_km',
+    '千米': 'length_km',
+    '延米': 'length_m',
+    '米': 'length_m',
+}
+# 下浮率分布区间（%），上界为空表示不设上限
+DISCOUNT_BUCKETS = ((0, 3), (3, 6), (6, 9), (9, 12), (12, 15), (15, None))
+
+
+class CompetitorStatModel(BaseModel):
+    """
+    同类项目中标候选人统计
+    """
+
+    name: str = Field(description='单位名称')
+    appearances: int = Field(description='入围次数（中标候选人前三）')
+    wins: int = Field(description='第一中标候选人次数')
+
+
+class SimilarProjectStatsModel(BaseModel):
+    """
+    同类项目历史统计
+    """
+
+    scope: str = Field(default='', description='匹配条件说明')
+    sample_size: int = Field(default=0, description='同类项目样本数')
+    competitors: list[CompetitorStatModel] = Field(default_factory=list, description='高频竞争对手')
+    discount_sample_size: int = Field(default=0, description='有效下浮率样本数')
+    avg_discount: float | None = Field(default=None, description='平均下浮率（%）')
+    median_discount: float | None = Field(default=None, description='下浮率中位数（%）')
+    min_discount: float | None = Field(default=None, description='最小下浮率（%）')
+    max_discount: float | None = Field(default=None, description='最大下浮率（%）')
+    distribution: list[PriceDistributionItemModel] = Field(default_factory=list, description='下浮率区间分布')
+    avg_unit_price: float | None = Field(default=None, description='平均单方造价')
+
+
+class SimilarProjectRetriever:
+    """
+    同类项目检索：按项目类型、区县、招标控制价区间在索引上检索已出中标结果的项目，
+    再按建设规模与价格接近程度排序，预先计算竞争对手频次与下浮率分布
+    """
+
+    # 样本不足该数量时逐级放宽匹配条件
+    MIN_SAMPLE = 8
+    # 每级检索的候选记录上限
+    CANDIDATE_LIMIT = 200
+    # 参与统计的最相似项目数
+    TOP_N = 50
+    # 招标控制价区间（相对目标项目的倍数）
+    PRICE_BAND = (0.5, 2.0)
+    # 输出的竞争对手数
+    TOP_COMPETITORS = 5
+    # 下浮率有效上限（%）
+    MAX_DISCOUNT_RATE = 100
+    # 竞争对手威胁等级：第一中标候选人次数达到该值，或入围次数达到该值且至少一次第一，视为高威胁
+    HIGH_THREAT_WINS = 2
+    HIGH_THREAT_APPEARANCES = 3
+    # 入围次数达到该值或至少一次第一，视为中威胁
+    MEDIUM_THREAT_APPEARANCES = 2
+
+    @staticmethod
+    def _to_float(value: object) -> float | None:
+        if value is None or value == '':
+            return None
+        if isinstance(value, (int, float, Decimal)):
+            return float(value)
+        match = _NUMBER_PATTERN.search(str(value))
+        return float(match.group()) if match else None
+
+    @classmethod
+    def parse_discount_rate(
+        cls, discount_rate: object, bid_price: object = None, control_price: object = None
+    ) -> float | None:
+        """
+        解析中标下浮率（%），缺失时按中标价与招标控制价推算
+
+        :param discount_rate: 下浮率原始值，如 '5.2%'
+        :param bid_price: 中标价（万元）
+        :param control_price: 招标控制价（万元）
+        :return: 下浮率（%），无法解析时返回None
+        """
+        rate = cls._to_float(discount_rate)
+        if rate is None:
+            bid = cls._to_float(bid_price)
+            control = cls._to_float(control_price)
+            if bid and control and 0 < bid <= control:
+                rate = (1 - bid / control) * 100
+        if rate is None or not 0 <= rate < cls.MAX_DISCOUNT_RATE:
+            return None
+        return round(rate, 2)
+
+    @staticmethod
+    def parse_scale(text: str | None) -> tuple[float, str] | None:
+        """
+        从建设规模描述中解析首个带单位的数值，如 '建筑面积约1.2万平方米' -> (12000.0, 'area')
+
+        :param text: 建设规模描述
+        :return: (数值, 量纲)，无法解析时返回None
+        """
+        match = _SCALE_PATTERN.search(text or '')
+        if not match:
+            return None
+        value = float(match.group(1)) * (10000 if match.group(2) else 1)
+        return value, _SCALE_UNITS[match.group(3).lower()]
+
+    @staticmethod
+    def _ratio(a: float | None, b: float | None) -> float:
+        if not a or not b or a <= 0 or b <= 0:
+            return 0.0
+        return min(a, b) / max(a, b)
+
+    @classmethod
+    def _similarity(
+        cls, row: Row, district: str | None, control_price: float | None, scale: tuple[float, str] | None
+    ) -> float:
+        """
+        计算候选项目与目标项目的相似度：同区县、价格接近、规模接近依次加权
+        """
+        score = 2.0 if district and row.district == district else 0.0
+        score += 2.0 * cls._ratio(control_price, cls._to_float(row.bid_control_price))
+        row_scale = cls.parse_scale(row.construction_scale)
+        if scale and row_scale and scale[1] == row_scale[1]:
+            score += cls._ratio(scale[0], row_scale[0])
+        return score
+
+    @classmethod
+    async def retrieve(cls, db: AsyncSession, tender_data: dict) -> SimilarProjectStatsModel:
+        """
+        检索同类项目并计算统计结果
+
+        :param db: orm对象
+        :param tender_data: 目标招标信息字典
+        :return: 同类项目统计
+        """
+        project_type = tender_data.get('project_type')
+        if not project_type:
+            return SimilarProjectStatsModel()
+        district = tender_data.get('district') or None
+        control_price = cls._to_float(tender_data.get('bid_control_price'))
+        price_range = (control_price * cls.PRICE_BAND[0], control_price * cls.PRICE_BAND[1]) if control_price else None
+
+        tiers = [
+            (district, price_range, f'{project_type}/{district or "不限区县"}/控制价相近'),
+            (None, price_range, f'{project_type}/控制价相近'),
+            (None, None, f'{project_type}'),
+        ]
+        rows: dict[int, object] = {}
+        scope = ''
+        seen_tiers: set[tuple] = set()
+        for tier_district, tier_price, tier_scope in tiers:
+            if (tier_district, tier_price) in seen_tiers:
+                continue
+            seen_tiers.add((tier_district, tier_price))
+            for row in await TenderDao.get_similar_awarded_tenders(
+                db,
+                project_type,
+                district=tier_district,
+                price_range=tier_price,
+                exclude_tender_id=tender_data.get('tender_id'),
+                limit=cls.CANDIDATE_LIMIT,
+            ):
+                rows.setdefault(row.tender_id, row)
+            scope = tier_scope
+            if len(rows) >= cls.MIN_SAMPLE:
+                break
+
+        scale = cls.parse_scale(tender_data.get('construction_scale'))
+        ranked = sorted(rows.values(), key=lambda r: -cls._similarity(r, district, control_price, scale))
+        return cls.summarize(ranked[: cls.TOP_N], scope)
+
+    @classmethod
+    def summarize(cls, rows: list, scope: str = '') -> SimilarProjectStatsModel:
+        """
+        根据同类项目记录计算竞争对手频次与下浮率分布
+
+        :param rows: 同类项目记录
+        :param scope: 匹配条件说明
+        :return: 同类项目统计
+        """
+        appearances: Counter = Counter()
+        wins: Counter = Counter()
+        for row in rows:
+            names = {(name or '').strip() for name in (row.winner_rank_1, row.winner_rank_2, row.winner_rank_3)}
+            appearances.update(name for name in names if name)
+            winner = (row.winner_rank_1 or '').strip()
+            if winner:
+                wins[winner] += 1
+        competitors = [
+            CompetitorStatModel(name=name, appearances=count, wins=wins.get(name, 0))
+            for name, count in sorted(appearances.items(), key=lambda item: (-wins.get(item[0], 0), -item[1], item[0]))
+        ][: cls.TOP_COMPETITORS]
+
+        rates = [
+            rate
+            for rate in (cls.parse_discount_rate(r.discount_rate, r.bid_price, r.bid_control_price) for r in rows)
+            if rate is not None
+        ]
+        distribution = []
+        for low, high in DISCOUNT_BUCKETS:
+            label = f'{low}%-{high}%' if high is not None else f'≥{low}%'
+            count = sum(1 for rate in rates if rate >= low and (high is None or rate < high))
+            distribution.append(PriceDistributionItemModel(range=label, count=count))
+        unit_prices = [p for p in (cls._to_float(r.unit_price) for r in rows) if p]
+
+        return SimilarProjectStatsModel(
+            scope=scope,
+            sample_size=len(rows),
+            competitors=competitors,
+            discount_sample_size=len(rates),
+            avg_discount=round(statistics.fmean(rates), 2) if rates else None,
+            median_discount=round(statistics.median(rates), 2) if rates else None,
+            min_discount=min(rates) if rates else None,
+            max_discount=max(rates) if rates else None,
+            distribution=distribution if rates else [],
+            avg_unit_price=round(statistics.fmean(unit_prices), 2) if unit_prices else None,
+        )
+
+    @classmethod
+    def _threat_level(cls, stat: CompetitorStatModel) -> str:
+        if stat.wins >= cls.HIGH_THREAT_WINS or (stat.appearances >= cls.HIGH_THREAT_APPEARANCES and stat.wins >= 1):
+            return 'High'
+        if stat.wins >= 1 or stat.appearances >= cls.MEDIUM_THREAT_APPEARANCES:
+            return 'Medium'
+        return 'Low'
+
+    @classmethod
+    def to_competitors(cls, stats: SimilarProjectStatsModel) -> list[CompetitorModel]:
+        """
+        将统计结果转换为竞争对手分析结果
+        """
+        return [
+            CompetitorModel(
+                name=stat.name,
+                reason=f'近{stats.sample_size}个同类项目中入围{stat.appearances}次，第一中标候选人{stat.wins}次',
+                win_rate=round(stat.wins / stat.appearances * 100, 1),
+                threat_level=cls._threat_level(stat),
+            )
+            for stat in stats.competitors
+        ]
+
+    @staticmethod
+    def to_price_stats(stats: SimilarProjectStatsModel) -> PriceStatsModel:
+        """
+        将统计结果转换为报价分布分析结果
+        """
+        if not stats.discount_sample_size:
+            return PriceStatsModel(avg_discount='0%', max_discount='0%', distribution=[])
+        return PriceStatsModel(
+            avg_discount=f'{stats.avg_discount}%',
+            max_discount=f'{stats.max_discount}%',
+            distribution=stats.distribution,
+        )
+
+    @staticmethod
+    def to_prompt(stats: SimilarProjectStatsModel) -> str:
+        """
+        生成供大模型参考的同类项目统计摘要
+        """
+        if not stats.sample_size:
+            return '【同类项目历史数据】暂无可参考的同类项目中标记录。'
+        lines = [f'【同类项目历史数据】匹配条件：{stats.scope}；样本数：{stats.sample_size}']
+        if stats.competitors:
+            lines.append(
+                '高频竞争对手：'
+                + '；'.join(f'{c.name}（入围{c.appearances}次，第一{c.wins}次）' for c in stats.competitors)
+            )
+        if stats.discount_sample_size:
+            lines.append(
+                f'中标下浮率（{stats.discount_sample_size}个样本）：平均{stats.avg_discount}%，'
+                f'中位数{stats.median_discount}%，区间{stats.min_discount}%~{stats.max_discount}%'
+            )
+            lines.append('下浮率分布：' + '，'.join(f'{d.range}:{d.count}' for d in stats.distribution if d.count))
+        if stats.avg_unit_price:
+            lines.append(f'平均单方造价：{stats.avg_unit_price}')
+        return '\n'.join(lines)
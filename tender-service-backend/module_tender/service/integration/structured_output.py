@@ -1,3 +1,4 @@
+import asyncio
 import os
 from time import sleep
 from typing import Any, Type, TypeVar
@@ -6,6 +7,7 @@ from pydantic import BaseModel
 
 from exceptions.exception import ServiceException
 from llms.deepseek import DeepSeekModel
+from module_tender.service.integration.context_budget import ContextBudget
 from utils.log_util import logger
 
 T = TypeVar("T", bound=BaseModel)
@@ -68,3 +70,77 @@ def extract_structured_data(
     return None
 
 
+async def extract_structured_data_chunked(
+    text: str,
+    response_model: Type[T],
+    instruction: str = "从下述文本中提取相关信息：",
+    default_factory: Type[T] | None = None,
+    *,
+    max_retries: int = 2,
+    retry_delay: float = 0.5,
+    single_call_tokens: int | None = None,
+    chunk_tokens: int | None = None,
+    top_k: int | None = None,
+    concurrency: int = 4,
+) -> T | None:
+    """
+    长文本分块结构化提取（map-reduce）
+
+    文本未超出单次调用预算时等价于 extract_structured_data；超出时按 token 切块，
+    依据目标模型字段相关性选取前 top_k 个分块并行提取，再按相关性合并结果。
+
+    :param text: 待提取的源文本
+    :param response_model: 目标 Pydantic 模型类
+    :param instruction: 提取指令/提示词前缀
+    :param default_factory: 全部分块失败时返回的默认对象工厂（可选）
+    :param max_retries: 单个分块最大重试次数
+    :param retry_delay: 重试延迟
+    :param single_call_tokens: 单次调用 token 预算
+    :param chunk_tokens: 单个分块 token 上限
+    :param top_k: 参与提取的分块数
+    :param concurrency: 分块并行提取的最大并发数
+    :return: 合并后的模型实例或 None/默认值
+    """
+    safe_text = text or ""
+    budget = single_call_tokens or ContextBudget.SINGLE_CALL_TOKENS
+    if ContextBudget.estimate_tokens(safe_text) <= budget:
+        return await asyncio.to_thread(
+            extract_structured_data,
+            safe_text,
+            response_model,
+            instruction,
+            default_factory,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            max_chars=len(safe_text),
+        )
+
+    chunks = ContextBudget.select_chunks(
+        safe_text, response_model, instruction, top_k=top_k, chunk_tokens=chunk_tokens
+    )
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def extract_chunk(chunk: str) -> T | None:
+        async with semaphore:
+            return await asyncio.to_thread(
+                extract_structured_data,
+                chunk,
+                response_model,
+                instruction,
+                None,
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                max_chars=len(chunk),
+            )
+
+    results = await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks))
+    logger.info(
+        f"分块结构化提取 ({response_model.__name__}): {len(chunks)} 块, "
+        f"成功 {sum(r is not None for r in results)} 块"
+    )
+    merged = ContextBudget.merge_results([r for r in results if r is not None], response_model)
+    if merged is not None:
+        return merged
+    if default_factory:
+        return default_factory()
+    return None
@@ -1,15 +1,16 @@
-import asyncio
 import re
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_tender.dao.tender_dao import TenderDao
+from module_tender.dao.tender_source_dao import TenderSourceDao
 from module_tender.entity.structured_entity.tender_notice_fetcher import (
     TenderNoticeFetcher as TenderNoticeEntity,
 )
 from module_tender.entity.vo.tender_vo import TenderModel
-from module_tender.service.integration.structured_output import extract_structured_data
+from module_tender.service.integration.structured_output import extract_structured_data_chunked
 from module_tender.service.public_resources.base import PublicResourcesBase
+from utils.html_util import HtmlUtil
 
 
 class TenderNoticeFetcher(PublicResourcesBase):
@@ -60,7 +61,10 @@ class TenderNoticeFetcher(PublicResourcesBase):
                 remark=parsed.get("remark")
             )
             try:
-                await TenderDao.add_tender_dao(db, tender)
+                db_tender = await TenderDao.add_tender_dao(db, tender)
+                await TenderSourceDao.save_source_dao(
+                    db, db_tender.tender_id, parsed.get("preQualificationUrl"), parsed.get("sourceText")
+                )
                 await db.commit()
                 inserted += 1
             except Exception:
@@ -192,8 +196,7 @@ class TenderNoticeFetcher(PublicResourcesBase):
         使用 AI 提取招标公告关键信息
         """
         try:
-            result = await asyncio.to_thread(
-                extract_structured_data,
+            result = await extract_structured_data_chunked(
                 text=text,
                 response_model=TenderNoticeEntity,
                 instruction="从下述公告中提取相关信息：",
@@ -218,6 +221,7 @@ class TenderNoticeFetcher(PublicResourcesBase):
         tender_scope = cls._extract_tender_scope(content_str)
         construction_scale = cls._extract_construction_scale(content_str)
         html_url = cls._abs_url(json_item.get("link"))
+        source_text = HtmlUtil.clean_tags_preserve_structure(content_str)
 
         # 使用 AI 提取补充字段
         content_str = cls._sanitize_text_for_ai(content_str)
@@ -239,5 +243,6 @@ class TenderNoticeFetcher(PublicResourcesBase):
             "tenderScope": ai_result.tenderScope or tender_scope,
             "announcementWebsite": "公共资源",
             "preQualificationUrl": html_url,
-            "remark": remark_text
+            "remark": remark_text,
+            "sourceText": source_text,
         }
@@ -1,13 +1,14 @@
-import asyncio
 import re
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_tender.dao.tender_dao import TenderDao
+from module_tender.dao.tender_source_dao import TenderSourceDao
 from module_tender.entity.structured_entity.tender_plan_entity import TenderPlanEntity
 from module_tender.entity.vo.tender_vo import TenderModel
-from module_tender.service.integration.structured_output import extract_structured_data
+from module_tender.service.integration.structured_output import extract_structured_data_chunked
 from module_tender.service.public_resources.base import PublicResourcesBase
+from utils.html_util import HtmlUtil
 
 
 class TenderPlanFetcher(PublicResourcesBase):
@@ -65,7 +66,10 @@ class TenderPlanFetcher(PublicResourcesBase):
                 remark=parsed.get("remark"),
             )
             try:
-                await TenderDao.add_tender_dao(db, tender)
+                db_tender = await TenderDao.add_tender_dao(db, tender)
+                await TenderSourceDao.save_source_dao(
+                    db, db_tender.tender_id, parsed.get("preQualificationUrl"), parsed.get("sourceText")
+                )
                 await db.commit()
                 inserted += 1
             except Exception:
@@ -158,8 +162,7 @@ class TenderPlanFetcher(PublicResourcesBase):
         使用 AI 提取招标公告关键信息
         """
         try:
-            result = await asyncio.to_thread(
-                extract_structured_data,
+            result = await extract_structured_data_chunked(
                 text=text,
                 response_model=TenderPlanEntity,
                 instruction="从下述公告中提取相关信息：",
@@ -203,4 +206,5 @@ class TenderPlanFetcher(PublicResourcesBase):
             "preQualificationUrl": html_url,
             "expectedAnnouncementDate": expected_announcement_date,
             "remark": remark_text,
+            "sourceText": HtmlUtil.clean_tags_preserve_structure(content_str),
         }
@@ -1,11 +1,10 @@
-import asyncio
-
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_tender.dao.tender_dao import TenderDao
+from module_tender.dao.tender_source_dao import TenderSourceDao
 from module_tender.entity.structured_entity.win_candidate_entity import WinCandidateEntity
 from module_tender.entity.vo.tender_vo import TenderModel
-from module_tender.service.integration.structured_output import extract_structured_data
+from module_tender.service.integration.structured_output import extract_structured_data_chunked
 from module_tender.service.public_resources.base import PublicResourcesBase
 from utils.html_util import HtmlUtil
 from utils.pdf_util import PdfUtil
@@ -83,7 +82,10 @@ class WinCandidateFetcher(PublicResourcesBase):
                 remark=parsed.get("remark"),
             )
             try:
-                await TenderDao.add_tender_dao(db, tender)
+                db_tender = await TenderDao.add_tender_dao(db, tender)
+                await TenderSourceDao.save_source_dao(
+                    db, db_tender.tender_id, parsed.get("bidAnnouncementUrl"), parsed.get("sourceText")
+                )
                 await db.commit()
                 inserted += 1
             except Exception:
@@ -94,8 +96,7 @@ class WinCandidateFetcher(PublicResourcesBase):
     @classmethod
     async def _extract_ai_data(cls, text: str) -> tuple[WinCandidateEntity, bool]:
         try:
-            result = await asyncio.to_thread(
-                extract_structured_data,
+            result = await extract_structured_data_chunked(
                 text=text,
                 response_model=WinCandidateEntity,
                 instruction="从下述公告和中标详情中请仅返回结构化字段，不要输出或处理任何联系方式、邮箱、电话等信息。",
@@ -126,6 +127,7 @@ class WinCandidateFetcher(PublicResourcesBase):
 
         # 使用 AI 提取补充字段
         ai_source = "中标候选人公告内容："+ content_str + "中标候选人详细内容："+ (("\n" + txt) if txt else "")
+        source_text = HtmlUtil.clean_tags_preserve_structure(ai_source)
         ai_source = cls._sanitize_text_for_ai(ai_source)
         ai_result, used_default = await cls._extract_ai_data(ai_source)
         remark_text = f"数据提取失败请手动打开浏览器查看：{html_url}" if used_default else None
@@ -151,4 +153,5 @@ class WinCandidateFetcher(PublicResourcesBase):
             "bidAnnouncementUrl": cls._abs_url(json_item.get("link")),
             "evaluationReport1": evaluation_report_1,
             "remark": remark_text,
+            "sourceText": source_text,
         }
@@ -1,7 +1,9 @@
-from collections.abc import AsyncIterable
-from datetime import datetime, timedelta
+from collections.abc import AsyncGenerator, AsyncIterable, Callable, Sequence
+from datetime import date, datetime, timedelta
+from typing import Any, Literal
 import json
 import asyncio
+from fastapi import Request
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,26 +11,74 @@ from config.database import AsyncSessionLocal
 from common.vo import PageModel
 from exceptions.exception import ServiceException
 from module_admin.entity.do.job_do import SysJobLog
+from module_admin.entity.vo.common_vo import ExportJobModel
+from module_admin.service.export_job_service import ExportJobProgress, ExportJobService
 from module_tender.dao.tender_dao import TenderDao
 from module_tender.dao.tender_ai_dao import TenderAiDao
+from module_tender.dao.tender_source_dao import TenderSourceDao
+from module_tender.dao.tender_stats_dao import TenderStatsDao
 from module_tender.entity.do.tender_do import BizTenderInfo
 from module_tender.entity.vo.tender_vo import (
     AiTenderAnalysisModel,
     AiAnalysisHistoryItemModel,
     DeleteTenderModel,
+    DistrictPriceStatModel,
     DistrictStatModel,
     StageStatModel,
     TenderDashboardModel,
     TenderModel,
     TenderPageQueryModel,
+    TenderQueryModel,
+    TenderTrendBucketModel,
+    TenderTrendQueryModel,
     TrendStatModel,
 )
+from module_tender.service.dashboard_cache import TenderDashboardCache
+from module_tender.service.integration.ai_scheduler import AiAnalysisScheduler
+from module_tender.service.integration.similar_projects import SimilarProjectRetriever, SimilarProjectStatsModel
 from module_tender.service.orchestrator.public_resources_service import PublicResourcesService
 from module_tender.agent.agent import tender_agent
 from utils.common_util import SqlalchemyUtil
 from utils.log_util import logger
 from utils.excel_util import ExcelUtil
 
+# 招标信息导出字段与表头
+TENDER_EXPORT_MAPPING = {
+    'project_code': '项目编号',
+    'project_name': '项目名称',
+    'district': '所在区县',
+    'construction_unit': '建设单位',
+    'project_stage': '所处阶段',
+    'project_type': '项目类型',
+    'bid_control_price': '招标控制价（万元）',
+    'bid_price': '中标价（万元）',
+    'construction_scale': '建设面积（㎡）',
+    'construction_content': '施工内容',
+    'duration': '工期',
+    'registration_deadline': '报名截止时间',
+    'agency': '代理机构',
+    'create_time': '采集时间',
+    'announcement_website': '公告网站',
+    'pre_qualification_url': '预审公告收集网址',
+    'winner_rank_1': '中标排名1',
+    'winner_rank_2': '中标排名2',
+    'winner_rank_3': '中标排名3',
+    'discount_rate': '中标下浮率',
+    'unit_price': '单方造价',
+    'evaluation_report_1': '评标报告',
+    'bid_date': '中标日期',
+    'bid_announcement_url': '中标公告网址',
+    'remark': '备注',
+}
+# 流式导出每批次读取的记录数
+TENDER_EXPORT_BATCH_SIZE = 1000
+# 趋势统计未指定开始日期时，各粒度默认回溯的周期数
+TREND_DEFAULT_PERIODS = {'day': 30, 'week': 12, 'month': 12}
+# 趋势统计允许查询的最大天数
+TREND_MAX_DAYS = 366 * 5
+# 单次批量 AI 分析允许的最大项目数
+AI_BATCH_MAX_SIZE = 50
+
 
 class TenderService:
     """
@@ -113,30 +163,236 @@ class TenderService:
             strategy="",
         )
 
+    @staticmethod
+    def _is_valid_ai_analysis(analysis_result: dict | None) -> bool:
+        """
+        校验历史分析结果能否按当前结构解析，无法解析的结果视为无历史结果并重新分析
+
+        :param analysis_result: 历史分析结果
+        :return: 是否可用
+        """
+        if not analysis_result:
+            return False
+        try:
+            AiTenderAnalysisModel.model_validate(analysis_result)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to parse cached analysis result: {e}")
+            return False
+
+    @classmethod
+    async def _load_ai_analysis_inputs(cls, tender_id: int) -> tuple[dict | None, dict, str]:
+        """
+        使用短生命周期会话一次性读取 AI 分析所需数据，读取完成后立即归还连接
+
+        :param tender_id: 招标信息id
+        :return: (历史分析结果, 招标信息字典, 公告原文)，历史分析结果无法解析时视为无历史结果并读取招标信息重新分析
+        """
+        async with AsyncSessionLocal() as db:
+            history = await TenderAiDao.get_analysis_by_tender_id(db, tender_id)
+            if history and cls._is_valid_ai_analysis(history.analysis_result):
+                return history.analysis_result, {}, ""
+            tender = await TenderDao.get_tender_detail_by_id(db, tender_id)
+            if not tender:
+                return None, {}, ""
+            source_text = await TenderSourceDao.get_source_text_by_tender_id(db, tender_id)
+            return None, SqlalchemyUtil.base_to_dict(tender), source_text
+
+    @classmethod
+    async def _load_similar_projects(cls, tender_data: dict) -> SimilarProjectStatsModel | None:
+        """
+        使用短生命周期会话检索同类项目统计，失败时不影响分析流程
+
+        :param tender_data: 招标信息字典
+        :return: 同类项目统计
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                return await SimilarProjectRetriever.retrieve(db, tender_data)
+        except Exception as e:
+            logger.warning(f"Failed to load similar projects: {e}")
+            return None
+
+    @classmethod
+    async def _save_ai_analysis(cls, tender_id: int, result_data: dict) -> bool:
+        """
+        使用短生命周期会话写回 AI 分析结果
+
+        :param tender_id: 招标信息id
+        :param result_data: 分析结果
+        :return: 是否保存成功
+        """
+        async with AsyncSessionLocal() as db:
+            try:
+                await TenderAiDao.save_or_update_analysis(db, tender_id, result_data)
+                await db.commit()
+                return True
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Failed to save analysis result: {e}")
+                return False
+
     @classmethod
-    async def analyze_tender_ai(cls, tender_id: int, db: AsyncSession) -> AiTenderAnalysisModel:
+    async def analyze_tender_ai(cls, tender_id: int) -> AiTenderAnalysisModel:
         """
         使用大模型对招标项目进行 AI 分析
         
         :param tender_id: 招标信息id
-        :param db: orm对象
         :return: AI 分析结果
         """
-        history = await TenderAiDao.get_analysis_by_tender_id(db, tender_id)
-        if history and history.analysis_result:
-            try:
-                return AiTenderAnalysisModel.model_validate(history.analysis_result)
-            except Exception as e:
-                logger.warning(f"Failed to parse cached analysis result: {e}")
+        cached, tender_data, source_text = await cls._load_ai_analysis_inputs(tender_id)
+        if cached:
+            return AiTenderAnalysisModel.model_validate(cached)
+        if not tender_data:
+            return cls._default_ai_analysis()
+        result_data = await AiAnalysisScheduler.run(
+            tender_id,
+            AiAnalysisScheduler.estimate_tokens(tender_data, source_text),
+            lambda: cls._run_ai_analysis(tender_id, tender_data, source_text),
+        )
+        if result_data:
+            return AiTenderAnalysisModel.model_validate(result_data)
+            
+        return cls._default_ai_analysis()
+
+    @classmethod
+    async def _run_ai_analysis(
+        cls,
+        tender_id: int,
+        tender_data: dict,
+        source_text: str,
+        qualifications: list[str] | None = None,
+        on_state: Callable[[dict], None] | None = None,
+    ) -> dict | None:
+        """
+        执行一次完整的 AI 分析并写回结果
+
+        :param on_state: 接收分析过程中每个状态的回调，用于流式推送进度，不可阻塞
+        :return: 分析结果字典（按别名输出），失败时返回None
+        """
         last_result = None
-        async for state in tender_agent.run(tender_id, db, None):
+        similar_projects = await cls._load_similar_projects(tender_data)
+        async for state in tender_agent.run(tender_id, tender_data, source_text, qualifications or [], similar_projects):
+            if on_state is not None:
+                on_state(state)
             if state.get('analysis_result'):
                 last_result = state['analysis_result']
-        
-        if last_result:
-            return last_result
-            
-        return cls._default_ai_analysis()
+        if not last_result:
+            return None
+        result_data = last_result.model_dump(by_alias=True)
+        await cls._save_ai_analysis(tender_id, result_data)
+        return result_data
+
+    @classmethod
+    async def _load_ai_batch_inputs(cls, tender_ids: list[int]) -> tuple[dict[int, dict], dict[int, tuple[dict, str]]]:
+        """
+        使用短生命周期会话批量读取历史结果与待分析项目数据
+
+        :param tender_ids: 招标信息id列表
+        :return: (已有分析结果, 待分析项目的(招标信息字典, 公告原文))，无法解析的历史结果视为待分析
+        """
+        async with AsyncSessionLocal() as db:
+            analyses = await TenderAiDao.get_analysis_by_tender_ids(db, tender_ids)
+            cached = {
+                item.tender_id: item.analysis_result
+                for item in analyses
+                if cls._is_valid_ai_analysis(item.analysis_result)
+            }
+            missing = [tender_id for tender_id in tender_ids if tender_id not in cached]
+            tenders = await TenderDao.get_tenders_by_ids(db, missing)
+            sources = await TenderSourceDao.get_source_texts_by_tender_ids(db, missing)
+        pending = {
+            tender.tender_id: (SqlalchemyUtil.base_to_dict(tender), sources.get(tender.tender_id, ''))
+            for tender in tenders
+        }
+        return cached, pending
+
+    @classmethod
+    def check_ai_batch_size(cls, tender_ids: list[int]) -> list[int]:
+        """
+        校验批量分析的项目数量并去重
+
+        :param tender_ids: 招标信息id列表
+        :return: 去重后的招标信息id列表
+        """
+        unique_ids = list(dict.fromkeys(tender_ids))
+        if not unique_ids:
+            raise ServiceException(message='请选择需要分析的招标项目')
+        if len(unique_ids) > AI_BATCH_MAX_SIZE:
+            raise ServiceException(message=f'单次批量分析最多支持{AI_BATCH_MAX_SIZE}个项目')
+        return unique_ids
+
+    @classmethod
+    async def analyze_tender_ai_batch_stream(
+        cls, tender_ids: list[int], qualifications: list[str] | None = None
+    ) -> AsyncIterable[str]:
+        """
+        批量 AI 分析，通过同一个 SSE 连接按完成顺序推送每个项目的结果
+
+        已有历史结果的项目立即返回；其余项目在全局共享的并发与 token 预算下调度执行。
+
+        :param tender_ids: 招标信息id列表（已去重）
+        :param qualifications: 企业资质列表
+        :return: SSE 事件流
+        """
+
+        def event(payload: dict) -> str:
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        total = len(tender_ids)
+        completed = 0
+        cached, pending = await cls._load_ai_batch_inputs(tender_ids)
+
+        for tender_id in tender_ids:
+            if tender_id in cached:
+                completed += 1
+                yield event(
+                    {"tenderId": tender_id, "status": "cached", "result": cached[tender_id], "completed": completed, "total": total}
+                )
+            elif tender_id not in pending:
+                completed += 1
+                yield event(
+                    {"tenderId": tender_id, "status": "notFound", "result": None, "completed": completed, "total": total}
+                )
+
+        async def analyze(tender_id: int) -> tuple[int, dict | None, str | None]:
+            tender_data, source_text = pending[tender_id]
+            try:
+                result_data = await AiAnalysisScheduler.run(
+                    tender_id,
+                    AiAnalysisScheduler.estimate_tokens(tender_data, source_text),
+                    lambda: cls._run_ai_analysis(tender_id, tender_data, source_text, qualifications),
+                    qualifications,
+                )
+                return tender_id, result_data, None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Batch AI analysis failed for tender {tender_id}: {e}")
+                return tender_id, None, str(e)
+
+        tasks = [asyncio.create_task(analyze(tender_id)) for tender_id in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                tender_id, result_data, error = await next_done
+                completed += 1
+                yield event(
+                    {
+                        "tenderId": tender_id,
+                        "status": "done" if result_data else "failed",
+                        "result": result_data,
+                        "message": error or ("" if result_data else "分析失败"),
+                        "completed": completed,
+                        "total": total,
+                    }
+                )
+        finally:
+            # 客户端断开时取消尚未完成的等待；已开始执行的分析由调度器保证继续完成并落库
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        yield event({"status": "finished", "completed": completed, "total": total})
 
     @classmethod
     async def get_ai_analysis_history(cls, db: AsyncSession, limit: int = 50) -> list[AiAnalysisHistoryItemModel]:
@@ -167,72 +423,65 @@ class TenderService:
 
     @classmethod
     async def analyze_tender_ai_stream(
-        cls, tender_id: int, db: AsyncSession, qualifications: list[str] | None = None
+        cls, tender_id: int, qualifications: list[str] | None = None
     ) -> AsyncIterable[str]:
         """
         流式执行 AI 分析，返回进度和结果
+
+        整个流式过程中不持有数据库连接：开始时短暂读取，产出结果时短暂写回。
+        分析经调度器在后台任务中执行，进度写入队列后推送，客户端读取缓慢时不占用并发名额；
+        同一项目以相同资质已在分析时合并执行，只推送最终结果。
         """
-        # 1. Check for historical analysis
-        history = await TenderAiDao.get_analysis_by_tender_id(db, tender_id)
-        if history and history.analysis_result:
+        # 1. Check for historical analysis and preload inputs
+        cached, tender_data, source_text = await cls._load_ai_analysis_inputs(tender_id)
+        if cached:
             output = {
                 "progress": 100,
                 "message": "已加载历史分析结果",
-                "result": history.analysis_result,
+                "result": cached,
             }
             yield f"data: {json.dumps(output, ensure_ascii=False)}\n\n"
             return
 
-        # 2. Run Agent
-        final_result = None
-        saved_result = False
+        if not tender_data:
+            yield f"data: {json.dumps({'progress': 100, 'message': '未找到招标信息', 'error': True}, ensure_ascii=False)}\n\n"
+            return
+
+        # 2. Run Agent through the scheduler (shares the global AI concurrency, token budget and in-flight runs)
+        states: asyncio.Queue[dict | None] = asyncio.Queue()
+        run_task = asyncio.create_task(
+            AiAnalysisScheduler.run(
+                tender_id,
+                AiAnalysisScheduler.estimate_tokens(tender_data, source_text),
+                lambda: cls._run_ai_analysis(tender_id, tender_data, source_text, qualifications, states.put_nowait),
+                qualifications,
+            )
+        )
+        run_task.add_done_callback(lambda _: states.put_nowait(None))
+        result_sent = False
         try:
-            async for state in tender_agent.run(tender_id, db, qualifications or []):
+            while (state := await states.get()) is not None:
                 output = {
                     "progress": state.get("progress", 0),
                     "message": state.get("current_step", ""),
                     "result": None,
                 }
-
                 if state.get("analysis_result"):
-                    final_result = state["analysis_result"].model_dump(by_alias=True)
-                    if not saved_result:
-                        try:
-                            async with AsyncSessionLocal() as new_db:
-                                await TenderAiDao.save_or_update_analysis(new_db, tender_id, final_result)
-                                await new_db.commit()
-                            saved_result = True
-                        except Exception as e:
-                            logger.warning(f"Failed to save analysis result: {e}")
-                    output["result"] = final_result
+                    output["result"] = state["analysis_result"].model_dump(by_alias=True)
+                    result_sent = True
+                yield f"data: {json.dumps(output, ensure_ascii=False)}\n\n"
 
+            result_data = await run_task
+            if result_data and not result_sent:
+                output = {"progress": 100, "message": "分析完成", "result": result_data}
                 yield f"data: {json.dumps(output, ensure_ascii=False)}\n\n"
-            
-            # 3. Save result (Normal completion)
-            if final_result and not saved_result:
-                try:
-                    await TenderAiDao.save_or_update_analysis(db, tender_id, final_result)
-                    await db.commit()
-                except Exception as e:
-                    await db.rollback()
-                    logger.warning(f"Failed to save analysis result: {e}")
-                
+
         except asyncio.CancelledError:
-            # Handle client disconnection gracefully
+            # 客户端断开时已开始的分析继续执行并写回结果，尚未开始的分析由调度器取消
             logger.info(f"Stream cancelled by client for tender {tender_id}")
-            # Try to save if we already have the result (e.g. cancelled during the last yield)
-            if final_result:
-                try:
-                    # Create a new session to save the result, as the original session might be cancelled/rolled back
-                    async with AsyncSessionLocal() as new_db:
-                        await TenderAiDao.save_or_update_analysis(new_db, tender_id, final_result)
-                        await new_db.commit()
-                except Exception as e:
-                    logger.warning(f"Failed to save result after cancellation: {e}")
             raise
         except Exception as e:
             logger.error(f"Error during AI analysis stream: {e}")
-            await db.rollback()
             # Yield error message to client
             error_output = {
                 "progress": 0,
@@ -240,6 +489,9 @@ class TenderService:
                 "error": True
             }
             yield f"data: {json.dumps(error_output, ensure_ascii=False)}\n\n"
+        finally:
+            if not run_task.done():
+                run_task.cancel()
 
     @classmethod
     async def add_tender(cls, tender: TenderModel, db: AsyncSession) -> BizTenderInfo:
@@ -298,86 +550,254 @@ class TenderService:
             await db.rollback()
             raise e
 
+    @classmethod
+    async def stream_export_tender_list(
+        cls,
+        query_object: TenderQueryModel,
+        file_type: Literal['xlsx', 'csv'] = 'xlsx',
+        progress: ExportJobProgress | None = None,
+    ) -> AsyncGenerator[bytes]:
+        """
+        流式导出招标信息列表：服务端游标分批读取，逐批写入文件并分块输出
+
+        :param query_object: 查询参数对象
+        :param file_type: 导出文件类型
+        :param progress: 导出任务进度上报对象，为空时不统计进度
+        :return: 文件二进制数据块
+        """
+        columns = list(TENDER_EXPORT_MAPPING)
+        headers = list(TENDER_EXPORT_MAPPING.values())
+        # 响应流在请求依赖释放后才开始消费，需使用独立会话
+        async with AsyncSessionLocal() as session:
+            total = await TenderDao.count_tender_list(session, query_object) if progress else 0
+            row_batches = TenderDao.stream_tender_list(session, query_object, columns, TENDER_EXPORT_BATCH_SIZE)
+            if progress:
+                row_batches = cls._track_export_progress(row_batches, total, progress)
+            writer = ExcelUtil.stream_rows2csv if file_type == 'csv' else ExcelUtil.stream_rows2excel
+            async for chunk in writer(headers, row_batches):
+                yield chunk
+
     @staticmethod
-    async def export_tender_list_services(tender_list: list) -> bytes:
-        mapping_dict = {
-            'project_code': '项目编号',
-            'project_name': '项目名称',
-            'district': '所在区县',
-            'construction_unit': '建设单位',
-            'project_stage': '所处阶段',
-            'project_type': '项目类型',
-            'bid_control_price': '招标控制价（万元）',
-            'bid_price': '中标价（万元）',
-            'construction_scale': '建设面积（㎡）',
-            'construction_content': '施工内容',
-            'duration': '工期',
-            'registration_deadline': '报名截止时间',
-            'agency': '代理机构',
-            'create_time': '采集时间',
-            'announcement_website': '公告网站',
-            'pre_qualification_url': '预审公告收集网址',
-            'winner_rank_1': '中标排名1',
-            'winner_rank_2': '中标排名2',
-            'winner_rank_3': '中标排名3',
-            'discount_rate': '中标下浮率',
-            'unit_price': '单方造价',
-            'evaluation_report_1': '评标报告',
-            'bid_date': '中标日期',
-            'bid_announcement_url': '中标公告网址',
-            'remark': '备注',
-        }
-        list_data = [SqlalchemyUtil.base_to_dict(item, transform_case='camel_to_snake') for item in tender_list]
-        return ExcelUtil.export_list2excel(list_data, mapping_dict)
+    async def _track_export_progress(
+        row_batches: AsyncIterable[Sequence], total: int, progress: ExportJobProgress
+    ) -> AsyncGenerator[Sequence]:
+        processed = 0
+        async for rows in row_batches:
+            yield rows
+            processed += len(rows)
+            await progress.update(processed * 100 // total if total else 0, processed)
+
+    @classmethod
+    async def submit_export_tender_job(
+        cls,
+        request: Request,
+        query_object: TenderQueryModel,
+        user_id: int,
+        file_type: Literal['xlsx', 'csv'] = 'xlsx',
+    ) -> ExportJobModel:
+        """
+        创建招标信息列表异步导出任务
+
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param user_id: 任务创建用户ID
+        :param file_type: 导出文件类型
+        :return: 导出任务信息
+        """
+
+        def builder(progress: ExportJobProgress) -> AsyncIterable[bytes]:
+            return cls.stream_export_tender_list(query_object, file_type, progress)
+
+        return await ExportJobService.submit_export_job_services(request, 'tender', builder, user_id, file_type)
 
     @classmethod
-    async def get_dashboard_stats(cls, db: AsyncSession) -> TenderDashboardModel:
+    async def _build_dashboard_snapshot(cls, db: AsyncSession) -> dict:
+        """
+        从数据库计算概览聚合快照（仅包含与读取时刻无关的数据）
+
+        :param db: orm对象
+        :return: 聚合快照
+        """
         now = datetime.now()
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         start_date = (now - timedelta(days=29)).date()
-        end_date = now.date()
 
-        total_projects = await TenderDao.get_dashboard_total_projects(db)
-        month_new = await TenderDao.get_dashboard_month_new(db, month_start)
-        total_amount_wan = await TenderDao.get_dashboard_total_amount_wan(db)
-        top_district = await TenderDao.get_dashboard_top_district(db)
-        
+        total_projects, month_new, total_amount_wan = await TenderDao.get_dashboard_summary(db, month_start)
+        district_rows, top_district = await TenderDao.get_dashboard_district_stats(db)
+        stage_rows = await TenderDao.get_dashboard_stage_stats(db)
+        trend_rows = await TenderStatsDao.get_daily_stats(db, start_date, now.date())
         # 获取上次同步时间（从sys_job_log获取最新的一条记录）
-        last_sync_job = (await db.execute(select(SysJobLog).order_by(desc(SysJobLog.create_time)).limit(1))).scalars().first()
-        last_sync_time = last_sync_job.create_time if last_sync_job else None
-        
+        last_sync_time = (
+            await db.execute(select(SysJobLog.create_time).order_by(desc(SysJobLog.create_time)).limit(1))
+        ).scalar()
+
+        return {
+            'total_projects': total_projects,
+            'month_new': month_new,
+            'total_amount_wan': total_amount_wan,
+            'top_district': top_district,
+            'last_sync_time': last_sync_time.isoformat() if last_sync_time else None,
+            'district_stats': district_rows,
+            'stage_stats': stage_rows,
+            'trend': {d.isoformat(): count for d, count, _, _ in trend_rows},
+        }
+
+    @classmethod
+    async def get_dashboard_stats(cls, db: AsyncSession, redis: Any = None) -> TenderDashboardModel:
+        """
+        获取招标数据概览，聚合结果由 Redis 缓存，相关表写入后失效
+
+        :param db: orm对象
+        :param redis: redis对象，为空时直接查询数据库
+        :return: 概览数据
+        """
+        snapshot = await TenderDashboardCache.get_or_build(redis, lambda: cls._build_dashboard_snapshot(db))
+        now = datetime.now()
+
         last_sync_minutes_ago = 0
         last_sync_hours_ago = 0.0
         last_sync_time_str = None
-        if last_sync_time:
+        if snapshot['last_sync_time']:
+            last_sync_time = datetime.fromisoformat(snapshot['last_sync_time'])
             diff_seconds = (now - last_sync_time).total_seconds()
             last_sync_minutes_ago = max(0, int(diff_seconds // 60))
             last_sync_hours_ago = max(0.0, round(diff_seconds / 3600, 1))
             last_sync_time_str = last_sync_time.strftime('%Y-%m-%d %H:%M')
 
-        district_rows = await TenderDao.get_dashboard_district_stats(db)
-        stage_rows = await TenderDao.get_dashboard_stage_stats(db)
-        trend_rows = await TenderDao.get_dashboard_trend(db, start_date, end_date)
-
-        trend_map = {d.isoformat(): c for d, c in trend_rows}
+        trend_map = snapshot['trend']
         trend_stats = []
         for i in range(30):
             d = (now - timedelta(days=29 - i)).date().isoformat()
             trend_stats.append(TrendStatModel(date=d, count=int(trend_map.get(d, 0))))
 
         return TenderDashboardModel(
-            total_projects=total_projects,
-            month_new=month_new,
-            total_amount_billion=round(total_amount_wan / 10000, 2),
-            top_district=top_district or '-',
+            total_projects=snapshot['total_projects'],
+            month_new=snapshot['month_new'],
+            total_amount_billion=round(snapshot['total_amount_wan'] / 10000, 2),
+            top_district=snapshot['top_district'] or '-',
             last_sync_minutes_ago=last_sync_minutes_ago,
             last_sync_hours_ago=last_sync_hours_ago,
             last_sync_time=last_sync_time_str,
-            district_stats=[DistrictStatModel(name=n, value=v) for n, v in district_rows],
-            stage_stats=[StageStatModel(name=n, value=v) for n, v in stage_rows],
+            district_stats=[DistrictStatModel(name=n, value=v) for n, v in snapshot['district_stats']],
+            stage_stats=[StageStatModel(name=n, value=v) for n, v in snapshot['stage_stats']],
             trend_stats=trend_stats,
         )
 
+    @staticmethod
+    def _period_start(day: date, granularity: str) -> date:
+        if granularity == 'week':
+            return day - timedelta(days=day.weekday())
+        if granularity == 'month':
+            return day.replace(day=1)
+        return day
+
+    @classmethod
+    def _resolve_stats_range(cls, query: TenderTrendQueryModel) -> tuple[date, date]:
+        """
+        解析统计日期范围，未指定开始日期时按粒度回溯默认周期数
+
+        :param query: 趋势统计查询对象
+        :return: (开始日期, 结束日期)
+        """
+        end_date = query.end_date or date.today()
+        begin_date = query.begin_date
+        if begin_date is None:
+            periods = TREND_DEFAULT_PERIODS[query.granularity]
+            if query.granularity == 'month':
+                month_index = end_date.year * 12 + end_date.month - periods
+                begin_date = date(month_index // 12, month_index % 12 + 1, 1)
+            elif query.granularity == 'week':
+                begin_date = cls._period_start(end_date, 'week') - timedelta(weeks=periods - 1)
+            else:
+                begin_date = end_date - timedelta(days=periods - 1)
+        if begin_date > end_date:
+            raise ServiceException(message='开始日期不能晚于结束日期')
+        if (end_date - begin_date).days > TREND_MAX_DAYS:
+            raise ServiceException(message=f'统计日期范围不能超过{TREND_MAX_DAYS}天')
+        return begin_date, end_date
+
+    @classmethod
+    async def get_trend_stats(cls, query: TenderTrendQueryModel, db: AsyncSession) -> list[TenderTrendBucketModel]:
+        """
+        按日/周/月获取招标信息趋势统计，数据来自按日汇总表，查询代价与天数成正比
+
+        :param query: 趋势统计查询对象
+        :param db: orm对象
+        :return: 各统计周期的数量与金额，无数据的周期补零
+        """
+        begin_date, end_date = cls._resolve_stats_range(query)
+        daily_rows = await TenderStatsDao.get_daily_stats(
+            db, begin_date, end_date, query.district, query.project_stage, query.project_type
+        )
+
+        # 周期起始日加上步长后再取所在周期起始日，即为下一周期
+        step = timedelta(days={'day': 1, 'week': 7, 'month': 31}[query.granularity])
+        buckets: dict[date, list] = {}
+        period = cls._period_start(begin_date, query.granularity)
+        while period <= end_date:
+            buckets[period] = [0, 0.0, 0.0]
+            period = cls._period_start(period + step, query.granularity)
+        for stat_date, count, control_price_sum, bid_price_sum in daily_rows:
+            bucket = buckets[cls._period_start(stat_date, query.granularity)]
+            bucket[0] += count
+            bucket[1] += control_price_sum
+            bucket[2] += bid_price_sum
+
+        return [
+            TenderTrendBucketModel(
+                period=period.isoformat(),
+                count=count,
+                control_price_sum=round(control_price_sum, 6),
+                bid_price_sum=round(bid_price_sum, 6),
+            )
+            for period, (count, control_price_sum, bid_price_sum) in buckets.items()
+        ]
+
+    @classmethod
+    async def get_district_price_stats(
+        cls, query: TenderTrendQueryModel, db: AsyncSession
+    ) -> list[DistrictPriceStatModel]:
+        """
+        获取指定日期范围内各区县的招标信息数量与金额合计
+
+        :param query: 趋势统计查询对象（使用日期范围、所处阶段与项目类型）
+        :param db: orm对象
+        :return: 区县金额统计，按招标控制价合计降序
+        """
+        begin_date, end_date = cls._resolve_stats_range(query)
+        rows = await TenderStatsDao.get_district_price_sums(
+            db, begin_date, end_date, query.project_stage, query.project_type
+        )
+        return [
+            DistrictPriceStatModel(
+                district=district or '未知',
+                count=count,
+                control_price_sum=round(control_price_sum, 6),
+                bid_price_sum=round(bid_price_sum, 6),
+            )
+            for district, count, control_price_sum, bid_price_sum in rows
+            if count
+        ]
+
+    @classmethod
+    async def rebuild_daily_stats(cls, begin_date: date | None = None, end_date: date | None = None) -> int:
+        """
+        按原始数据回填按日汇总表
+
+        :param begin_date: 开始日期，为空时不限
+        :param end_date: 结束日期，为空时不限
+        :return: 重建的汇总行数
+        """
+        async with AsyncSessionLocal() as session:
+            try:
+                row_count = await TenderStatsDao.rebuild_range(session, begin_date, end_date)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        logger.info(f'招标信息按日汇总回填完成（{begin_date or "不限"} ~ {end_date or "不限"}），共{row_count}行')
+        return row_count
+
 
     @classmethod
     def extract_project_type(cls, title: str) -> str:
@@ -12,9 +12,13 @@ from config.get_redis import RedisUtil
 from config.get_scheduler import SchedulerUtil
 from exceptions.handle import handle_exception
 from middlewares.handle import handle_middleware
+from module_admin.service.online_service import OnlineService
+from module_tender.service.dashboard_cache import TenderDashboardCache
 from sub_applications.handle import handle_sub_applications
 from utils.common_util import worship
 from utils.log_util import logger
+from utils.page_util import CountCache
+from utils.redis_util import RedisNearCacheUtil
 
 
 # 生命周期事件
@@ -23,16 +27,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f'⏰️ {AppConfig.app_name}开始启动')
     worship()
     await init_create_table()
+    # Redis不可用时缓存后端自动切换为内存缓存，恢复后切换回Redis
+    app.state.redis = await RedisUtil.create_redis_pool()
     try:
-        app.state.redis = await RedisUtil.create_redis_pool()
         await RedisUtil.init_sys_dict(app.state.redis)
         await RedisUtil.init_sys_config(app.state.redis)
     except Exception as e:
-        logger.warning(f'⚠️ Redis连接或初始化失败，系统将以无缓存模式运行: {e}')
-        app.state.redis = None
+        logger.warning(f'⚠️ 字典与参数配置缓存初始化失败: {e}')
+    try:
+        await OnlineService.backfill_session_services(app.state.redis)
+    except Exception as e:
+        logger.warning(f'⚠️ 在线会话注册表回填失败: {e}')
+    TenderDashboardCache.bind(app.state.redis)
+    CountCache.bind(app.state.redis)
+    RedisNearCacheUtil.start_listener(app.state.redis)
     await SchedulerUtil.init_system_scheduler()
     logger.info(f'🚀 {AppConfig.app_name}启动成功')
     yield
+    await RedisNearCacheUtil.stop_listener()
     if getattr(app.state, 'redis', None):
         await RedisUtil.close_redis_pool(app)
     await SchedulerUtil.close_system_scheduler()
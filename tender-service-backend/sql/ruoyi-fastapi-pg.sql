@@ -360,6 +360,56 @@ comment on column biz_tender_info.expected_announcement_date is '预计招标公
 comment on column biz_tender_info.remark is '备注';
 comment on table biz_tender_info is '招标信息表';
 create unique index uq_biz_tender_info_code_stage on biz_tender_info (project_code, project_stage);
+create index idx_biz_tender_info_release on biz_tender_info (release_time, create_time);
+create index idx_biz_tender_info_district on biz_tender_info (district, release_time);
+create index idx_biz_tender_info_stage on biz_tender_info (project_stage, release_time);
+create index idx_biz_tender_info_type on biz_tender_info (project_type, release_time);
+create index idx_biz_tender_info_create_time on biz_tender_info (create_time);
+create index idx_biz_tender_info_update_time on biz_tender_info (update_time);
+create index idx_biz_tender_info_similar on biz_tender_info (project_type, district, bid_control_price);
+create extension if not exists pg_trgm;
+create index idx_biz_tender_info_search on biz_tender_info using gin ((coalesce(project_name, '') || ' ' || coalesce(construction_unit, '') || ' ' || coalesce(construction_content, '') || ' ' || coalesce(tender_scope, '')) gin_trgm_ops);
+drop table if exists biz_tender_daily_stats;
+create table biz_tender_daily_stats (
+    stat_date           date            not null,
+    district            varchar(100)    not null default '',
+    project_stage       varchar(50)     not null default '',
+    project_type        varchar(100)    not null default '',
+    tender_count        int4            not null default 0,
+    control_price_sum   numeric(20,6)   not null default 0,
+    bid_price_sum       numeric(20,6)   not null default 0,
+    update_time         timestamp(0)    default current_timestamp,
+    primary key (stat_date, district, project_stage, project_type)
+);
+comment on column biz_tender_daily_stats.stat_date is '统计日期（信息发布日期，缺失时取创建日期）';
+comment on column biz_tender_daily_stats.district is '所在区县';
+comment on column biz_tender_daily_stats.project_stage is '所处阶段';
+comment on column biz_tender_daily_stats.project_type is '项目类型';
+comment on column biz_tender_daily_stats.tender_count is '招标信息数量';
+comment on column biz_tender_daily_stats.control_price_sum is '招标控制价合计（万元）';
+comment on column biz_tender_daily_stats.bid_price_sum is '中标价合计（万元）';
+comment on column biz_tender_daily_stats.update_time is '更新时间';
+comment on table biz_tender_daily_stats is '招标信息按日汇总表';
+drop table if exists biz_tender_source;
+create table biz_tender_source (
+    source_id           bigserial,
+    tender_id           int8            not null,
+    source_url          varchar(255)    default null,
+    content             bytea,
+    content_length      int4            default 0,
+    create_time         timestamp(0)    default current_timestamp,
+    update_time         timestamp(0)    default current_timestamp,
+    primary key (source_id)
+);
+create unique index ix_biz_tender_source_tender_id on biz_tender_source (tender_id);
+comment on column biz_tender_source.source_id is '主键ID';
+comment on column biz_tender_source.tender_id is '招标信息ID';
+comment on column biz_tender_source.source_url is '原文网址';
+comment on column biz_tender_source.content is '清洗后正文（zlib压缩）';
+comment on column biz_tender_source.content_length is '正文原始字符数';
+comment on column biz_tender_source.create_time is '创建时间';
+comment on column biz_tender_source.update_time is '更新时间';
+comment on table biz_tender_source is '招标公告原文表';
 insert into sys_menu values(1015, '菜单删除', 102, '4',  '', '', '', '', 1, 0, 'F', '0', '0', 'system:menu:remove',         '#', 'admin', current_timestamp, '', null, '');
 -- 部门管理按钮
 insert into sys_menu values(1016, '部门查询', 103, '1',  '', '', '', '', 1, 0, 'F', '0', '0', 'system:dept:query',          '#', 'admin', current_timestamp, '', null, '');
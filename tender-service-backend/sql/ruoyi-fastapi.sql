@@ -695,6 +695,46 @@ create table biz_tender_info (
   primary key (tender_id)
 ) engine=innodb comment = '招标信息表';
 alter table biz_tender_info add unique key uk_biz_tender_info_code_stage (project_code, project_stage);
+alter table biz_tender_info add index idx_biz_tender_info_release (release_time, create_time);
+alter table biz_tender_info add index idx_biz_tender_info_district (district, release_time);
+alter table biz_tender_info add index idx_biz_tender_info_stage (project_stage, release_time);
+alter table biz_tender_info add index idx_biz_tender_info_type (project_type, release_time);
+alter table biz_tender_info add index idx_biz_tender_info_create_time (create_time);
+alter table biz_tender_info add index idx_biz_tender_info_update_time (update_time);
+alter table biz_tender_info add index idx_biz_tender_info_similar (project_type, district, bid_control_price);
+alter table biz_tender_info add fulltext index ft_biz_tender_info_search (project_name, construction_unit, construction_content, tender_scope) with parser ngram;
+
+-- ----------------------------
+-- 招标信息按日汇总表（MySQL 版）
+-- ----------------------------
+drop table if exists biz_tender_daily_stats;
+create table biz_tender_daily_stats (
+  stat_date            date           not null                               comment '统计日期（信息发布日期，缺失时取创建日期）',
+  district             varchar(100)   not null default ''                    comment '所在区县',
+  project_stage        varchar(50)    not null default ''                    comment '所处阶段',
+  project_type         varchar(100)   not null default ''                    comment '项目类型',
+  tender_count         int(11)        not null default 0                     comment '招标信息数量',
+  control_price_sum    decimal(20, 6) not null default 0                     comment '招标控制价合计（万元）',
+  bid_price_sum        decimal(20, 6) not null default 0                     comment '中标价合计（万元）',
+  update_time          datetime       default current_timestamp              comment '更新时间',
+  primary key (stat_date, district, project_stage, project_type)
+) engine=innodb comment = '招标信息按日汇总表';
+
+-- ----------------------------
+-- 招标公告原文表（MySQL 版）
+-- ----------------------------
+drop table if exists biz_tender_source;
+create table biz_tender_source (
+  source_id            bigint(20)     not null auto_increment                comment '主键ID',
+  tender_id            bigint(20)     not null                               comment '招标信息ID',
+  source_url           varchar(255)   default null                           comment '原文网址',
+  content              longblob                                              comment '清洗后正文（zlib压缩）',
+  content_length       int(11)        default 0                              comment '正文原始字符数',
+  create_time          datetime       default current_timestamp              comment '创建时间',
+  update_time          datetime       default current_timestamp on update current_timestamp comment '更新时间',
+  primary key (source_id),
+  unique key ix_biz_tender_source_tender_id (tender_id)
+) engine=innodb comment = '招标公告原文表';
 
 
 -- ----------------------------
@@ -9,6 +9,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.collections import InstrumentedList
 from sqlalchemy.sql.expression import TextClause, null
@@ -49,6 +50,9 @@ class SqlalchemyUtil:
     sqlalchemy工具类
     """
 
+    # 模型字段名映射缓存，键为(模型类, 转换形式)
+    _key_maps: dict[tuple[type, str], dict[str, str]] = {}
+
     @classmethod
     def base_to_dict(
         cls, obj: Base | dict, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake'] = 'no_case'
@@ -61,19 +65,45 @@ class SqlalchemyUtil:
         :return: 字典结果
         """
         if isinstance(obj, Base):
-            base_dict = obj.__dict__.copy()
-            base_dict.pop('_sa_instance_state', None)
-            for name, value in base_dict.items():
+            key_map = cls.get_key_map(type(obj), transform_case)
+            base_dict = {}
+            for name, value in obj.__dict__.items():
+                if name == '_sa_instance_state':
+                    continue
                 if isinstance(value, InstrumentedList):
-                    base_dict[name] = cls.serialize_result(value, 'snake_to_camel')
-        elif isinstance(obj, dict):
+                    value = cls.serialize_result(value, 'snake_to_camel')
+                base_dict[key_map.get(name) or cls._convert_key(name, transform_case)] = value
+            return base_dict
+        if isinstance(obj, dict):
             base_dict = obj.copy()
+        if transform_case == 'no_case':
+            return base_dict
+        return {cls._convert_key(k, transform_case): v for k, v in base_dict.items()}
+
+    @classmethod
+    def get_key_map(
+        cls, model: type[Base], transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake']
+    ) -> dict[str, str]:
+        """
+        获取模型字段名到转换后字段名的映射，每个模型与转换形式只在首次使用时生成
+
+        :param model: sqlalchemy模型类
+        :param transform_case: 转换形式
+        :return: 字段名映射
+        """
+        key_map = cls._key_maps.get((model, transform_case))
+        if key_map is None:
+            key_map = {attr.key: cls._convert_key(attr.key, transform_case) for attr in sa_inspect(model).attrs}
+            cls._key_maps[(model, transform_case)] = key_map
+        return key_map
+
+    @staticmethod
+    def _convert_key(key: str, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake']) -> str:
         if transform_case == 'snake_to_camel':
-            return {CamelCaseUtil.snake_to_camel(k): v for k, v in base_dict.items()}
+            return CamelCaseUtil.snake_to_camel(key)
         if transform_case == 'camel_to_snake':
-            return {SnakeCaseUtil.camel_to_snake(k): v for k, v in base_dict.items()}
-
-        return base_dict
+            return SnakeCaseUtil.camel_to_snake(key)
+        return key
 
     @classmethod
     @overload
@@ -144,11 +174,9 @@ class SqlalchemyUtil:
             if any(isinstance(row, Base) for row in result):
                 return [cls.serialize_result(row, transform_case) for row in result]
             result_dict = result._asdict()
-            if transform_case == 'snake_to_camel':
-                return {CamelCaseUtil.snake_to_camel(k): v for k, v in result_dict.items()}
-            if transform_case == 'camel_to_snake':
-                return {SnakeCaseUtil.camel_to_snake(k): v for k, v in result_dict.items()}
-            return result_dict
+            if transform_case == 'no_case':
+                return result_dict
+            return {cls._convert_key(k, transform_case): v for k, v in result_dict.items()}
         return result
 
     @classmethod
@@ -170,6 +198,10 @@ class CamelCaseUtil:
     下划线形式(snake_case)转小驼峰形式(camelCase)工具方法
     """
 
+    # 字段名转换结果缓存，字段名集合有限，达到上限后不再缓存
+    CACHE_MAX_SIZE = 4096
+    _cache: dict[str, str] = {}
+
     @classmethod
     def snake_to_camel(cls, snake_str: str) -> str:
         """
@@ -178,10 +210,15 @@ class CamelCaseUtil:
         :param snake_str: 下划线形式字符串
         :return: 小驼峰形式字符串
         """
-        # 分割字符串
-        words = snake_str.split('_')
-        # 小驼峰命名，第一个词首字母小写，其余词首字母大写
-        return words[0] + ''.join(word.capitalize() for word in words[1:])
+        camel_str = cls._cache.get(snake_str)
+        if camel_str is None:
+            # 分割字符串
+            words = snake_str.split('_')
+            # 小驼峰命名，第一个词首字母小写，其余词首字母大写
+            camel_str = words[0] + ''.join(word.capitalize() for word in words[1:])
+            if len(cls._cache) < cls.CACHE_MAX_SIZE:
+                cls._cache[snake_str] = camel_str
+        return camel_str
 
     @classmethod
     @overload
@@ -231,6 +268,10 @@ class SnakeCaseUtil:
     小驼峰形式(camelCase)转下划线形式(snake_case)工具方法
     """
 
+    # 字段名转换结果缓存，字段名集合有限，达到上限后不再缓存
+    CACHE_MAX_SIZE = 4096
+    _cache: dict[str, str] = {}
+
     @classmethod
     def camel_to_snake(cls, camel_str: str) -> str:
         """
@@ -239,11 +280,16 @@ class SnakeCaseUtil:
         :param camel_str: 小驼峰形式字符串
         :return: 下划线形式字符串
         """
-        # 在大写字母前添加一个下划线，然后将整个字符串转为小写
-        words = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', camel_str)
-        words = re.sub('([a-z0-9])([A-Z])', r'\1_\2', words)
-        words = re.sub(r'([A-Za-z])(\d+)', r'\1_\2', words)
-        return words.lower()
+        snake_str = cls._cache.get(camel_str)
+        if snake_str is None:
+            # 在大写字母前添加一个下划线，然后将整个字符串转为小写
+            words = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', camel_str)
+            words = re.sub('([a-z0-9])([A-Z])', r'\1_\2', words)
+            words = re.sub(r'([A-Za-z])(\d+)', r'\1_\2', words)
+            snake_str = words.lower()
+            if len(cls._cache) < cls.CACHE_MAX_SIZE:
+                cls._cache[camel_str] = snake_str
+        return snake_str
 
     @classmethod
     @overload
@@ -1,7 +1,12 @@
+import asyncio
+import csv
 import io
+import tempfile
+from collections.abc import AsyncGenerator, AsyncIterable, Sequence
 
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 from openpyxl.styles import Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
@@ -12,6 +17,9 @@ class ExcelUtil:
     Excel操作类
     """
 
+    # 流式导出时每次输出的数据块大小（字节）
+    STREAM_CHUNK_SIZE = 64 * 1024
+
     @classmethod
     def __mapping_list(cls, list_data: list, mapping_dict: dict) -> list[dict]:
         """
@@ -42,6 +50,61 @@ class ExcelUtil:
 
         return binary_data
 
+    @staticmethod
+    def __clean_cell(value: object) -> object:
+        # openpyxl 拒绝写入包含控制字符的字符串
+        if isinstance(value, str):
+            return ILLEGAL_CHARACTERS_RE.sub('', value)
+        return value
+
+    @classmethod
+    def __append_rows(cls, worksheet: object, rows: Sequence[Sequence]) -> None:
+        for row in rows:
+            worksheet.append([cls.__clean_cell(value) for value in row])
+
+    @classmethod
+    async def stream_rows2excel(
+        cls, headers: list[str], row_batches: AsyncIterable[Sequence[Sequence]]
+    ) -> AsyncGenerator[bytes]:
+        """
+        工具方法：以只写模式逐批写入行数据，生成的excel暂存于临时文件后分块输出，内存占用与数据量无关
+
+        :param headers: 表头
+        :param row_batches: 按批次产出的行数据
+        :return: excel二进制数据块
+        """
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+        worksheet.append(headers)
+        with tempfile.TemporaryFile() as file:
+            async for rows in row_batches:
+                await asyncio.to_thread(cls.__append_rows, worksheet, rows)
+            await asyncio.to_thread(workbook.save, file)
+            file.seek(0)
+            while chunk := await asyncio.to_thread(file.read, cls.STREAM_CHUNK_SIZE):
+                yield chunk
+
+    @classmethod
+    async def stream_rows2csv(
+        cls, headers: list[str], row_batches: AsyncIterable[Sequence[Sequence]]
+    ) -> AsyncGenerator[bytes]:
+        """
+        工具方法：逐批将行数据编码为csv并立即输出（带 UTF-8 BOM，便于 Excel 直接打开）
+
+        :param headers: 表头
+        :param row_batches: 按批次产出的行数据
+        :return: csv二进制数据块
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        yield '\ufeff'.encode() + buffer.getvalue().encode()
+        async for rows in row_batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(['' if value is None else value for value in row] for row in rows)
+            yield buffer.getvalue().encode()
+
     @classmethod
     def get_excel_template(cls, header_list: list, selector_header_list: list, option_list: list[dict]) -> bytes:
         """
@@ -1,11 +1,138 @@
+import asyncio
+import base64
+import hashlib
+import json
 import math
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any, Union
 
-from sqlalchemy import Row, Select, func, select
+from redis import asyncio as aioredis
+from sqlalchemy import ColumnElement, Row, Select, and_, false, func, inspect, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import True_
+from sqlalchemy.sql.util import find_tables
 
+from common.enums import RedisInitKeyConfig
 from common.vo import PageModel
-from utils.common_util import CamelCaseUtil
+from config.database import TableWriteEvents
+from config.env import DataBaseConfig
+from exceptions.exception import ServiceException
+from utils.common_util import CamelCaseUtil, SnakeCaseUtil
+from utils.log_util import logger
+
+# 游标分页排序键：(排序列, 是否降序)
+CursorKey = tuple[ColumnElement, bool]
+
+
+class CountCache:
+    """
+    分页总数缓存：以统计语句（含参数）及相关表版本号的哈希为键，短时有效；
+    会话提交时若写入了相关表，则递增该表在本进程及Redis中的版本号使相关缓存失效（见 TableWriteEvents），
+    Redis中的版本号由各工作进程共享，其他进程的写入同样使本进程的缓存失效
+    """
+
+    # 缓存有效期（秒）
+    TTL = 15
+    # 最大缓存条目数
+    MAX_SIZE = 1024
+
+    _entries: 'OrderedDict[str, tuple[float, int]]' = OrderedDict()
+    _table_versions: dict[str, int] = {}
+    _redis: aioredis.Redis | None = None
+    _pending: set[asyncio.Task] = set()
+
+    @classmethod
+    def bind(cls, redis: aioredis.Redis | None) -> None:
+        """
+        绑定 Redis 连接，用于读取和递增各工作进程共享的表版本号
+
+        :param redis: redis对象
+        """
+        cls._redis = redis
+
+    @classmethod
+    def version_key(cls, table: str) -> str:
+        return f'{RedisInitKeyConfig.COUNT_CACHE.key}:version:{table}'
+
+    @classmethod
+    async def get_table_versions(cls, tables: Iterable[str]) -> list[tuple[str, int, int]]:
+        """
+        获取相关表的版本号，Redis不可用时共享版本号按0处理，缓存仍受有效期限制
+
+        :param tables: 表名
+        :return: (表名, 本进程版本号, 共享版本号)列表
+        """
+        names = sorted(tables)
+        shared = [0] * len(names)
+        if cls._redis is not None and names:
+            try:
+                values = await cls._redis.mget([cls.version_key(name) for name in names])
+                shared = [int(value or 0) for value in values]
+            except Exception as e:
+                logger.warning(f'分页总数缓存版本号读取失败: {e}')
+        return [(name, cls._table_versions.get(name, 0), version) for name, version in zip(names, shared, strict=True)]
+
+    @classmethod
+    def make_key(cls, count_query: Select, versions: Sequence[tuple[str, int, int]], dialect: Any = None) -> str:
+        """
+        根据统计语句与相关表的版本号生成缓存键
+        """
+        compiled = count_query.compile(dialect=dialect)
+        raw = json.dumps([str(compiled), compiled.params, versions], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def get(cls, key: str) -> int | None:
+        entry = cls._entries.get(key)
+        if entry is None:
+            return None
+        expire_at, total = entry
+        if expire_at < time.monotonic():
+            cls._entries.pop(key, None)
+            return None
+        return total
+
+    @classmethod
+    def put(cls, key: str, total: int) -> None:
+        cls._entries[key] = (time.monotonic() + cls.TTL, total)
+        cls._entries.move_to_end(key)
+        while len(cls._entries) > cls.MAX_SIZE:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    def invalidate_tables(cls, tables: set[str]) -> None:
+        """
+        递增表版本号，使涉及这些表的缓存全部失效：本进程版本号立即递增，共享版本号异步递增
+        """
+        for name in tables:
+            cls._table_versions[name] = cls._table_versions.get(name, 0) + 1
+        if cls._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(cls._incr_shared_versions(tables))
+        cls._pending.add(task)
+        task.add_done_callback(cls._pending.discard)
+
+    @classmethod
+    async def _incr_shared_versions(cls, tables: set[str]) -> None:
+        try:
+            async with cls._redis.pipeline(transaction=False) as pipe:
+                for name in sorted(tables):
+                    pipe.incr(cls.version_key(name))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f'分页总数缓存失效失败: {e}')
+
+
+TableWriteEvents.subscribe(CountCache.invalidate_tables)
 
 
 class PageUtil:
@@ -37,9 +164,89 @@ class PageUtil:
 
         return result
 
+    # 无过滤条件的单表查询，行数超过该值时可使用执行计划估算行数代替精确统计
+    ESTIMATE_TOTAL_THRESHOLD = 100000
+
+    @classmethod
+    async def _estimate_table_rows(cls, db: AsyncSession, table_name: str) -> int | None:
+        """
+        读取数据库统计信息中的表行数估算值
+        """
+        if DataBaseConfig.db_type == 'postgresql':
+            sql = text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)')
+        else:
+            sql = text(
+                'SELECT table_rows FROM information_schema.tables '
+                'WHERE table_schema = DATABASE() AND table_name = :table_name'
+            )
+        value = (await db.execute(sql, {'table_name': table_name})).scalar()
+        return int(value) if value is not None else None
+
+    @classmethod
+    async def count(cls, db: AsyncSession, query: Select, estimate_total: bool = False) -> int:
+        """
+        统计查询语句的总记录数，相同条件在缓存有效期内只统计一次
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :param estimate_total: 无过滤条件的大表是否使用执行计划估算行数
+        :return: 总记录数
+        """
+        count_query = select(func.count('*')).select_from(query.order_by(None).subquery())
+        tables = {table.name for table in find_tables(query)}
+        versions = await CountCache.get_table_versions(tables)
+        key = CountCache.make_key(count_query, versions, db.bind.dialect if db.bind is not None else None)
+        total = CountCache.get(key)
+        if total is not None:
+            return total
+
+        if estimate_total and len(tables) == 1 and (query.whereclause is None or isinstance(query.whereclause, True_)):
+            estimated = await cls._estimate_table_rows(db, next(iter(tables)))
+            if estimated is not None and estimated >= cls.ESTIMATE_TOTAL_THRESHOLD:
+                total = estimated
+        if total is None:
+            total = (await db.execute(count_query)).scalar() or 0
+        CountCache.put(key, total)
+        return total
+
+    @staticmethod
+    def resolve_columns(
+        model: type, fields: str | None, required: Sequence[str] = ()
+    ) -> list[InstrumentedAttribute] | None:
+        """
+        将逗号分隔的字段列表（小驼峰或下划线形式）解析为模型列，用于列投影查询
+
+        :param model: sqlalchemy模型类
+        :param fields: 字段列表，如 'tenderId,projectName'
+        :param required: 必须查询的字段（下划线形式），排在最前
+        :return: 模型列列表，未指定字段时返回None（查询整个模型）
+        """
+        if not fields:
+            return None
+        column_keys = {attr.key for attr in inspect(model).column_attrs}
+        names = [SnakeCaseUtil.camel_to_snake(field.strip()) for field in fields.split(',') if field.strip()]
+        unknown = [name for name in names if name not in column_keys]
+        if unknown:
+            raise ServiceException(message=f'不支持的查询字段: {",".join(unknown)}')
+        return [getattr(model, name) for name in dict.fromkeys([*required, *names])]
+
+    @staticmethod
+    def _unwrap_rows(rows: Sequence[Row], projected: bool) -> list[Any]:
+        # 列投影查询保留行结构（序列化为字典），否则单实体行取出实体本身
+        if projected:
+            return list(rows)
+        return [row[0] if row and len(row) == 1 else row for row in rows]
+
     @classmethod
     async def paginate(
-        cls, db: AsyncSession, query: Select, page_num: int, page_size: int, is_page: bool = False
+        cls,
+        db: AsyncSession,
+        query: Select,
+        page_num: int,
+        page_size: int,
+        is_page: bool = False,
+        estimate_total: bool = False,
+        projected: bool = False,
     ) -> Union[PageModel, list[Union[dict[str, Any], list[dict[Any, Any]]]]]:
         """
         输入查询语句和分页信息，返回分页数据列表结果
@@ -49,17 +256,14 @@ class PageUtil:
         :param page_num: 当前页码
         :param page_size: 当前页面数据量
         :param is_page: 是否开启分页
+        :param estimate_total: 无过滤条件的大表是否使用执行计划估算总数
+        :param projected: 查询语句是否为列投影（见 resolve_columns），为是时每行序列化为字典
         :return: 分页数据对象
         """
         if is_page:
-            total = (await db.execute(select(func.count('*')).select_from(query.subquery()))).scalar()
+            total = await cls.count(db, query, estimate_total)
             query_result = await db.execute(query.offset((page_num - 1) * page_size).limit(page_size))
-            paginated_data: list[Row] = []
-            for row in query_result:
-                if row and len(row) == 1:
-                    paginated_data.append(row[0])
-                else:
-                    paginated_data.append(row)
+            paginated_data = cls._unwrap_rows(query_result.all(), projected)
             has_next = math.ceil(total / page_size) > page_num
             result = PageModel[Any](
                 rows=CamelCaseUtil.transform_result(paginated_data),
@@ -70,16 +274,147 @@ class PageUtil:
             )
         else:
             query_result = await db.execute(query)
-            no_paginated_data: list[Row] = []
-            for row in query_result:
-                if row and len(row) == 1:
-                    no_paginated_data.append(row[0])
-                else:
-                    no_paginated_data.append(row)
+            no_paginated_data = cls._unwrap_rows(query_result.all(), projected)
             result = CamelCaseUtil.transform_result(no_paginated_data)
 
         return result
 
+    @staticmethod
+    def _encode_value(value: Any) -> list:
+        if value is None:
+            return ['n', None]
+        if isinstance(value, datetime):
+            return ['dt', value.isoformat()]
+        if isinstance(value, date):
+            return ['d', value.isoformat()]
+        if isinstance(value, Decimal):
+            return ['dec', str(value)]
+        return ['v', value]
+
+    @staticmethod
+    def _decode_value(item: list) -> Any:
+        tag, value = item
+        if tag == 'dt':
+            return datetime.fromisoformat(value)
+        if tag == 'd':
+            return date.fromisoformat(value)
+        if tag == 'dec':
+            return Decimal(value)
+        return value
+
+    @classmethod
+    def encode_cursor(cls, values: Sequence[Any], total: int = -1) -> str:
+        """
+        将排序键取值编码为不透明游标，已统计的总数随游标传递，翻页时无需重复统计
+
+        :param values: 当前页最后一条记录的排序键取值
+        :param total: 总记录数，未统计时为-1
+        :return: 游标字符串
+        """
+        payload = json.dumps({'k': [cls._encode_value(v) for v in values], 't': total}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls, cursor: str, key_count: int) -> tuple[list[Any], int]:
+        """
+        解析游标
+
+        :param cursor: 游标字符串
+        :param key_count: 排序键数量
+        :return: (排序键取值, 总记录数)
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values = [cls._decode_value(item) for item in payload['k']]
+            total = int(payload.get('t', -1))
+        except Exception as e:
+            raise ServiceException(message='分页游标无效') from e
+        if len(values) != key_count:
+            raise ServiceException(message='分页游标无效')
+        return values, total
+
+    @staticmethod
+    def _after_condition(keys: Sequence[CursorKey], values: Sequence[Any], nulls_smallest: bool) -> ColumnElement:
+        """
+        构建“位于游标之后”的条件：(k1 > v1) OR (k1 = v1 AND k2 > v2) ...，
+        空值按数据库原生排序规则处理（MySQL 空值最小，PostgreSQL 空值最大），以保证排序可直接走索引
+        """
+        branches = []
+        equals: list[ColumnElement] = []
+        for (column, descending), value in zip(keys, values, strict=True):
+            nulls_last = descending == nulls_smallest
+            if value is None:
+                after = column.is_not(None) if not nulls_last else false()
+                equal = column.is_(None)
+            else:
+                after = column < value if descending else column > value
+                if nulls_last:
+                    after = or_(after, column.is_(None))
+                equal = column == value
+            branches.append(and_(*equals, after))
+            equals.append(equal)
+        return or_(*branches)
+
+    @classmethod
+    async def paginate_by_cursor(
+        cls,
+        db: AsyncSession,
+        query: Select,
+        keys: Sequence[CursorKey],
+        page_size: int,
+        cursor: str | None = None,
+        with_total: bool = False,
+        projected: bool = False,
+    ) -> PageModel:
+        """
+        游标（keyset）分页：按排序键定位下一页，不使用 OFFSET，翻页耗时与页码无关
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句（排序由本方法按排序键设置）
+        :param keys: 排序键列表，需保证组合唯一（通常以主键收尾）
+        :param page_size: 当前页面数据量
+        :param cursor: 上一页返回的游标，为空时查询第一页
+        :param with_total: 是否统计总数，仅在第一页统计一次，后续页沿用游标中的值
+        :param projected: 查询语句是否为列投影（见 resolve_columns），为是时每行序列化为字典
+        :return: 分页数据对象
+        """
+        total = -1
+        if cursor:
+            values, total = cls.decode_cursor(cursor, len(keys))
+            nulls_smallest = DataBaseConfig.db_type != 'postgresql'
+            query = query.where(cls._after_condition(keys, values, nulls_smallest))
+        elif with_total:
+            total = await cls.count(db, query)
+
+        query = (
+            query.order_by(None)
+            .order_by(*[column.desc() if descending else column.asc() for column, descending in keys])
+            .add_columns(*[column.label(f'cursor_key_{index}') for index, (column, _) in enumerate(keys)])
+            .limit(page_size + 1)
+        )
+        query_result = (await db.execute(query)).all()
+        has_next = len(query_result) > page_size
+        query_result = query_result[:page_size]
+
+        paginated_data: list[Any] = []
+        for row in query_result:
+            entity = row[: -len(keys)]
+            if projected:
+                paginated_data.append(dict(zip(row._fields[: -len(keys)], entity, strict=True)))
+            else:
+                paginated_data.append(entity[0] if len(entity) == 1 else entity)
+        next_cursor = cls.encode_cursor(list(query_result[-1][-len(keys) :]), total) if has_next else None
+
+        return PageModel[Any](
+            rows=CamelCaseUtil.transform_result(paginated_data),
+            pageNum=1,
+            pageSize=page_size,
+            total=total,
+            hasNext=has_next,
+            nextCursor=next_cursor,
+        )
+
 
 def get_page_obj(data_list: list, page_num: int, page_size: int) -> PageModel:
     """
@@ -0,0 +1,77 @@
+from collections.abc import Iterable
+from typing import Optional
+
+
+class PermissionSet:
+    """
+    权限标识集合：精确权限标识使用集合判断，通配权限标识（如 system:user:*）按前缀树的各级前缀判断，
+    单次校验的开销只与权限标识的层级数有关，与用户拥有的权限数量无关
+    """
+
+    ALL_PERMISSION = '*:*:*'
+
+    __slots__ = ('_all', '_exact', '_prefixes')
+
+    def __init__(self, permissions: Iterable[Optional[str]]) -> None:
+        """
+        根据用户拥有的权限标识生成权限标识集合
+
+        :param permissions: 权限标识列表
+        """
+        self._all = False
+        exact = set()
+        prefixes = set()
+        for perm in permissions:
+            if not perm:
+                continue
+            if perm == self.ALL_PERMISSION:
+                self._all = True
+                continue
+            parts = perm.split(':')
+            if parts[-1] != '*':
+                exact.add(perm)
+                continue
+            # 去掉末尾的通配层级，system:user:* 与 system:*:* 分别对应前缀 system:user: 与 system:
+            while parts and parts[-1] == '*':
+                parts.pop()
+            if parts:
+                prefixes.add(':'.join(parts) + ':')
+            else:
+                self._all = True
+        self._exact = frozenset(exact)
+        self._prefixes = frozenset(prefixes)
+
+    def has(self, perm: str) -> bool:
+        """
+        校验是否拥有权限标识
+
+        :param perm: 权限标识
+        :return: 是否拥有
+        """
+        if self._all or perm in self._exact:
+            return True
+        if self._prefixes:
+            index = perm.find(':')
+            while index != -1:
+                if perm[: index + 1] in self._prefixes:
+                    return True
+                index = perm.find(':', index + 1)
+        return False
+
+    def has_any(self, perms: Iterable[str]) -> bool:
+        """
+        校验是否拥有任一权限标识
+
+        :param perms: 权限标识列表
+        :return: 是否拥有
+        """
+        return any(self.has(perm) for perm in perms)
+
+    def has_all(self, perms: Iterable[str]) -> bool:
+        """
+        校验是否拥有全部权限标识
+
+        :param perms: 权限标识列表
+        :return: 是否拥有
+        """
+        return all(self.has(perm) for perm in perms)
@@ -0,0 +1,371 @@
+import asyncio
+import contextlib
+import json
+import re
+import time
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from fastapi import Request
+from redis import asyncio as aioredis
+
+from utils.log_util import logger
+
+
+class RedisBatchUtil:
+    """
+    请求范围内的Redis批量读取工具类：将同一请求中相互独立的GET合并为一次MGET或管道往返，
+    读取结果保存在请求范围内，后续读取同一键时直接返回
+    """
+
+    @classmethod
+    def _get_request_cache(cls, request: Request) -> dict[str, Any]:
+        cache = getattr(request.state, 'redis_values', None)
+        if cache is None:
+            cache = {}
+            request.state.redis_values = cache
+        return cache
+
+    @classmethod
+    async def prefetch(cls, request: Request, keys: Iterable[str]) -> None:
+        """
+        使用一次MGET预读取多个键
+
+        :param request: Request对象
+        :param keys: 需要预读取的键
+        :return:
+        """
+        cache = cls._get_request_cache(request)
+        missing = [key for key in dict.fromkeys(keys) if key not in cache]
+        if missing:
+            values = await request.app.state.redis.mget(missing)
+            cache.update(zip(missing, values, strict=True))
+
+    @classmethod
+    def remember(cls, request: Request, keys: Iterable[str], values: Iterable[Any]) -> None:
+        """
+        记录在管道中一并读取的键值
+
+        :param request: Request对象
+        :param keys: 键
+        :param values: 与键一一对应的值
+        :return:
+        """
+        cls._get_request_cache(request).update(zip(keys, values, strict=True))
+
+    @classmethod
+    async def get(cls, request: Request, key: str) -> Optional[str]:
+        """
+        读取键值，已预读取时不再访问Redis
+
+        :param request: Request对象
+        :param key: 键
+        :return: 键值
+        """
+        cache = cls._get_request_cache(request)
+        if key not in cache:
+            cache[key] = await request.app.state.redis.get(key)
+        return cache[key]
+
+
+class RedisScanUtil:
+    """
+    Redis键遍历工具类：使用基于游标的SCAN代替KEYS，单次命令只遍历少量键，避免大键空间下阻塞Redis；
+    批量删除使用管道分批UNLINK，键数量与内存占用通过抽样估算
+    """
+
+    # 单次SCAN命令建议遍历的键数量
+    SCAN_COUNT = 1000
+    # 单次分页读取最多遍历的键数量，超出后返回游标由调用方继续读取
+    SCAN_BUDGET = 100000
+    # 批量删除时单次UNLINK的键数量
+    DELETE_BATCH_SIZE = 500
+    # 统计键数量与内存占用时最多遍历的键数量
+    SAMPLE_SCAN_BUDGET = 20000
+    # 统计内存占用时每个前缀执行MEMORY USAGE的键数量
+    SAMPLE_MEMORY_KEYS = 20
+
+    @classmethod
+    def escape_pattern(cls, text: str) -> str:
+        """
+        转义SCAN匹配模式中的通配字符
+
+        :param text: 原始文本
+        :return: 转义后的文本
+        """
+        return re.sub(r'([\\*?\[\]])', r'\\\1', text)
+
+    @classmethod
+    async def scan_page(
+        cls, redis: aioredis.Redis, match: Optional[str] = None, cursor: int = 0, limit: int = SCAN_COUNT
+    ) -> tuple[int, list[str]]:
+        """
+        从游标位置开始分页读取匹配的键
+
+        :param redis: redis对象
+        :param match: 匹配模式
+        :param cursor: 起始游标，首次读取为0
+        :param limit: 本页期望读取的键数量，SCAN按批返回，实际数量可能略多于该值
+        :return: (下一页游标, 键列表)，游标为0表示已遍历完成
+        """
+        keys = []
+        scanned = 0
+        while True:
+            cursor, batch = await redis.scan(cursor=cursor, match=match, count=cls.SCAN_COUNT)
+            keys.extend(batch)
+            scanned += cls.SCAN_COUNT
+            if cursor == 0 or len(keys) >= limit or scanned >= cls.SCAN_BUDGET:
+                return cursor, keys
+
+    @classmethod
+    async def scan_keys(cls, redis: aioredis.Redis, match: Optional[str] = None) -> list[str]:
+        """
+        读取全部匹配的键，适用于匹配结果数量有限的前缀
+
+        :param redis: redis对象
+        :param match: 匹配模式
+        :return: 键列表
+        """
+        return list(dict.fromkeys([key async for key in redis.scan_iter(match=match, count=cls.SCAN_COUNT)]))
+
+    @classmethod
+    async def delete_by_pattern(cls, redis: aioredis.Redis, match: str) -> int:
+        """
+        分批删除匹配的键
+
+        :param redis: redis对象
+        :param match: 匹配模式
+        :return: 删除的键数量
+        """
+        deleted = 0
+        batch = []
+        async for key in redis.scan_iter(match=match, count=cls.SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= cls.DELETE_BATCH_SIZE:
+                deleted += await redis.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await redis.unlink(*batch)
+        return deleted
+
+    @classmethod
+    async def sample_prefix_stats(cls, redis: aioredis.Redis, prefixes: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        抽样统计各前缀的键数量与内存占用：遍历部分键空间按前缀计数后按数据库键总数等比估算，
+        再对每个前缀的少量键执行MEMORY USAGE，以平均值乘以键数量估算内存占用；键空间较小时结果为精确统计
+
+        :param redis: redis对象
+        :param prefixes: 键前缀列表，键按第一个冒号之前的部分归属前缀
+        :return: 以前缀为键的统计结果，包含key_count、memory_usage及is_estimated
+        """
+        counts = dict.fromkeys(prefixes, 0)
+        samples = {prefix: [] for prefix in counts}
+        cursor = 0
+        scanned = 0
+        while True:
+            cursor, batch = await redis.scan(cursor=cursor, count=cls.SCAN_COUNT)
+            scanned += len(batch)
+            for key in batch:
+                prefix, separator, _ = key.partition(':')
+                if separator and prefix in counts:
+                    counts[prefix] += 1
+                    if len(samples[prefix]) < cls.SAMPLE_MEMORY_KEYS:
+                        samples[prefix].append(key)
+            if cursor == 0 or scanned >= cls.SAMPLE_SCAN_BUDGET:
+                break
+        is_estimated = cursor != 0
+        ratio = (await redis.dbsize()) / scanned if is_estimated and scanned else 1
+
+        sample_keys = [key for keys in samples.values() for key in keys]
+        memory_map = {}
+        if sample_keys:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in sample_keys:
+                    pipe.memory_usage(key)
+                # 部分托管Redis禁用了MEMORY命令，此时只返回键数量
+                memory_map = dict(zip(sample_keys, await pipe.execute(raise_on_error=False), strict=True))
+
+        stats = {}
+        for prefix, count in counts.items():
+            key_count = round(count * ratio)
+            usages = [memory_map[key] for key in samples[prefix] if isinstance(memory_map.get(key), int)]
+            stats[prefix] = {
+                'key_count': key_count,
+                'memory_usage': round(sum(usages) / len(usages) * key_count) if usages else None,
+                'is_estimated': is_estimated,
+            }
+        return stats
+
+
+class RedisNearCacheUtil:
+    """
+    进程内近端缓存工具类：字典与参数配置等读多写少的键在每个工作进程内再缓存一层，命中时只需一次字典读取；
+    写入Redis后通过发布订阅通知所有工作进程失效对应的键，订阅中断期间不使用进程内缓存
+    """
+
+    # 进程内缓存的有效时长（秒）与最大条目数
+    LOCAL_TTL = 60
+    LOCAL_MAX_SIZE = 4096
+    # 失效通知频道
+    CHANNEL = 'near_cache:invalidate'
+    # 订阅中断后的重连间隔（秒）
+    RECONNECT_INTERVAL = 5
+    # 等待失效通知的单次超时时间（秒），连接设置了命令超时，订阅需轮询而不是一直阻塞读取
+    POLL_TIMEOUT = 1
+
+    _local: dict[str, tuple[float, Optional[str]]] = {}
+    # 每次失效递增，读取期间发生失效时不写入读取结果，避免旧值覆盖失效
+    _generation = 0
+    _listening = False
+    _listener: Optional[asyncio.Task] = None
+
+    @classmethod
+    def generation(cls) -> int:
+        """
+        获取当前失效代数，在读取Redis之前获取并在写入进程内缓存时传入
+
+        :return: 当前失效代数
+        """
+        return cls._generation
+
+    @classmethod
+    def peek(cls, key: str) -> tuple[bool, Optional[str]]:
+        """
+        读取进程内缓存
+
+        :param key: 键
+        :return: (是否命中, 键值)
+        """
+        entry = cls._local.get(key) if cls._listening else None
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            cls._local.pop(key, None)
+            return False, None
+        return True, entry[1]
+
+    @classmethod
+    def peek_many(cls, keys: list[str]) -> Optional[list[Optional[str]]]:
+        """
+        读取多个键的进程内缓存
+
+        :param keys: 键列表
+        :return: 全部命中时返回与键一一对应的值，否则返回None
+        """
+        values = []
+        for key in keys:
+            hit, value = cls.peek(key)
+            if not hit:
+                return None
+            values.append(value)
+        return values
+
+    @classmethod
+    def store(cls, generation: int, keys: Iterable[str], values: Iterable[Optional[str]]) -> None:
+        """
+        写入进程内缓存
+
+        :param generation: 读取Redis之前获取的失效代数
+        :param keys: 键
+        :param values: 与键一一对应的值
+        :return:
+        """
+        if not cls._listening or generation != cls._generation:
+            return
+        expire = time.monotonic() + cls.LOCAL_TTL
+        for key, value in zip(keys, values, strict=True):
+            cls._local.pop(key, None)
+            cls._local[key] = (expire, value)
+        while len(cls._local) > cls.LOCAL_MAX_SIZE:
+            cls._local.pop(next(iter(cls._local)))
+
+    @classmethod
+    async def get(cls, redis: aioredis.Redis, key: str) -> Optional[str]:
+        """
+        读取键值，优先使用进程内缓存
+
+        :param redis: redis对象
+        :param key: 键
+        :return: 键值
+        """
+        hit, value = cls.peek(key)
+        if hit:
+            return value
+        generation = cls._generation
+        value = await redis.get(key)
+        cls.store(generation, [key], [value])
+        return value
+
+    @classmethod
+    def _invalidate_local(cls, keys: Iterable[str]) -> None:
+        cls._generation += 1
+        for key in keys:
+            # 以*结尾时按前缀失效，单独的*失效全部键
+            if key.endswith('*'):
+                prefix = key[:-1]
+                for cached_key in [cached_key for cached_key in cls._local if cached_key.startswith(prefix)]:
+                    cls._local.pop(cached_key, None)
+            else:
+                cls._local.pop(key, None)
+
+    @classmethod
+    async def invalidate(cls, redis: Optional[aioredis.Redis], keys: Iterable[str]) -> None:
+        """
+        失效本进程缓存并通知其他工作进程，需在写入Redis之后调用
+
+        :param redis: redis对象
+        :param keys: 需要失效的键，以*结尾时按前缀失效
+        :return:
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        cls._invalidate_local(keys)
+        if redis is not None:
+            await redis.publish(cls.CHANNEL, json.dumps(keys, ensure_ascii=False))
+
+    @classmethod
+    async def _listen(cls, redis: aioredis.Redis) -> None:
+        while True:
+            try:
+                async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(cls.CHANNEL)
+                    # 订阅建立前可能错过失效通知，先清空进程内缓存
+                    cls._invalidate_local(['*'])
+                    cls._listening = True
+                    while pubsub.subscribed:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=cls.POLL_TIMEOUT)
+                        if message is not None:
+                            cls._invalidate_local(json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'近端缓存失效通知订阅中断，{cls.RECONNECT_INTERVAL}秒后重试: {e}')
+            finally:
+                cls._listening = False
+                cls._invalidate_local(['*'])
+            await asyncio.sleep(cls.RECONNECT_INTERVAL)
+
+    @classmethod
+    def start_listener(cls, redis: aioredis.Redis) -> None:
+        """
+        启动失效通知订阅任务
+
+        :param redis: redis对象
+        :return:
+        """
+        if cls._listener is None or cls._listener.done():
+            cls._listener = asyncio.create_task(cls._listen(redis))
+
+    @classmethod
+    async def stop_listener(cls) -> None:
+        """
+        停止失效通知订阅任务
+
+        :return:
+        """
+        if cls._listener is not None:
+            cls._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await cls._listener
+            cls._listener = None
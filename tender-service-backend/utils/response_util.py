@@ -1,15 +1,41 @@
 from collections.abc import Mapping
 from datetime import datetime
+from decimal import Decimal
 from typing import Any, Optional
 
 from fastapi import status
-from fastapi.encoders import jsonable_encoder
+from fastapi.encoders import decimal_encoder, jsonable_encoder
 from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
 from common.constant import HttpStatusConstant
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_default(obj: Any) -> Any:
+    # orjson 原生支持 dict/list/datetime/date/UUID/Enum 等，其余类型按 jsonable_encoder 规则转换
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json', by_alias=True)
+    if isinstance(obj, Decimal):
+        return decimal_encoder(obj)
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    使用 orjson 直接编码响应内容的 JSON 响应，省去 jsonable_encoder 对整个结果的预遍历；未安装 orjson 时回退为标准实现
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(jsonable_encoder(content))
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
 
 class ResponseUtil:
     """
@@ -54,9 +80,9 @@ class ResponseUtil:
 
         result.update({'success': True, 'time': datetime.now()})
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -100,9 +126,9 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -146,9 +172,9 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -192,9 +218,9 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -238,9 +264,9 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
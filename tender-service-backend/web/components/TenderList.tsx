@@ -106,7 +106,7 @@ const TenderList: React.FC<TenderListProps> = ({ onViewDetail }) => {
     const params = new URLSearchParams();
     params.set('page_num', String(p.pageNum));
     params.set('page_size', String(p.pageSize));
-    if (p.f.keyword) params.set('project_name', p.f.keyword);
+    if (p.f.keyword) params.set('keyword', p.f.keyword);
     if (p.f.projectCode) params.set('project_code', p.f.projectCode);
     if (p.f.district) params.set('district', p.f.district);
     if (p.f.stage) params.set('project_stage', p.f.stage);
@@ -234,8 +234,8 @@ const TenderList: React.FC<TenderListProps> = ({ onViewDetail }) => {
         <CardContent className="pt-8">
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
             <Input 
-              label="项目名称" 
-              placeholder="输入关键词模糊搜索" 
+              label="关键词" 
+              placeholder="项目名称/建设单位/施工内容/招标范围" 
               value={filters.keyword}
               onChange={e => setFilters(prev => ({ ...prev, keyword: e.target.value }))}
             />
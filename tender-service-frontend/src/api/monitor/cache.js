@@ -16,11 +16,12 @@ export function listCacheName() {
   })
 }
 
-// 查询缓存键名列表
-export function listCacheKey(cacheName) {
+// 查询缓存键名列表（按游标分页，返回的cursor为0时表示已获取全部键名）
+export function listCacheKey(cacheName, cursor = 0) {
   return request({
     url: '/monitor/cache/getKeys/' + cacheName,
-    method: 'get'
+    method: 'get',
+    params: { cursor: cursor }
   })
 }
 